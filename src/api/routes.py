@@ -1,26 +1,129 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from typing import List, Dict, Any
-import pandas as pd
-from io import StringIO
-from ..services.database import DatabaseService
-from ..models.base_models import CampaignData
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from datetime import datetime
+from ..config import INGEST_BATCH_SIZE, NDJSON_MAX_LINE_BYTES, STORAGE_BACKEND
+from ..repositories import get_repository
+from ..services.async_database import AsyncDatabaseService
+from ..services.async_repository import AsyncRepositoryService
+from ..services.batching import summarize_reports
+from ..services.columnar import ARROW_EXTENSIONS, EXPORT_PROJECTION, ParquetExport
+from ..services.executor import run_blocking
+from ..services.jobs import create_job, submit_job, retry_job, job_progress
+from ..services.pagination import InvalidCursor
+from ..models.base_models import CAMPAIGN_ADAPTER, CAMPAIGN_LIST_ADAPTER
+from pydantic import ValidationError
 
 router = APIRouter()
-db_service = DatabaseService()
+# Ingest jobs run on worker threads through the synchronous repository
+repository = get_repository()
+# The other routes use Motor when the backend is MongoDB and otherwise call the
+# same repository on the parse pool, so every route sees the same store
+if STORAGE_BACKEND.lower() == 'mongo':
+    db_service = AsyncDatabaseService()
+else:
+    db_service = AsyncRepositoryService(repository)
+
+def validate_campaigns_json(body: bytes) -> List[Dict[str, Any]]:
+    """Validate a raw JSON array of campaigns and return them as documents"""
+    return CAMPAIGN_LIST_ADAPTER.dump_python(CAMPAIGN_LIST_ADAPTER.validate_json(body))
+
+# Rejected NDJSON lines reported with their error message; the rest are only
+# listed by line number
+MAX_REPORTED_ERRORS = 100
+
+def line_too_long() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"NDJSON lines may be at most {NDJSON_MAX_LINE_BYTES} bytes"
+    )
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines, buffering at most one partial line
+
+    Only the bytes of each new chunk are searched for line breaks. A line
+    longer than NDJSON_MAX_LINE_BYTES raises a 413 HTTPException.
+    """
+    buffer = bytearray()
+    async for chunk in stream:
+        search_from = len(buffer)
+        buffer += chunk
+        line_start = 0
+        while True:
+            line_end = buffer.find(b'\n', search_from)
+            if line_end < 0:
+                break
+            if line_end - line_start > NDJSON_MAX_LINE_BYTES:
+                raise line_too_long()
+            yield bytes(buffer[line_start:line_end])
+            line_start = search_from = line_end + 1
+        del buffer[:line_start]
+        if len(buffer) > NDJSON_MAX_LINE_BYTES:
+            raise line_too_long()
+    if buffer:
+        yield bytes(buffer)
+
+def validate_lines(lines: List[Tuple[int, bytes]]) -> tuple:
+    """Parse and validate numbered NDJSON lines, one campaign per line
+
+    Returns the documents, the line number of each document and the errors
+    of the rejected lines.
+    """
+    campaigns, numbers, errors = [], [], []
+    for number, line in lines:
+        try:
+            campaigns.append(CAMPAIGN_ADAPTER.validate_json(line))
+            numbers.append(number)
+        except ValidationError as e:
+            errors.append({'line': number, 'message': str(e)})
+    return CAMPAIGN_LIST_ADAPTER.dump_python(campaigns), numbers, errors
+
+async def flush_ndjson_batch(db, lines: List[Tuple[int, bytes]], index: int) -> Dict[str, Any]:
+    """Validate a batch of lines on the parse pool and upsert it; returns a chunk report"""
+    documents, numbers, errors = await run_blocking(validate_lines, lines)
+    summary = await db.upsert_many(documents) if documents else {}
+    errors += [
+        {'line': numbers[error['index']], 'message': error['message']}
+        for error in summary.get('errors', [])
+    ]
+    return {
+        'chunk': index,
+        'inserted': summary.get('inserted_count', 0),
+        'updated': summary.get('updated_count', 0),
+        'unchanged': summary.get('unchanged_count', 0),
+        'failed': len(errors),
+        'upserted_ids': summary.get('upserted_ids', []),
+        'errors': errors,
+    }
 
 @router.post("/upload/json", response_model=Dict[str, Any])
-async def upload_json_data(data: List[Dict[str, Any]]):
-    """Upload campaign data in JSON format"""
+async def upload_json_data(request: Request):
+    """Upload campaign data in JSON format
+
+    The raw body is validated in one pass against List[CampaignData] without
+    building intermediate dicts first.
+    """
+    body = await request.body()
     try:
-        campaigns = [CampaignData(**camp) for camp in data]
-        
-        with db_service as db:
-            inserted_ids = db.insert_many([camp.dict() for camp in campaigns])
+        documents = await run_blocking(validate_campaigns_json, body)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=e.errors(include_url=False, include_input=False)
+        )
+
+    try:
+        async with db_service as db:
+            result = await db.upsert_many(documents)
         
         return {
             "message": "Data uploaded successfully",
-            "inserted_count": len(inserted_ids),
-            "inserted_ids": inserted_ids
+            "inserted_count": result["inserted_count"],
+            "updated_count": result["updated_count"],
+            "unchanged_count": result["unchanged_count"],
+            "failed_count": result["failed_count"],
+            "inserted_ids": result["upserted_ids"],
+            "errors": result["errors"]
         }
         
     except Exception as e:
@@ -29,38 +132,233 @@ async def upload_json_data(data: List[Dict[str, Any]]):
             detail=f"Error uploading data: {str(e)}"
         )
 
-@router.post("/upload/csv", response_model=Dict[str, Any])
-async def upload_csv_data(file: UploadFile = File(...)):
-    """Upload campaign data using CSV file"""
+@router.post("/upload/ndjson", response_model=Dict[str, Any])
+async def upload_ndjson_data(request: Request):
+    """Stream newline-delimited JSON campaigns into the database
+
+    The body is read incrementally and flushed in batches of INGEST_BATCH_SIZE
+    lines; the next batch is not read until the previous one is written.
+    """
     try:
-        if not file.filename.endswith('.csv'):
-            raise HTTPException(
-                status_code=400,
-                detail="Only CSV files are allowed"
-            )
-        
-        content = await file.read()
-        csv_data = StringIO(content.decode())
-        df = pd.read_csv(csv_data)
-        
-        df.columns = df.columns.str.replace(' ', '_').str.lower()
-        df = df.where(pd.notnull(df), None)
-        data = df.to_dict('records')
-        
-        campaigns = [CampaignData(**camp) for camp in data]
-        
-        with db_service as db:
-            inserted_ids = db.insert_many([camp.dict() for camp in campaigns])
+        reports, batch, line_count = [], [], 0
+        async with db_service as db:
+            async for line in iter_lines(request.stream()):
+                line_count += 1
+                if not line.strip():
+                    continue
+                batch.append((line_count, line))
+                if len(batch) >= INGEST_BATCH_SIZE:
+                    reports.append(await flush_ndjson_batch(db, batch, len(reports)))
+                    batch = []
+            if batch:
+                reports.append(await flush_ndjson_batch(db, batch, len(reports)))
+        result = summarize_reports(reports)
+        errors = sorted(result["errors"], key=lambda error: error["line"])
+
+        return {
+            "message": "NDJSON data uploaded successfully",
+            "lines_read": line_count,
+            "inserted_count": result["inserted_count"],
+            "updated_count": result["updated_count"],
+            "unchanged_count": result["unchanged_count"],
+            "failed_count": result["failed_count"],
+            "rejected_lines": [error["line"] for error in errors],
+            "errors": errors[:MAX_REPORTED_ERRORS]
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error uploading NDJSON: {str(e)}"
+        )
+
+async def queue_upload(file: UploadFile, fmt: str, label: str, response: Response) -> Dict[str, Any]:
+    """Spool an upload as a background ingest job and describe where to follow it
+
+    An upload identical to one already ingested is not queued and answers
+    200 with the job it duplicates.
+    """
+    try:
+        job = await run_blocking(create_job, repository, file.filename, file.file, fmt)
+        if job["status"] == "skipped":
+            response.status_code = 200
+            message = f"Identical {label} upload already ingested"
+        else:
+            submit_job(repository, job)
+            message = f"{label} upload queued"
         
         return {
-            "message": "CSV data uploaded successfully",
-            "inserted_count": len(inserted_ids),
-            "inserted_ids": inserted_ids,
+            "message": message,
+            "job_id": job["job_id"],
+            "status_url": f"/api/jobs/{job['job_id']}",
+            "duplicate_of": job["duplicate_of"],
             "filename": file.filename
         }
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Error uploading CSV: {str(e)}"
-        ) 
\ No newline at end of file
+            detail=f"Error uploading {label}: {str(e)}"
+        )
+
+async def parquet_stream(status_filter: Optional[List[str]], search_term: Optional[str]) -> AsyncIterator[bytes]:
+    """Encode matching campaigns as Parquet, one row group per cursor batch"""
+    export = ParquetExport()
+    async with db_service as db:
+        async for documents in db.iter_campaign_batches(EXPORT_PROJECTION, status_filter, search_term):
+            yield await run_blocking(export.write, documents)
+    yield await run_blocking(export.close)
+
+@router.post("/upload/csv", response_model=Dict[str, Any], status_code=202)
+async def upload_csv_data(response: Response, file: UploadFile = File(...)):
+    """Queue a CSV file for background ingest and return its job id"""
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(
+            status_code=400,
+            detail="Only CSV files are allowed"
+        )
+    return await queue_upload(file, 'csv', 'CSV', response)
+
+@router.post("/upload/xlsx", response_model=Dict[str, Any], status_code=202)
+async def upload_xlsx_data(response: Response, file: UploadFile = File(...)):
+    """Queue an Excel workbook for background ingest and return its job id
+
+    The active sheet is read with the CSV columns.
+    """
+    if not file.filename.endswith('.xlsx'):
+        raise HTTPException(
+            status_code=400,
+            detail="Only Excel files are allowed"
+        )
+    return await queue_upload(file, 'xlsx', 'Excel', response)
+
+@router.post("/upload/parquet", response_model=Dict[str, Any], status_code=202)
+async def upload_parquet_data(response: Response, file: UploadFile = File(...)):
+    """Queue a Parquet file for background ingest and return its job id
+
+    Flat files use the CSV columns; files exported by /export/parquet hold
+    one nested campaign per row.
+    """
+    if not file.filename.endswith('.parquet'):
+        raise HTTPException(
+            status_code=400,
+            detail="Only Parquet files are allowed"
+        )
+    return await queue_upload(file, 'parquet', 'Parquet', response)
+
+@router.post("/upload/arrow", response_model=Dict[str, Any], status_code=202)
+async def upload_arrow_data(response: Response, file: UploadFile = File(...)):
+    """Queue an Arrow IPC file or stream for background ingest and return its job id"""
+    if not file.filename.endswith(ARROW_EXTENSIONS):
+        raise HTTPException(
+            status_code=400,
+            detail="Only Arrow IPC files are allowed"
+        )
+    return await queue_upload(file, 'arrow', 'Arrow', response)
+
+@router.get("/export/parquet")
+async def export_parquet(
+    status: Optional[List[str]] = Query(None),
+    search: Optional[str] = None
+):
+    """Download the campaigns matching the filters as a Parquet file
+
+    The file is streamed as it is written, so the collection is never held in
+    memory at once.
+    """
+    return StreamingResponse(
+        parquet_stream(status, search),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": 'attachment; filename="campaigns.parquet"'}
+    )
+
+@router.get("/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_job(job_id: str):
+    """Progress of an ingest job: rows parsed, validated, written and failed"""
+    try:
+        job = await run_blocking(repository.get_job, job_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error retrieving job: {str(e)}"
+        )
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_progress(job)
+
+@router.post("/jobs/{job_id}/retry", response_model=Dict[str, Any], status_code=202)
+async def retry_ingest_job(job_id: str):
+    """Queue a failed ingest job again"""
+    try:
+        job = await run_blocking(retry_job, repository, job_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error retrying job: {str(e)}"
+        )
+    if job is None:
+        raise HTTPException(status_code=409, detail="Only failed jobs with their upload still spooled can be retried")
+    return job_progress(job)
+
+@router.get("/campaigns/metrics", response_model=Dict[str, Any])
+async def campaign_metrics(
+    status: Optional[List[str]] = Query(None),
+    search: Optional[str] = None
+):
+    """Summary KPIs for the campaigns matching the filters"""
+    try:
+        async with db_service as db:
+            return await db.get_campaign_metrics(status, search)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error computing metrics: {str(e)}"
+        )
+
+@router.get("/campaigns", response_model=Dict[str, Any])
+async def list_campaigns(
+    limit: int = Query(20, ge=1, le=500),
+    after: Optional[str] = None,
+    exact_count: bool = False,
+    status: Optional[List[str]] = Query(None),
+    search: Optional[str] = None
+):
+    """List campaigns newest first using keyset pagination"""
+    try:
+        async with db_service as db:
+            page = await db.get_campaigns_page(limit, after, exact_count, status, search)
+
+        return {
+            "campaigns": CAMPAIGN_LIST_ADAPTER.dump_python(page["campaigns"]),
+            "next_cursor": page["next_cursor"],
+            "total": page["total"]
+        }
+
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error retrieving campaigns: {str(e)}"
+        )
+
+@router.get("/trends/weekly", response_model=List[Dict[str, Any]])
+async def weekly_trends(
+    start: datetime,
+    end: datetime,
+    unit: str = Query("week", pattern="^(week|month)$"),
+    campaign_id: Optional[List[str]] = Query(None)
+):
+    """Mail-drop quantity, responses and conversions bucketed by week or month"""
+    try:
+        async with db_service as db:
+            return await db.get_weekly_trends(start, end, unit, campaign_id)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error retrieving trends: {str(e)}"
+        )
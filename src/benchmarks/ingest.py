@@ -0,0 +1,66 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+import pandas as pd
+from ..config import CSV_BLOCK_BYTES
+from ..services.columnar import csv_tasks
+from ..services.documents import build_parallel
+
+def write_sample_csv(source: str, rows: int, path: str):
+    """Write ``rows`` flat upload rows cycled from ``source`` with distinct campaign ids"""
+    sample = pd.read_csv(source)
+    df = sample.iloc[[i % len(sample) for i in range(rows)]].reset_index(drop=True)
+    df['campaign_id'] = [f'BENCH{i:08d}' for i in range(rows)]
+    df.to_csv(path, index=False)
+
+def worker_counts(limit: int) -> List[int]:
+    """1, 2, 4, ... up to and including ``limit``"""
+    counts = [1]
+    while counts[-1] * 2 < limit:
+        counts.append(counts[-1] * 2)
+    return counts + [limit] if limit > 1 else counts
+
+def time_build(path: str, block_size: int, workers: int) -> float:
+    """Seconds to read and build every chunk of ``path`` with ``workers`` processes"""
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        # Start the workers before timing
+        list(pool.map(abs, range(workers)))
+    try:
+        start = time.perf_counter()
+        for _ in build_parallel(csv_tasks(path, block_size), workers, pool):
+            pass
+        return time.perf_counter() - start
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point: python -m src.benchmarks.ingest [--rows N] [--workers N ...]"""
+    parser = argparse.ArgumentParser(description="Measure CSV document building throughput by worker count")
+    parser.add_argument('--source', default='campaign_data.csv', help="flat CSV the sample rows come from")
+    parser.add_argument('--rows', type=int, default=200000, help="rows in the generated upload")
+    parser.add_argument('--block-bytes', type=int, default=CSV_BLOCK_BYTES, help="bytes of CSV per build task")
+    parser.add_argument('--workers', type=int, nargs='*', help="worker counts to try; defaults to powers of two up to the core count")
+    args = parser.parse_args(argv)
+
+    counts = args.workers or worker_counts(os.cpu_count() or 1)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'upload.csv')
+        write_sample_csv(args.source, args.rows, path)
+        print(f"{args.rows} rows in blocks of {args.block_bytes} bytes, {os.cpu_count()} cores")
+        baseline = None
+        for workers in counts:
+            elapsed = time_build(path, args.block_bytes, workers)
+            baseline = baseline or elapsed
+            print(f"{workers:3d} workers: {elapsed:7.2f} s  {args.rows / elapsed:10.0f} rows/s  {baseline / elapsed:5.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
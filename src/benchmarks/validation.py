@@ -0,0 +1,74 @@
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+from pydantic import TypeAdapter
+from ..models.base_models import CampaignData, CAMPAIGN_LIST_ADAPTER
+from ..services.columnar import read_csv_documents
+
+# What FastAPI validated the old List[Dict[str, Any]] body parameter against
+REQUEST_BODY_ADAPTER = TypeAdapter(List[Dict[str, Any]])
+
+def sample_payload(source: str, records: int) -> bytes:
+    """Build a JSON upload body of ``records`` campaigns from a flat CSV"""
+    documents = []
+    for _, chunk, _, _ in read_csv_documents(source):
+        documents += chunk
+    payload = [
+        {**documents[i % len(documents)], 'campaign_id': f'BENCH{i:07d}'}
+        for i in range(records)
+    ]
+    return json.dumps(payload).encode()
+
+def parse_request_body(body: bytes) -> List[Dict[str, Any]]:
+    """The part of the previous path FastAPI ran on the event loop"""
+    return REQUEST_BODY_ADAPTER.validate_python(json.loads(body))
+
+def validate_per_record(body: bytes) -> List[Dict[str, Any]]:
+    """Previous path: parse and validate a list of dicts, then build and dump each model"""
+    return [CampaignData(**camp).model_dump() for camp in parse_request_body(body)]
+
+def validate_adapter(body: bytes) -> List[Dict[str, Any]]:
+    """Current path: validate the raw bytes and dump the list in one call each"""
+    return CAMPAIGN_LIST_ADAPTER.dump_python(CAMPAIGN_LIST_ADAPTER.validate_json(body))
+
+def median_times(funcs: Dict[str, Callable[[bytes], Any]], body: bytes, repeat: int) -> Dict[str, float]:
+    """Median seconds per function, with runs interleaved so noise hits each alike"""
+    timings = {name: [] for name in funcs}
+    for _ in range(repeat):
+        for name, func in funcs.items():
+            gc.collect()
+            start = time.perf_counter()
+            func(body)
+            timings[name].append(time.perf_counter() - start)
+    return {name: statistics.median(values) for name, values in timings.items()}
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point: python -m src.benchmarks.validation [--records N] [--repeat N]"""
+    parser = argparse.ArgumentParser(description="Compare JSON upload validation paths")
+    parser.add_argument('--source', default='campaign_data.csv', help="flat CSV the sample campaigns come from")
+    parser.add_argument('--records', type=int, default=5000, help="campaigns in the request body")
+    parser.add_argument('--repeat', type=int, default=9, help="interleaved runs per path; the median is reported")
+    args = parser.parse_args(argv)
+
+    body = sample_payload(args.source, args.records)
+    if validate_per_record(body) != validate_adapter(body):
+        print("Validation paths disagree")
+        return 1
+    times = median_times({
+        'per_record': validate_per_record,
+        'adapter': validate_adapter,
+        'event_loop': parse_request_body,
+    }, body, args.repeat)
+    print(f"{args.records} campaigns, {len(body) / 1e6:.1f} MB body")
+    print(f"per-record models: {times['per_record'] * 1000:.1f} ms "
+          f"({times['event_loop'] * 1000:.1f} ms of it on the event loop)")
+    print(f"TypeAdapter:       {times['adapter'] * 1000:.1f} ms (none on the event loop)")
+    print(f"speedup:           {times['per_record'] / times['adapter']:.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Callable, List, Tuple
+import pandas as pd
+from openpyxl import Workbook
+from ..services.workbooks import sheet_frames
+
+def write_sample_workbook(source: str, rows: int, path: str):
+    """Write ``rows`` flat upload rows cycled from ``source`` to a workbook"""
+    sample = pd.read_csv(source)
+    sample = sample.astype(object).where(sample.notna(), None)
+    records = sample.values.tolist()
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(sample.columns))
+    for i in range(rows):
+        sheet.append([f'BENCH{i:08d}'] + records[i % len(records)][1:])
+    workbook.save(path)
+
+def read_whole(path: str) -> int:
+    """Previous path: copy the upload into memory and load the sheet with read_excel"""
+    with open(path, 'rb') as f:
+        return len(pd.read_excel(BytesIO(f.read())))
+
+def read_streaming(path: str) -> int:
+    """Current path: stream the sheet read-only a chunk at a time"""
+    return sum(len(df) for df in sheet_frames(path))
+
+def idle(path: str) -> int:
+    return 0
+
+def measure(func: Callable[[str], int], path: str) -> Tuple[int, float, int]:
+    """Run ``func`` and return its row count, seconds and peak RSS in KiB"""
+    start = time.perf_counter()
+    rows = func(path)
+    return rows, time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def in_fresh_process(func: Callable[[str], int], path: str) -> Tuple[int, float, int]:
+    """measure() in a new interpreter so each path's peak RSS is its own"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(measure, func, path).result()
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point: python -m src.benchmarks.workbooks [--rows N]"""
+    parser = argparse.ArgumentParser(description="Compare peak memory of whole and streaming workbook reads")
+    parser.add_argument('--source', default='campaign_data.csv', help="flat CSV the sample rows come from")
+    parser.add_argument('--rows', type=int, default=100000, help="rows in the generated workbook")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'upload.xlsx')
+        write_sample_workbook(args.source, args.rows, path)
+        print(f"{args.rows} rows, {os.path.getsize(path) / 1e6:.1f} MB workbook")
+        _, _, base = in_fresh_process(idle, path)
+        for name, func in (('read_excel', read_whole), ('streaming', read_streaming)):
+            rows, elapsed, peak = in_fresh_process(func, path)
+            print(f"{name:10s}: {rows} rows in {elapsed:6.2f} s, peak RSS +{(peak - base) / 1024:7.1f} MiB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,93 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Storage backend: 'mongo' for MongoDB, 'sqlite' for the embedded local store
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'mongo')
+SQLITE_PATH = os.getenv('SQLITE_PATH', 'campaign_manager.db')
+
 # MongoDB Configuration
 MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
 MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'marketing_db')
 MONGO_COLLECTION_NAME = os.getenv('MONGO_COLLECTION_NAME', 'campaign_data')
+MONGO_VERSION_COLLECTION_NAME = os.getenv('MONGO_VERSION_COLLECTION_NAME', 'data_versions')
+MONGO_ROLLUP_COLLECTION_NAME = os.getenv('MONGO_ROLLUP_COLLECTION_NAME', 'campaign_rollups')
+MONGO_WEEKLY_COLLECTION_NAME = os.getenv('MONGO_WEEKLY_COLLECTION_NAME', 'weekly_mail_drop_facts')
+MONGO_ARCHIVE_COLLECTION_NAME = os.getenv('MONGO_ARCHIVE_COLLECTION_NAME', 'campaign_archive')
+MONGO_JOBS_COLLECTION_NAME = os.getenv('MONGO_JOBS_COLLECTION_NAME', 'ingest_jobs')
+MONGO_INGEST_LOG_COLLECTION_NAME = os.getenv('MONGO_INGEST_LOG_COLLECTION_NAME', 'ingest_log')
+
+# MongoDB Connection Pool Configuration
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 50))
+MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 0))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 300000))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 10000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000))
+
+# Wire compression, e.g. 'zstd,snappy,zlib'; zstd needs the zstandard package
+# and snappy needs python-snappy. Empty disables compression.
+MONGO_COMPRESSORS = os.getenv('MONGO_COMPRESSORS', '')
+
+# Bulk DataFrame reads: 'raw' decodes RawBSONDocuments lazily, 'arrow' uses
+# pymongoarrow when installed
+BULK_READ_MODE = os.getenv('BULK_READ_MODE', 'raw')
+
+# Number of campaign documents written per bulk_write during ingest
+INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', 1000))
+
+# Times a campaign's write is attempted when another writer keeps replacing it
+# between the read of its stored version and the write
+INGEST_WRITE_ATTEMPTS = int(os.getenv('INGEST_WRITE_ATTEMPTS', 5))
+
+# Completed campaigns that ended more than this many days ago are moved to the
+# archive collection by python -m src.services.archive
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 90))
+
+# Rows parsed, validated and written at a time when streaming Excel, Parquet and
+# Arrow uploads; CSV uploads are read in blocks of CSV_BLOCK_BYTES
+CSV_CHUNK_ROWS = int(os.getenv('CSV_CHUNK_ROWS', 5000))
+CSV_BLOCK_BYTES = int(os.getenv('CSV_BLOCK_BYTES', 4 << 20))
+
+# Longest NDJSON line accepted; longer lines fail the upload with 413
+NDJSON_MAX_LINE_BYTES = int(os.getenv('NDJSON_MAX_LINE_BYTES', 1 << 20))
+
+# Campaigns per Parquet row group in exports; also the cursor batch size
+EXPORT_ROW_GROUP_ROWS = int(os.getenv('EXPORT_ROW_GROUP_ROWS', 5000))
+
+# Background ingest jobs: uploads are spooled to INGEST_JOB_DIR and processed by
+# at most INGEST_MAX_JOBS worker threads. Queued or running jobs not updated for
+# INGEST_JOB_STALE_SECONDS are resumed when the application starts. The spool
+# directory is made absolute once, so it does not follow the working directory.
+INGEST_JOB_DIR = os.path.abspath(os.getenv(
+    'INGEST_JOB_DIR', os.path.join(tempfile.gettempdir(), 'campaign_manager', 'ingest_jobs')
+))
+INGEST_MAX_JOBS = int(os.getenv('INGEST_MAX_JOBS', 2))
+INGEST_JOB_STALE_SECONDS = int(os.getenv('INGEST_JOB_STALE_SECONDS', 300))
+
+# Worker threads used by the API for blocking parsing and validation
+PARSE_MAX_WORKERS = int(os.getenv('PARSE_MAX_WORKERS', 4))
+
+# Worker processes building and validating upload chunks for ingest jobs; 1
+# builds them on the job's own thread
+BUILD_MAX_WORKERS = int(os.getenv('BUILD_MAX_WORKERS', os.cpu_count() or 1))
+
+# Campaign search: 'text' uses the text index, 'prefix' matches campaign_name prefixes
+SEARCH_MODE = os.getenv('SEARCH_MODE', 'text')
+
+# Number of full campaign documents kept in the Streamlit detail cache
+CAMPAIGN_DETAIL_CACHE_SIZE = int(os.getenv('CAMPAIGN_DETAIL_CACHE_SIZE', 128))
+
+# Streamlit query caches are keyed by data version; the TTL only bounds how
+# long writes made outside the application can go unnoticed.
+DATA_CACHE_TTL = int(os.getenv('DATA_CACHE_TTL', 3600))
+DATA_CACHE_MAX_ENTRIES = int(os.getenv('DATA_CACHE_MAX_ENTRIES', 256))
 
 # API Configuration
 API_HOST = os.getenv('API_HOST', '0.0.0.0')
 API_PORT = int(os.getenv('API_PORT', 8000))
 
 # Streamlit Configuration
-STREAMLIT_PORT = int(os.getenv('STREAMLIT_PORT', 8501)) 
\ No newline at end of file
+STREAMLIT_PORT = int(os.getenv('STREAMLIT_PORT', 8501))
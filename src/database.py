@@ -1,32 +1,37 @@
 import streamlit as st
-from pymongo import MongoClient
-from typing import List
-from .config import MONGO_URI, MONGO_DB_NAME, MONGO_COLLECTION_NAME
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+from .config import (
+    STORAGE_BACKEND,
+    CAMPAIGN_DETAIL_CACHE_SIZE,
+    DATA_CACHE_TTL,
+    DATA_CACHE_MAX_ENTRIES,
+)
 from .models.campaign_data import CampaignData
+from .repositories import CampaignRepository, get_repository
+from .services.jobs import resume_jobs
 
 @st.cache_resource
-def init_connection():
-    """Initialize MongoDB connection with caching"""
+def init_repository() -> CampaignRepository:
+    """Initialize the configured campaign store with caching"""
     try:
-        client = MongoClient(MONGO_URI, 
-                           tlsAllowInvalidCertificates=True,
-                           serverSelectionTimeoutMS=5000)
-        # The ismaster command is cheap and does not require auth.
-        client.admin.command('ismaster')
-        st.success("MongoDB connection successful!")
-        return client
+        repository = get_repository()
+        result = repository.prepare()
+        st.success(f"{STORAGE_BACKEND} connection successful!")
+        for error in result['failed']:
+            st.warning(f"Could not create index {error}")
+        resume_jobs(repository)
+        return repository
     except Exception as e:
-        st.error(f"Could not connect to MongoDB: {e}")
+        st.error(f"Could not connect to {STORAGE_BACKEND}: {e}")
         st.stop()
 
-@st.cache_data(ttl=60)
-def get_data() -> List[CampaignData]:
-    """Fetch campaign data from MongoDB with caching"""
-    client = init_connection()
-    db = client[MONGO_DB_NAME]
-    collection = db[MONGO_COLLECTION_NAME]
-    
-    items = list(collection.find().sort('_id', -1))
+def get_data_version() -> int:
+    """Read the campaign data version; cached queries are keyed on it"""
+    return init_repository().get_data_version()
+
+def to_campaigns(items: List[dict]) -> List[CampaignData]:
+    """Convert raw campaign documents into CampaignData objects"""
     campaigns = []
     for item in items:
         try:
@@ -37,4 +42,72 @@ def get_data() -> List[CampaignData]:
             st.error(f"Error processing campaign data: {e}")
             st.error(f"Problematic document: {item}")
             continue
-    return campaigns 
\ No newline at end of file
+    return campaigns
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES)
+def get_data(data_version: int) -> List[CampaignData]:
+    """Fetch all campaign data with caching"""
+    return to_campaigns(init_repository().get_all())
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES)
+def get_data_page(
+    data_version: int,
+    page_size: int,
+    after: Optional[str] = None,
+    status_filter: Optional[List[str]] = None,
+    search_term: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """Fetch the summary fields of one page of matching campaigns and the next cursor"""
+    return init_repository().get_page(page_size, after, status_filter, search_term)
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=CAMPAIGN_DETAIL_CACHE_SIZE)
+def get_campaign_details(data_version: int, campaign_id: str) -> Optional[CampaignData]:
+    """Fetch and hydrate a single full campaign by campaign_id"""
+    item = init_repository().get_campaign(campaign_id)
+    if item is None:
+        return None
+    campaigns = to_campaigns([item])
+    return campaigns[0] if campaigns else None
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES)
+def get_page_cursor(
+    data_version: int,
+    offset: int,
+    status_filter: Optional[List[str]] = None,
+    search_term: Optional[str] = None,
+) -> Optional[str]:
+    """Find the keyset cursor for a page that has not been visited yet"""
+    return init_repository().find_page_cursor(offset, status_filter, search_term)
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES)
+def get_campaign_count(
+    data_version: int,
+    status_filter: Optional[List[str]] = None,
+    search_term: Optional[str] = None,
+    exact: bool = False,
+) -> int:
+    """Count matching campaigns, using an estimate when unfiltered and allowed"""
+    return init_repository().count(status_filter, search_term, exact)
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES)
+def get_status_options(data_version: int) -> List[str]:
+    """List the distinct campaign statuses present in the store"""
+    return init_repository().get_status_options()
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES)
+def get_metrics(
+    data_version: int,
+    status_filter: Optional[List[str]] = None,
+    search_term: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Compute dashboard summary metrics for the matching campaigns"""
+    return init_repository().get_metrics(status_filter, search_term)
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES)
+def get_summary_frame(
+    data_version: int,
+    status_filter: Optional[List[str]] = None,
+    search_term: Optional[str] = None,
+) -> pd.DataFrame:
+    """Read the list fields of every matching campaign as a DataFrame"""
+    return init_repository().get_frame(None, status_filter, search_term)
@@ -0,0 +1,125 @@
+import argparse
+import logging
+import sys
+from typing import Any, Dict, List
+from pymongo import ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
+from .config import MONGO_DB_NAME, MONGO_COLLECTION_NAME
+
+logger = logging.getLogger(__name__)
+
+# Declared indexes for the campaign and campaign archive collections. Each
+# entry maps directly onto Collection.create_index(keys, name=..., **options).
+CAMPAIGN_INDEXES: List[Dict[str, Any]] = [
+    {
+        'name': 'campaign_id_unique',
+        'keys': [('campaign_id', ASCENDING)],
+        'options': {'unique': True},
+    },
+    {
+        'name': 'status_id',
+        'keys': [('campaign_status', ASCENDING), ('_id', DESCENDING)],
+        'options': {},
+    },
+    {
+        'name': 'status_start_date',
+        'keys': [('campaign_status', ASCENDING), ('overall_start_date', DESCENDING)],
+        'options': {},
+    },
+    {
+        'name': 'status_end_date',
+        'keys': [('campaign_status', ASCENDING), ('overall_end_date', ASCENDING)],
+        'options': {},
+    },
+    {
+        'name': 'start_date',
+        'keys': [('overall_start_date', DESCENDING)],
+        'options': {},
+    },
+    {
+        'name': 'campaign_name',
+        'keys': [('campaign_name', ASCENDING)],
+        'options': {},
+    },
+    {
+        'name': 'campaign_text',
+        'keys': [('campaign_name', TEXT), ('description', TEXT)],
+        'options': {'weights': {'campaign_name': 10, 'description': 1}},
+    },
+]
+
+def ensure_indexes(collection, indexes: List[Dict[str, Any]] = CAMPAIGN_INDEXES) -> Dict[str, List[str]]:
+    """Create any declared index that is missing; existing indexes are left as-is
+
+    Indexes that cannot be created are logged and listed under 'failed'.
+    """
+    live = collection.index_information()
+    created, failed = [], []
+    for spec in indexes:
+        if spec['name'] in live:
+            continue
+        try:
+            collection.create_index(spec['keys'], name=spec['name'], **spec['options'])
+            created.append(spec['name'])
+            logger.info("Created index %s on %s", spec['name'], collection.name)
+        except OperationFailure as e:
+            failed.append(f"{spec['name']}: {e}")
+            logger.warning("Could not create index %s on %s: %s", spec['name'], collection.name, e)
+    return {'created': created, 'failed': failed}
+
+def _declared_key(spec: Dict[str, Any]) -> List[tuple]:
+    """Return the key of a declared index in the form reported by the server"""
+    if any(direction == TEXT for _, direction in spec['keys']):
+        return [('_fts', 'text'), ('_ftsx', 1)]
+    return [(field, direction) for field, direction in spec['keys']]
+
+def _matches(spec: Dict[str, Any], info: Dict[str, Any]) -> bool:
+    """Check whether a live index matches its declaration"""
+    live_key = [(field, int(d) if isinstance(d, float) else d) for field, d in info['key']]
+    if live_key != _declared_key(spec):
+        return False
+    if spec['options'].get('unique', False) != info.get('unique', False):
+        return False
+    if 'weights' in spec['options']:
+        return spec['options']['weights'] == info.get('weights')
+    return True
+
+def diff_indexes(collection, indexes: List[Dict[str, Any]] = CAMPAIGN_INDEXES) -> Dict[str, List[str]]:
+    """Compare declared indexes with the live collection"""
+    live = collection.index_information()
+    declared = {spec['name']: spec for spec in indexes}
+    return {
+        'missing': [name for name in declared if name not in live],
+        'changed': [name for name, spec in declared.items()
+                    if name in live and not _matches(spec, live[name])],
+        'extra': [name for name in live if name != '_id_' and name not in declared],
+    }
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point: python -m src.indexes [--apply]"""
+    from .services.connection import get_client
+
+    parser = argparse.ArgumentParser(description="Diff declared indexes against the live collection")
+    parser.add_argument('--apply', action='store_true', help="create missing indexes")
+    args = parser.parse_args(argv)
+
+    collection = get_client()[MONGO_DB_NAME][MONGO_COLLECTION_NAME]
+    diff = diff_indexes(collection)
+    for status in ('missing', 'changed', 'extra'):
+        for name in diff[status]:
+            print(f"{status:8} {name}")
+    if not any(diff.values()):
+        print("Indexes are up to date")
+
+    if args.apply:
+        result = ensure_indexes(collection)
+        for name in result['created']:
+            print(f"created  {name}")
+        for error in result['failed']:
+            print(f"failed   {error}")
+        return 1 if result['failed'] else 0
+
+    return 1 if diff['missing'] or diff['changed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
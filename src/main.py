@@ -3,10 +3,17 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import threading
-from .api.routes import router as api_router
+import logging
+from .api.routes import router as api_router, db_service, repository
+from .services.async_database import AsyncDatabaseService
+from .services.connection import close_client
+from .services.executor import run_blocking, shutdown_executor
+from .services.jobs import get_job_executor, resume_jobs, shutdown_jobs
 from .ui.views import render_upload_section, render_view_section
 from .config import API_HOST, API_PORT
 
+logger = logging.getLogger(__name__)
+
 # Create FastAPI app
 app = FastAPI(
     title="Campaign Manager API",
@@ -26,6 +33,29 @@ app.add_middleware(
 # Include API routes
 app.include_router(api_router, prefix="/api")
 
+@app.on_event("startup")
+async def prepare_database():
+    """Create missing indexes and collections, backfill rollups, start the ingest pool and resume jobs"""
+    if isinstance(db_service, AsyncDatabaseService):
+        async with db_service as db:
+            await db.ensure_indexes()
+            await db.ensure_archive_indexes()
+            await db.ensure_rollups()
+            await db.ensure_weekly_collection()
+    else:
+        await run_blocking(repository.prepare)
+    get_job_executor()
+    resumed = await run_blocking(resume_jobs, repository)
+    if resumed:
+        logger.info("Resumed %d ingest jobs", resumed)
+
+@app.on_event("shutdown")
+def shutdown_db_client():
+    """Close the pooled MongoDB clients and parse workers when the API shuts down"""
+    shutdown_jobs()
+    shutdown_executor()
+    close_client()
+
 # Streamlit UI
 def run_streamlit():
     st.set_page_config(page_title="Campaign Manager", layout="wide")
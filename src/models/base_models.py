@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import List, Optional
 from datetime import datetime
 
@@ -63,4 +63,9 @@ class CampaignData(BaseModel):
     cost_details: CostDetails
     strategy_cells: List[StrategyCell]
     weekly_mail_drops: List[WeeklyMailDrop]
-    performance_summary: PerformanceSummary 
\ No newline at end of file
+    performance_summary: PerformanceSummary 
+
+# Cached validators for validating raw JSON bytes and dumping whole lists in
+# one call
+CAMPAIGN_ADAPTER = TypeAdapter(CampaignData)
+CAMPAIGN_LIST_ADAPTER = TypeAdapter(List[CampaignData])
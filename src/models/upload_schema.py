@@ -0,0 +1,76 @@
+from typing import Dict, Optional, Set, Union, get_args, get_origin
+from pydantic import BaseModel
+from .base_models import (
+    CampaignData,
+    CostDetails,
+    CostBreakdown,
+    StrategyCell,
+    WeeklyMailDrop,
+    CellMailedThisWeek,
+    PerformanceSummary,
+)
+
+# Column kinds of the scalar model types; str fields named *_date hold ISO
+# dates and are parsed as dates on upload.
+KINDS = {str: 'str', int: 'int', float: 'float'}
+
+def _unwrap(annotation) -> tuple:
+    """Return a field's type without Optional and whether it allows None"""
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return (args[0] if len(args) == 1 else annotation), len(args) < len(get_args(annotation))
+    return annotation, False
+
+def column_kind(name: str, annotation) -> Optional[str]:
+    """Upload column kind of a model field, or None for nested models and lists"""
+    kind = KINDS.get(_unwrap(annotation)[0])
+    if kind == 'str' and name.endswith('_date'):
+        return 'date'
+    return kind
+
+def model_columns(model: type[BaseModel]) -> Dict[str, str]:
+    """Map a model's scalar fields to their upload column kinds, in field order"""
+    columns = {}
+    for name, field in model.model_fields.items():
+        kind = column_kind(name, field.annotation)
+        if kind:
+            columns[name] = kind
+    return columns
+
+def optional_columns(*models: type[BaseModel]) -> Set[str]:
+    """Scalar fields of ``models`` that may be None"""
+    return {
+        name
+        for model in models
+        for name, field in model.model_fields.items()
+        if name in model_columns(model) and _unwrap(field.annotation)[1]
+    }
+
+# Flat upload columns grouped by the document section they fill, each with the
+# kind it is coerced to
+CAMPAIGN_COLUMNS = model_columns(CampaignData)
+COST_COLUMNS = model_columns(CostDetails)
+BREAKDOWN_COLUMNS = model_columns(CostBreakdown)
+CELL_COLUMNS = model_columns(StrategyCell)
+DROP_COLUMNS = model_columns(WeeklyMailDrop)
+PERFORMANCE_COLUMNS = model_columns(PerformanceSummary)
+
+# Per-week cell columns; when present each row also becomes an entry in its
+# drop's cells_mailed_this_week
+WEEK_CELL_COLUMNS = model_columns(CellMailedThisWeek)
+
+# Columns that may be blank or absent; they are stored as None
+OPTIONAL_COLUMNS = optional_columns(StrategyCell, WeeklyMailDrop)
+
+UPLOAD_COLUMNS = {
+    **CAMPAIGN_COLUMNS,
+    **COST_COLUMNS,
+    **BREAKDOWN_COLUMNS,
+    **CELL_COLUMNS,
+    **DROP_COLUMNS,
+    **PERFORMANCE_COLUMNS,
+}
+
+def normalize_column_name(name: str) -> str:
+    """Lower-case a header and replace spaces with underscores"""
+    return name.replace(' ', '_').lower()
@@ -0,0 +1,21 @@
+from .base import CampaignRepository, SUMMARY_FIELDS, SUMMARY_COLUMNS
+
+def get_repository(backend: str = None) -> CampaignRepository:
+    """Create the campaign repository selected by STORAGE_BACKEND"""
+    from ..config import STORAGE_BACKEND
+
+    backend = (backend or STORAGE_BACKEND).lower()
+    if backend == 'mongo':
+        from .mongo import MongoCampaignRepository
+        return MongoCampaignRepository()
+    if backend == 'sqlite':
+        from .sqlite import SQLiteCampaignRepository
+        return SQLiteCampaignRepository()
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+__all__ = [
+    'CampaignRepository',
+    'SUMMARY_FIELDS',
+    'SUMMARY_COLUMNS',
+    'get_repository',
+]
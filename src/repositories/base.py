@@ -0,0 +1,157 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import pandas as pd
+
+class CampaignRepository(ABC):
+    """Storage-independent access to campaign documents
+
+    Campaigns go in and come out as plain nested dicts shaped like
+    CampaignData.to_dict(). Summaries returned by get_page() carry only the
+    list fields (see SUMMARY_FIELDS) in the same nested shape.
+    """
+
+    @abstractmethod
+    def prepare(self):
+        """Create whatever schema, indexes or derived data the backend needs"""
+
+    @abstractmethod
+    def upsert_campaigns(
+        self,
+        documents: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Insert or replace campaigns keyed on campaign_id; returns per-chunk reports"""
+
+    @abstractmethod
+    def get_page(
+        self,
+        page_size: int,
+        after: Optional[str] = None,
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return one page of matching campaign summaries, newest first, and the next cursor"""
+
+    @abstractmethod
+    def find_page_cursor(
+        self,
+        offset: int,
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+    ) -> Optional[str]:
+        """Return the cursor that starts a page ``offset`` campaigns in"""
+
+    @abstractmethod
+    def count(
+        self,
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+        exact: bool = False,
+    ) -> int:
+        """Count matching campaigns"""
+
+    @abstractmethod
+    def get_metrics(
+        self,
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Compute the dashboard summary metrics for matching campaigns"""
+
+    @abstractmethod
+    def get_status_options(self) -> List[str]:
+        """List the distinct campaign statuses"""
+
+    @abstractmethod
+    def get_campaign(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        """Return one full campaign document, or None"""
+
+    @abstractmethod
+    def get_campaigns(self, campaign_ids: List[str]) -> List[Dict[str, Any]]:
+        """Return the full documents of these campaigns in the same order, skipping unknown ids"""
+
+    @abstractmethod
+    def get_all(self) -> List[Dict[str, Any]]:
+        """Return every full campaign document, newest first"""
+
+    @abstractmethod
+    def get_frame(
+        self,
+        columns: Optional[List[str]] = None,
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Return matching campaigns newest first as a DataFrame
+
+        ``columns`` are dotted document paths (default SUMMARY_COLUMNS); each
+        becomes a column named after its last segment.
+        """
+
+    @abstractmethod
+    def get_weekly_trends(
+        self,
+        start: datetime,
+        end: datetime,
+        unit: str = 'week',
+        campaign_ids: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return mail-drop totals in week or month buckets for a date range"""
+
+    @abstractmethod
+    def save_job(self, job: Dict[str, Any]):
+        """Insert or replace an ingest job's state, keyed on job_id"""
+
+    @abstractmethod
+    def claim_job(self, job: Dict[str, Any], status: str, updated_at: str) -> bool:
+        """Replace a job's state only if it is still at ``status`` and ``updated_at``
+
+        Returns whether the job was replaced, so of several processes claiming
+        the same job exactly one succeeds.
+        """
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return an ingest job's state, or None"""
+
+    @abstractmethod
+    def list_jobs(self, statuses: Optional[List[str]] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Return ingest jobs, newest first, optionally only those in ``statuses``"""
+
+    @abstractmethod
+    def log_ingest(self, entry: Dict[str, Any]):
+        """Record a completed upload, keyed on its file fingerprint"""
+
+    @abstractmethod
+    def get_ingest(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Return the last completed upload with this fingerprint, or None"""
+
+    @abstractmethod
+    def get_data_version(self) -> int:
+        """Return a counter that changes whenever campaigns are written"""
+
+    @abstractmethod
+    def bump_data_version(self):
+        """Record that campaigns have been written"""
+
+# Fields in the list summaries returned by get_page(), as (section, field)
+# pairs; section is None for top-level campaign fields.
+SUMMARY_FIELDS = [
+    (None, 'campaign_id'),
+    (None, 'campaign_name'),
+    (None, 'description'),
+    (None, 'campaign_goal'),
+    (None, 'target_audience_criteria'),
+    (None, 'overall_start_date'),
+    (None, 'overall_end_date'),
+    (None, 'campaign_status'),
+    ('cost_details', 'overall_budget'),
+    ('cost_details', 'total_campaign_cost_actual'),
+    ('performance_summary', 'total_campaign_pieces_sent'),
+    ('performance_summary', 'overall_response_rate'),
+    ('performance_summary', 'overall_conversion_rate'),
+    ('performance_summary', 'campaign_roi'),
+]
+
+# SUMMARY_FIELDS as dotted document paths
+SUMMARY_COLUMNS = [f'{section}.{field}' if section else field for section, field in SUMMARY_FIELDS]
@@ -0,0 +1,173 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import pandas as pd
+from pymongo import DESCENDING
+from ..config import (
+    MONGO_DB_NAME,
+    MONGO_COLLECTION_NAME,
+    MONGO_ARCHIVE_COLLECTION_NAME,
+    MONGO_JOBS_COLLECTION_NAME,
+    MONGO_INGEST_LOG_COLLECTION_NAME,
+)
+from ..indexes import ensure_indexes
+from ..services.connection import get_client
+from ..services.pagination import fetch_merged_page, find_merged_page_cursor, count_merged_documents
+from ..services.queries import build_campaign_query
+from ..services.metrics import get_campaign_metrics
+from ..services.batching import wrote_any
+from ..services.ingest import upsert_campaigns
+from ..services.rollups import ensure_rollups, get_rollup_metrics
+from ..services.timeseries import ensure_weekly_collection, get_weekly_trends
+from ..services.versioning import get_data_version, bump_data_version
+from ..services.bulk_reads import read_frame
+from ..services.archive import includes_archive, tier_collections, ensure_archive_indexes
+from .base import CampaignRepository, SUMMARY_FIELDS, SUMMARY_COLUMNS
+
+# Projection of the list summary fields; nested cells and mail drops are only
+# loaded for campaigns whose details are opened.
+SUMMARY_PROJECTION = {
+    (f'{section}.{field}' if section else field): 1
+    for section, field in SUMMARY_FIELDS
+}
+
+class MongoCampaignRepository(CampaignRepository):
+    """Campaign repository backed by the shared MongoDB client
+
+    Long-completed campaigns live in an archive collection (see
+    src.services.archive); filtered reads include it only when the status
+    filter selects an archived status, and lookups by campaign_id fall back
+    to it.
+    """
+
+    def __init__(self, db_name: str = MONGO_DB_NAME, collection_name: str = MONGO_COLLECTION_NAME):
+        self.db_name = db_name
+        self.collection_name = collection_name
+
+    @property
+    def db(self):
+        return get_client()[self.db_name]
+
+    @property
+    def collection(self):
+        return self.db[self.collection_name]
+
+    @property
+    def archive(self):
+        return self.db[MONGO_ARCHIVE_COLLECTION_NAME]
+
+    def tiers(self, status_filter=None):
+        return tier_collections(self.db, self.collection_name, status_filter)
+
+    def prepare(self) -> Dict[str, List[str]]:
+        """Check connectivity, apply indexes and backfill derived collections"""
+        # The ismaster command is cheap and does not require auth.
+        get_client().admin.command('ismaster')
+        result = ensure_indexes(self.collection)
+        result['failed'] += ensure_archive_indexes(self.db)['failed']
+        ensure_rollups(self.db, self.collection_name)
+        ensure_weekly_collection(self.db)
+        return result
+
+    def upsert_campaigns(self, documents, batch_size=None):
+        reports = upsert_campaigns(self.collection, documents, batch_size)
+        if wrote_any(reports):
+            self.bump_data_version()
+        return reports
+
+    def get_page(self, page_size, after=None, status_filter=None, search_term=None):
+        query = build_campaign_query(status_filter, search_term)
+        items, next_cursor = fetch_merged_page(self.tiers(status_filter), page_size, after, query, SUMMARY_PROJECTION)
+        for item in items:
+            del item['_id']
+        return items, next_cursor
+
+    def find_page_cursor(self, offset, status_filter=None, search_term=None):
+        query = build_campaign_query(status_filter, search_term)
+        return find_merged_page_cursor(self.tiers(status_filter), offset, query)
+
+    def count(self, status_filter=None, search_term=None, exact=False):
+        query = build_campaign_query(status_filter, search_term)
+        return count_merged_documents(self.tiers(status_filter), query, exact=exact)
+
+    def get_metrics(self, status_filter=None, search_term=None):
+        archived = includes_archive(status_filter)
+        if not (search_term or '').strip():
+            return get_rollup_metrics(self.db, status_filter, include_archived=archived)
+        return get_campaign_metrics(
+            self.collection,
+            build_campaign_query(status_filter, search_term),
+            union_with=[MONGO_ARCHIVE_COLLECTION_NAME] if archived else [],
+        )
+
+    def get_status_options(self):
+        return sorted(set(self.collection.distinct('campaign_status'))
+                      | set(self.archive.distinct('campaign_status')))
+
+    def get_campaign(self, campaign_id):
+        query = {'campaign_id': campaign_id}
+        return (self.collection.find_one(query, {'_id': 0})
+                or self.archive.find_one(query, {'_id': 0}))
+
+    def get_campaigns(self, campaign_ids):
+        query = {'campaign_id': {'$in': list(campaign_ids)}}
+        found = {
+            doc['campaign_id']: doc
+            for collection in (self.archive, self.collection)
+            for doc in collection.find(query, {'_id': 0})
+        }
+        return [found[campaign_id] for campaign_id in campaign_ids if campaign_id in found]
+
+    def get_all(self):
+        return [
+            doc
+            for collection in (self.collection, self.archive)
+            for doc in collection.find({}, {'_id': 0}).sort('_id', DESCENDING)
+        ]
+
+    def get_frame(self, columns=None, status_filter=None, search_term=None):
+        query = build_campaign_query(status_filter, search_term)
+        return pd.concat(
+            [read_frame(collection, columns or SUMMARY_COLUMNS, query)
+             for collection in self.tiers(status_filter)],
+            ignore_index=True,
+        )
+
+    def get_weekly_trends(self, start, end, unit='week', campaign_ids=None):
+        return get_weekly_trends(self.db, start, end, unit, campaign_ids)
+
+    def save_job(self, job):
+        self.db[MONGO_JOBS_COLLECTION_NAME].replace_one(
+            {'_id': job['job_id']}, {**job, '_id': job['job_id']}, upsert=True
+        )
+
+    def claim_job(self, job, status, updated_at):
+        result = self.db[MONGO_JOBS_COLLECTION_NAME].replace_one(
+            {'_id': job['job_id'], 'status': status, 'updated_at': updated_at},
+            {**job, '_id': job['job_id']},
+        )
+        return result.matched_count == 1
+
+    def get_job(self, job_id):
+        return self.db[MONGO_JOBS_COLLECTION_NAME].find_one({'_id': job_id}, {'_id': 0})
+
+    def list_jobs(self, statuses=None, limit=50):
+        query = {'status': {'$in': list(statuses)}} if statuses else {}
+        return list(
+            self.db[MONGO_JOBS_COLLECTION_NAME].find(query, {'_id': 0})
+            .sort('created_at', DESCENDING)
+            .limit(limit)
+        )
+
+    def log_ingest(self, entry):
+        self.db[MONGO_INGEST_LOG_COLLECTION_NAME].replace_one(
+            {'_id': entry['fingerprint']}, {**entry, '_id': entry['fingerprint']}, upsert=True
+        )
+
+    def get_ingest(self, fingerprint):
+        return self.db[MONGO_INGEST_LOG_COLLECTION_NAME].find_one({'_id': fingerprint}, {'_id': 0})
+
+    def get_data_version(self):
+        return get_data_version(self.db, self.collection_name)
+
+    def bump_data_version(self):
+        bump_data_version(self.db, self.collection_name)
@@ -0,0 +1,540 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import pandas as pd
+from ..config import SQLITE_PATH, INGEST_BATCH_SIZE, SEARCH_MODE
+from ..services.batching import chunked, latest_per_campaign, wrote_any
+from ..services.fingerprints import changed_entries
+from ..services.metrics import EMPTY_METRICS
+from ..services.pagination import InvalidCursor
+from .base import CampaignRepository, SUMMARY_FIELDS, SUMMARY_COLUMNS
+
+# Campaign columns as (path, field, type); path is the nested document
+# section the field lives in.
+CAMPAIGN_COLUMNS = [
+    ((), 'campaign_id', 'TEXT NOT NULL UNIQUE'),
+    ((), 'campaign_name', 'TEXT'),
+    ((), 'description', 'TEXT'),
+    ((), 'campaign_goal', 'TEXT'),
+    ((), 'target_audience_criteria', 'TEXT'),
+    ((), 'overall_start_date', 'TEXT'),
+    ((), 'overall_end_date', 'TEXT'),
+    ((), 'campaign_status', 'TEXT'),
+    (('cost_details',), 'overall_budget', 'REAL'),
+    (('cost_details',), 'total_campaign_cost_planned', 'REAL'),
+    (('cost_details',), 'total_campaign_cost_actual', 'REAL'),
+    (('cost_details',), 'cost_per_piece_planned', 'REAL'),
+    (('cost_details',), 'cost_per_piece_actual', 'REAL'),
+    (('cost_details', 'cost_breakdown'), 'printing_cost_actual', 'REAL'),
+    (('cost_details', 'cost_breakdown'), 'postage_cost_actual', 'REAL'),
+    (('cost_details', 'cost_breakdown'), 'data_cost_actual', 'REAL'),
+    (('cost_details', 'cost_breakdown'), 'other_costs_actual', 'REAL'),
+    (('performance_summary',), 'total_campaign_pieces_sent', 'INTEGER'),
+    (('performance_summary',), 'total_campaign_responses', 'INTEGER'),
+    (('performance_summary',), 'overall_response_rate', 'REAL'),
+    (('performance_summary',), 'total_campaign_conversions', 'INTEGER'),
+    (('performance_summary',), 'overall_conversion_rate', 'REAL'),
+    (('performance_summary',), 'total_campaign_conversion_value', 'REAL'),
+    (('performance_summary',), 'average_conversion_value', 'REAL'),
+    (('performance_summary',), 'campaign_roi', 'REAL'),
+    ((), 'content_hash', 'TEXT'),
+]
+
+CELL_COLUMNS = [
+    ('cell_no', 'TEXT'),
+    ('cell_description', 'TEXT'),
+    ('assigned_creative_id', 'TEXT'),
+    ('assigned_offer_code', 'TEXT'),
+    ('campaign_total_mailed', 'INTEGER'),
+    ('campaign_total_responses', 'INTEGER'),
+    ('campaign_total_conversions', 'INTEGER'),
+    ('campaign_total_conversion_value', 'REAL'),
+]
+
+DROP_COLUMNS = [
+    ('mail_drop_id', 'TEXT'),
+    ('mailing_week_start_date', 'TEXT'),
+    ('planned_send_date', 'TEXT'),
+    ('actual_send_date', 'TEXT'),
+    ('total_pieces_sent_this_week', 'INTEGER'),
+]
+
+WEEK_CELL_COLUMNS = [
+    ('cell_no', 'TEXT'),
+    ('quantity_mailed_this_week', 'INTEGER'),
+    ('responses_this_week', 'INTEGER'),
+    ('conversions_this_week', 'INTEGER'),
+    ('conversion_value_this_week', 'REAL'),
+]
+
+def _columns_sql(columns) -> str:
+    return ',\n    '.join(f'{name} {sql_type}' for name, sql_type in columns)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS campaigns (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    {_columns_sql((field, sql_type) for _, field, sql_type in CAMPAIGN_COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS strategy_cells (
+    campaign_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    {_columns_sql(CELL_COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS weekly_mail_drops (
+    campaign_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    {_columns_sql(DROP_COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS cells_mailed_this_week (
+    campaign_id TEXT NOT NULL,
+    drop_position INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    {_columns_sql(WEEK_CELL_COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ingest_log (
+    fingerprint TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS data_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ingest_jobs_status ON ingest_jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS campaigns_status_id ON campaigns (campaign_status, id);
+CREATE INDEX IF NOT EXISTS campaigns_start_date ON campaigns (overall_start_date);
+CREATE INDEX IF NOT EXISTS strategy_cells_campaign ON strategy_cells (campaign_id, position);
+CREATE INDEX IF NOT EXISTS weekly_mail_drops_campaign ON weekly_mail_drops (campaign_id, position);
+CREATE INDEX IF NOT EXISTS weekly_mail_drops_week ON weekly_mail_drops (mailing_week_start_date);
+CREATE INDEX IF NOT EXISTS cells_mailed_this_week_drop ON cells_mailed_this_week (campaign_id, drop_position, position);
+"""
+
+CHILD_TABLES = ('strategy_cells', 'weekly_mail_drops', 'cells_mailed_this_week')
+
+# Most values bound to one statement; SQLite builds before 3.32 allow only 999.
+# Upserts bind each chunk's campaign_ids as one IN list, so chunks are capped.
+SQLITE_MAX_VARIABLES = 999
+
+# Bucket expressions over a 'YYYY-MM-DD' week start; weeks start on Sunday
+# to match MongoDB's $dateTrunc default.
+TREND_BUCKETS = {
+    'week': "date(week_start, '-' || strftime('%w', week_start) || ' days')",
+    'month': "strftime('%Y-%m-01', week_start)",
+}
+
+def _get(doc: Dict[str, Any], path: tuple, field: str):
+    for part in path:
+        doc = doc.get(part) or {}
+    return doc.get(field)
+
+def _set(doc: Dict[str, Any], path: tuple, field: str, value):
+    for part in path:
+        doc = doc.setdefault(part, {})
+    doc[field] = value
+
+def _placeholders(count: int) -> str:
+    return ', '.join('?' * count)
+
+def campaign_row(doc: Dict[str, Any]) -> tuple:
+    """Flatten the scalar fields of a campaign document into a campaigns row"""
+    return tuple(_get(doc, path, field) for path, field, _ in CAMPAIGN_COLUMNS)
+
+def child_rows(doc: Dict[str, Any]) -> Dict[str, List[tuple]]:
+    """Normalize a campaign's nested arrays into rows for each child table"""
+    campaign_id = doc['campaign_id']
+    rows = {table: [] for table in CHILD_TABLES}
+    for position, cell in enumerate(doc.get('strategy_cells') or []):
+        rows['strategy_cells'].append(
+            (campaign_id, position) + tuple(cell.get(name) for name, _ in CELL_COLUMNS)
+        )
+    for drop_position, drop in enumerate(doc.get('weekly_mail_drops') or []):
+        rows['weekly_mail_drops'].append(
+            (campaign_id, drop_position) + tuple(drop.get(name) for name, _ in DROP_COLUMNS)
+        )
+        for position, cell in enumerate(drop.get('cells_mailed_this_week') or []):
+            rows['cells_mailed_this_week'].append(
+                (campaign_id, drop_position, position)
+                + tuple(cell.get(name) for name, _ in WEEK_CELL_COLUMNS)
+            )
+    return rows
+
+def _glob_literal(text: str) -> str:
+    return ''.join(f'[{char}]' if char in '*?[' else char for char in text)
+
+def build_filters(
+    status_filter: Optional[List[str]] = None,
+    search_term: Optional[str] = None,
+) -> Tuple[List[str], List[Any]]:
+    """Translate the campaign list filters into SQL conditions and parameters
+
+    Search follows SEARCH_MODE like the MongoDB query: 'prefix' is a
+    case-sensitive prefix match on campaign_name. 'text' matches campaigns whose
+    name or description contains any of the words; unlike MongoDB's $text it
+    matches substrings case-insensitively (ASCII only) and does no stemming or
+    stop-word removal.
+    """
+    clauses, params = [], []
+    if status_filter:
+        clauses.append(f"campaign_status IN ({_placeholders(len(status_filter))})")
+        params.extend(status_filter)
+    search_term = (search_term or '').strip()
+    if search_term and SEARCH_MODE == 'prefix':
+        clauses.append("campaign_name GLOB ?")
+        params.append(_glob_literal(search_term) + '*')
+    elif search_term:
+        words = []
+        for word in search_term.split():
+            pattern = '%' + word.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            words.append("campaign_name LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\'")
+            params.extend([pattern, pattern])
+        clauses.append(f"({' OR '.join(words)})")
+    return clauses, params
+
+def _where(clauses: List[str]) -> str:
+    return f"WHERE {' AND '.join(clauses)}" if clauses else ''
+
+class SQLiteCampaignRepository(CampaignRepository):
+    """Embedded campaign repository storing normalized tables in SQLite"""
+
+    def __init__(self, path: str = SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = conn
+        return conn
+
+    def prepare(self) -> Dict[str, List[str]]:
+        """Create the tables and indexes if they do not exist
+
+        Campaign columns added since a database was created are added to it.
+        """
+        with self._write_lock, self.connection as conn:
+            conn.executescript(SCHEMA)
+            existing = {row['name'] for row in conn.execute("PRAGMA table_info(campaigns)")}
+            for _, field, sql_type in CAMPAIGN_COLUMNS:
+                if field not in existing:
+                    conn.execute(f"ALTER TABLE campaigns ADD COLUMN {field} {sql_type}")
+        return {'created': [], 'failed': []}
+
+    def upsert_campaigns(self, documents, batch_size=None):
+        batch_size = min(batch_size or INGEST_BATCH_SIZE, SQLITE_MAX_VARIABLES)
+        fields = [field for _, field, _ in CAMPAIGN_COLUMNS]
+        upsert_sql = (
+            f"INSERT INTO campaigns ({', '.join(fields)}) VALUES ({_placeholders(len(fields))}) "
+            f"ON CONFLICT(campaign_id) DO UPDATE SET "
+            + ', '.join(f'{field} = excluded.{field}' for field in fields[1:])
+        )
+        reports = []
+        for index, entries in enumerate(chunked(latest_per_campaign(documents), batch_size)):
+            report = {'chunk': index, 'inserted': 0, 'updated': 0, 'failed': 0,
+                      'unchanged': 0, 'upserted_ids': [], 'errors': []}
+            stored = {
+                row[0]: row[1] for row in self.connection.execute(
+                    f"SELECT campaign_id, content_hash FROM campaigns "
+                    f"WHERE campaign_id IN ({_placeholders(len(entries))})",
+                    [doc['campaign_id'] for _, doc in entries],
+                )
+            }
+            entries, report['unchanged'] = changed_entries(entries, stored)
+            rows, children, campaign_ids = [], {table: [] for table in CHILD_TABLES}, []
+            for position, doc in entries:
+                try:
+                    row = campaign_row(doc)
+                    for table, table_rows in child_rows(doc).items():
+                        children[table].extend(table_rows)
+                except (AttributeError, KeyError, TypeError) as e:
+                    report['errors'].append({'index': position, 'message': str(e)})
+                    continue
+                rows.append(row)
+                campaign_ids.append(doc['campaign_id'])
+
+            if rows:
+                id_list = _placeholders(len(campaign_ids))
+                try:
+                    with self._write_lock, self.connection as conn:
+                        existing = {
+                            row[0] for row in conn.execute(
+                                f"SELECT campaign_id FROM campaigns WHERE campaign_id IN ({id_list})",
+                                campaign_ids,
+                            )
+                        }
+                        conn.executemany(upsert_sql, rows)
+                        for table in CHILD_TABLES:
+                            conn.execute(f"DELETE FROM {table} WHERE campaign_id IN ({id_list})", campaign_ids)
+                            if children[table]:
+                                width = len(children[table][0])
+                                conn.executemany(
+                                    f"INSERT INTO {table} VALUES ({_placeholders(width)})",
+                                    children[table],
+                                )
+                        new_ids = [campaign_id for campaign_id in campaign_ids if campaign_id not in existing]
+                        if new_ids:
+                            report['upserted_ids'] = [
+                                str(row[0]) for row in conn.execute(
+                                    f"SELECT id FROM campaigns WHERE campaign_id IN ({_placeholders(len(new_ids))})",
+                                    new_ids,
+                                )
+                            ]
+                    report['inserted'] = len(new_ids)
+                    report['updated'] = len(campaign_ids) - len(new_ids)
+                except sqlite3.Error as e:
+                    attempted = set(campaign_ids)
+                    report['errors'].extend(
+                        {'index': position, 'message': str(e)}
+                        for position, doc in entries if doc['campaign_id'] in attempted
+                    )
+
+            report['failed'] = len(report['errors'])
+            reports.append(report)
+        if wrote_any(reports):
+            self.bump_data_version()
+        return reports
+
+    def _summary(self, row: sqlite3.Row) -> Dict[str, Any]:
+        summary = {}
+        for section, field in SUMMARY_FIELDS:
+            _set(summary, (section,) if section else (), field, row[field])
+        return summary
+
+    def get_page(self, page_size, after=None, status_filter=None, search_term=None):
+        clauses, params = build_filters(status_filter, search_term)
+        if after:
+            if not after.isdigit():
+                raise InvalidCursor(f"Invalid page cursor: {after}")
+            clauses.append('id < ?')
+            params.append(int(after))
+        fields = ', '.join(field for _, field in SUMMARY_FIELDS)
+        rows = self.connection.execute(
+            f"SELECT id, {fields} FROM campaigns {_where(clauses)} ORDER BY id DESC LIMIT ?",
+            params + [page_size],
+        ).fetchall()
+        next_cursor = str(rows[-1]['id']) if len(rows) == page_size else None
+        return [self._summary(row) for row in rows], next_cursor
+
+    def find_page_cursor(self, offset, status_filter=None, search_term=None):
+        if offset <= 0:
+            return None
+        clauses, params = build_filters(status_filter, search_term)
+        row = self.connection.execute(
+            f"SELECT id FROM campaigns {_where(clauses)} ORDER BY id DESC LIMIT 1 OFFSET ?",
+            params + [offset - 1],
+        ).fetchone()
+        return str(row['id']) if row else None
+
+    def count(self, status_filter=None, search_term=None, exact=False):
+        clauses, params = build_filters(status_filter, search_term)
+        return self.connection.execute(
+            f"SELECT COUNT(*) FROM campaigns {_where(clauses)}", params
+        ).fetchone()[0]
+
+    def get_metrics(self, status_filter=None, search_term=None):
+        clauses, params = build_filters(status_filter, search_term)
+        row = self.connection.execute(
+            f"""
+            SELECT
+                COUNT(*) AS total_campaigns,
+                SUM(CASE WHEN campaign_status = 'Active' THEN 1 ELSE 0 END) AS active_campaigns,
+                AVG(campaign_roi) AS average_roi,
+                SUM(overall_budget) AS total_budget,
+                SUM(total_campaign_pieces_sent) AS total_pieces_sent,
+                SUM(total_campaign_responses) AS total_responses,
+                SUM(total_campaign_conversions) AS total_conversions,
+                SUM(total_campaign_conversion_value) AS total_conversion_value
+            FROM campaigns {_where(clauses)}
+            """,
+            params,
+        ).fetchone()
+        metrics = dict(EMPTY_METRICS)
+        metrics.update({key: row[key] for key in row.keys() if row[key] is not None})
+        return metrics
+
+    def get_status_options(self):
+        rows = self.connection.execute(
+            "SELECT DISTINCT campaign_status FROM campaigns WHERE campaign_status IS NOT NULL ORDER BY 1"
+        )
+        return [row[0] for row in rows]
+
+    def _load_documents(self, where: str = '', params: List[Any] = ()) -> List[Dict[str, Any]]:
+        """Reassemble full nested campaign documents from the normalized tables"""
+        conn = self.connection
+        campaigns = conn.execute(f"SELECT * FROM campaigns {where} ORDER BY id DESC", params).fetchall()
+        if not campaigns:
+            return []
+        campaign_ids = [row['campaign_id'] for row in campaigns]
+        # Children are selected by the same filter rather than an IN list of
+        # ids, which could exceed the bound-variable limit
+        id_filter = f"WHERE campaign_id IN (SELECT campaign_id FROM campaigns {where})"
+
+        docs = {}
+        for row in campaigns:
+            doc = {}
+            for path, field, _ in CAMPAIGN_COLUMNS:
+                _set(doc, path, field, row[field])
+            doc['strategy_cells'] = []
+            doc['weekly_mail_drops'] = []
+            docs[row['campaign_id']] = doc
+
+        for row in conn.execute(f"SELECT * FROM strategy_cells {id_filter} ORDER BY campaign_id, position",
+                                params):
+            docs[row['campaign_id']]['strategy_cells'].append({name: row[name] for name, _ in CELL_COLUMNS})
+
+        drops = {}
+        for row in conn.execute(f"SELECT * FROM weekly_mail_drops {id_filter} ORDER BY campaign_id, position",
+                                params):
+            drop = {name: row[name] for name, _ in DROP_COLUMNS}
+            drop['cells_mailed_this_week'] = []
+            drops[(row['campaign_id'], row['position'])] = drop
+            docs[row['campaign_id']]['weekly_mail_drops'].append(drop)
+
+        for row in conn.execute(
+            f"SELECT * FROM cells_mailed_this_week {id_filter} ORDER BY campaign_id, drop_position, position",
+            params,
+        ):
+            drop = drops.get((row['campaign_id'], row['drop_position']))
+            if drop is not None:
+                drop['cells_mailed_this_week'].append({name: row[name] for name, _ in WEEK_CELL_COLUMNS})
+
+        return [docs[campaign_id] for campaign_id in campaign_ids]
+
+    def get_campaign(self, campaign_id):
+        docs = self._load_documents("WHERE campaign_id = ?", [campaign_id])
+        return docs[0] if docs else None
+
+    def get_campaigns(self, campaign_ids):
+        found = {}
+        for ids in chunked(list(campaign_ids), SQLITE_MAX_VARIABLES):
+            for doc in self._load_documents(f"WHERE campaign_id IN ({_placeholders(len(ids))})", ids):
+                found[doc['campaign_id']] = doc
+        return [found[campaign_id] for campaign_id in campaign_ids if campaign_id in found]
+
+    def get_all(self):
+        return self._load_documents()
+
+    def get_frame(self, columns=None, status_filter=None, search_term=None):
+        known = {field for _, field, _ in CAMPAIGN_COLUMNS}
+        fields = [path.rsplit('.', 1)[-1] for path in (columns or SUMMARY_COLUMNS)]
+        unknown = [field for field in fields if field not in known]
+        if unknown:
+            raise ValueError(f"Unknown campaign columns: {', '.join(unknown)}")
+        clauses, params = build_filters(status_filter, search_term)
+        return pd.read_sql_query(
+            f"SELECT {', '.join(fields)} FROM campaigns {_where(clauses)} ORDER BY id DESC",
+            self.connection,
+            params=params,
+        )
+
+    def get_weekly_trends(self, start, end, unit='week', campaign_ids=None):
+        if unit not in TREND_BUCKETS:
+            raise ValueError(f"unit must be one of {', '.join(TREND_BUCKETS)}")
+        clauses = ['week_start >= ?', 'week_start < ?']
+        params = [start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')]
+        if campaign_ids:
+            clauses.append(f"campaign_id IN ({_placeholders(len(campaign_ids))})")
+            params.extend(campaign_ids)
+        rows = self.connection.execute(
+            f"""
+            WITH facts AS (
+                SELECT d.campaign_id, substr(d.mailing_week_start_date, 1, 10) AS week_start,
+                       c.quantity_mailed_this_week AS quantity, c.responses_this_week AS responses,
+                       c.conversions_this_week AS conversions, c.conversion_value_this_week AS value
+                FROM weekly_mail_drops d
+                JOIN cells_mailed_this_week c
+                  ON c.campaign_id = d.campaign_id AND c.drop_position = d.position
+                UNION ALL
+                SELECT d.campaign_id, substr(d.mailing_week_start_date, 1, 10),
+                       d.total_pieces_sent_this_week, 0, 0, 0.0
+                FROM weekly_mail_drops d
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM cells_mailed_this_week c
+                    WHERE c.campaign_id = d.campaign_id AND c.drop_position = d.position
+                )
+            )
+            SELECT {TREND_BUCKETS[unit]} AS period_start,
+                   SUM(quantity) AS quantity, SUM(responses) AS responses,
+                   SUM(conversions) AS conversions, SUM(value) AS value,
+                   COUNT(DISTINCT campaign_id) AS campaign_count
+            FROM facts {_where(clauses)}
+            GROUP BY period_start
+            ORDER BY period_start
+            """,
+            params,
+        ).fetchall()
+        trends = []
+        for row in rows:
+            trend = dict(row)
+            trend['period_start'] = datetime.strptime(row['period_start'], '%Y-%m-%d')
+            trends.append(trend)
+        return trends
+
+    def save_job(self, job):
+        with self._write_lock, self.connection as conn:
+            conn.execute(
+                "INSERT INTO ingest_jobs (job_id, status, created_at, state) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET status = excluded.status, state = excluded.state",
+                (job['job_id'], job['status'], job['created_at'], json.dumps(job)),
+            )
+
+    def claim_job(self, job, status, updated_at):
+        with self._write_lock, self.connection as conn:
+            cursor = conn.execute(
+                "UPDATE ingest_jobs SET status = ?, state = ? "
+                "WHERE job_id = ? AND status = ? AND json_extract(state, '$.updated_at') = ?",
+                (job['status'], json.dumps(job), job['job_id'], status, updated_at),
+            )
+        return cursor.rowcount == 1
+
+    def get_job(self, job_id):
+        row = self.connection.execute("SELECT state FROM ingest_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row['state']) if row else None
+
+    def list_jobs(self, statuses=None, limit=50):
+        clauses, params = [], []
+        if statuses:
+            clauses.append(f"status IN ({_placeholders(len(statuses))})")
+            params.extend(statuses)
+        rows = self.connection.execute(
+            f"SELECT state FROM ingest_jobs {_where(clauses)} ORDER BY created_at DESC LIMIT ?",
+            params + [limit],
+        )
+        return [json.loads(row['state']) for row in rows]
+
+    def log_ingest(self, entry):
+        with self._write_lock, self.connection as conn:
+            conn.execute(
+                "INSERT INTO ingest_log (fingerprint, state) VALUES (?, ?) "
+                "ON CONFLICT(fingerprint) DO UPDATE SET state = excluded.state",
+                (entry['fingerprint'], json.dumps(entry)),
+            )
+
+    def get_ingest(self, fingerprint):
+        row = self.connection.execute("SELECT state FROM ingest_log WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        return json.loads(row['state']) if row else None
+
+    def get_data_version(self):
+        row = self.connection.execute(
+            "SELECT version FROM data_versions WHERE name = 'campaigns'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump_data_version(self):
+        with self._write_lock, self.connection as conn:
+            conn.execute(
+                "INSERT INTO data_versions (name, version) VALUES ('campaigns', 1) "
+                "ON CONFLICT(name) DO UPDATE SET version = version + 1"
+            )
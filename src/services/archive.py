@@ -0,0 +1,112 @@
+import argparse
+import sys
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+from pymongo import ASCENDING, ReplaceOne
+from ..config import (
+    MONGO_COLLECTION_NAME,
+    MONGO_ARCHIVE_COLLECTION_NAME,
+    ARCHIVE_AFTER_DAYS,
+    INGEST_BATCH_SIZE,
+)
+from ..indexes import ensure_indexes
+from .rollups import apply_rollups
+from .versioning import bump_data_version
+
+# Statuses whose campaigns are moved to the archive once they have ended
+ARCHIVED_STATUSES = ('Completed',)
+
+def includes_archive(status_filter: Optional[List[str]] = None) -> bool:
+    """Whether a status filter can match archived campaigns
+
+    Unfiltered lists only read the hot collection, so the default dashboard
+    and its indexes stay small; archived campaigns are listed once an
+    archived status is selected.
+    """
+    return any(status in ARCHIVED_STATUSES for status in status_filter or ())
+
+def tier_collections(db, collection_name: str = MONGO_COLLECTION_NAME, status_filter: Optional[List[str]] = None) -> list:
+    """Return the hot collection, plus the archive when the filter reaches it"""
+    collections = [db[collection_name]]
+    if includes_archive(status_filter):
+        collections.append(db[MONGO_ARCHIVE_COLLECTION_NAME])
+    return collections
+
+def ensure_archive_indexes(db) -> Dict[str, List[str]]:
+    """Apply the campaign indexes to the archive collection"""
+    return ensure_indexes(db[MONGO_ARCHIVE_COLLECTION_NAME])
+
+def archive_cutoff(days: int = ARCHIVE_AFTER_DAYS, today: Optional[date] = None) -> str:
+    """Return the overall_end_date before which campaigns are archived"""
+    today = today or date.today()
+    return (today - timedelta(days=days)).isoformat()
+
+def archivable_query(days: int = ARCHIVE_AFTER_DAYS, today: Optional[date] = None) -> Dict[str, Any]:
+    """Select ended campaigns that are due to move to the archive"""
+    return {
+        'campaign_status': {'$in': list(ARCHIVED_STATUSES)},
+        'overall_end_date': {'$gt': '', '$lt': archive_cutoff(days, today)},
+    }
+
+def archive_campaigns(
+    db,
+    collection_name: str = MONGO_COLLECTION_NAME,
+    days: int = ARCHIVE_AFTER_DAYS,
+    batch_size: Optional[int] = None,
+    today: Optional[date] = None,
+) -> int:
+    """Move campaigns completed more than ``days`` ago to the archive collection
+
+    Each batch is upserted into the archive, keeping its _id and stamped with
+    archived_at, before it is deleted from the hot collection. An interrupted
+    run leaves at most one batch in both tiers and the next run finishes it.
+    Rollups move the batch to the archived tier; weekly facts are unchanged.
+    Returns the number of campaigns moved.
+    """
+    hot = db[collection_name]
+    archive = db[MONGO_ARCHIVE_COLLECTION_NAME]
+    query = archivable_query(days, today)
+    batch_size = batch_size or INGEST_BATCH_SIZE
+    archived_at = datetime.utcnow()
+    moved = 0
+    while True:
+        batch = list(hot.find(query).sort('_id', ASCENDING).limit(batch_size))
+        if not batch:
+            break
+        archived = [{**doc, 'archived_at': archived_at} for doc in batch]
+        archive.bulk_write(
+            [ReplaceOne({'campaign_id': doc['campaign_id']}, doc, upsert=True) for doc in archived],
+            ordered=False,
+        )
+        hot.delete_many({'_id': {'$in': [doc['_id'] for doc in batch]}})
+        apply_rollups(db, archived, batch)
+        moved += len(batch)
+    if moved:
+        bump_data_version(db, collection_name)
+    return moved
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point: python -m src.services.archive [--days N] [--dry-run]"""
+    from ..config import MONGO_DB_NAME
+    from .connection import get_client
+
+    parser = argparse.ArgumentParser(description="Move long-completed campaigns to the archive collection")
+    parser.add_argument('--days', type=int, default=ARCHIVE_AFTER_DAYS,
+                        help="archive campaigns that ended more than this many days ago")
+    parser.add_argument('--dry-run', action='store_true', help="only count the campaigns that would move")
+    args = parser.parse_args(argv)
+
+    db = get_client()[MONGO_DB_NAME]
+    if args.dry_run:
+        count = db[MONGO_COLLECTION_NAME].count_documents(archivable_query(args.days))
+        print(f"{count} campaigns ended before {archive_cutoff(args.days)} would be archived")
+        return 0
+    result = ensure_archive_indexes(db)
+    for error in result['failed']:
+        print(f"Could not create index {error}")
+    moved = archive_campaigns(db, days=args.days)
+    print(f"Archived {moved} campaigns ended before {archive_cutoff(args.days)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from pymongo import DESCENDING
+from pymongo.errors import BulkWriteError
+from ..config import (
+    MONGO_DB_NAME,
+    MONGO_COLLECTION_NAME,
+    MONGO_VERSION_COLLECTION_NAME,
+    MONGO_ROLLUP_COLLECTION_NAME,
+    MONGO_WEEKLY_COLLECTION_NAME,
+    MONGO_ARCHIVE_COLLECTION_NAME,
+    EXPORT_ROW_GROUP_ROWS,
+)
+from ..models.base_models import CampaignData, CAMPAIGN_LIST_ADAPTER
+from ..indexes import ensure_indexes
+from .connection import get_client, get_async_client
+from .executor import run_blocking
+from .pagination import build_page_query, next_page_cursor
+from .queries import build_campaign_query
+from .metrics import campaign_metrics_pipeline, metrics_from_results
+from .ingest import chunk_upserts, previous_query, summarize_reports
+from .batching import wrote_any
+from .rollups import (
+    ROLLUP_PROJECTION,
+    ensure_rollups,
+    rollup_deltas,
+    rollup_updates,
+    rollup_query,
+    metrics_from_rollups,
+)
+from .archive import includes_archive, tier_collections, ensure_archive_indexes
+from .timeseries import ensure_weekly_collection, weekly_facts, facts_query, trends_pipeline
+from .versioning import version_bump
+
+class AsyncDatabaseService:
+    """asyncio counterpart of DatabaseService backed by the shared Motor client"""
+
+    def __init__(self):
+        self.db_name = MONGO_DB_NAME
+        self.collection_name = MONGO_COLLECTION_NAME
+        self.client = None
+        self.db = None
+        self.collection = None
+
+    def connect(self):
+        """Attach to the shared, pooled async database connection"""
+        if not self.client:
+            self.client = get_async_client()
+            self.db = self.client[self.db_name]
+            self.collection = self.db[self.collection_name]
+
+    def disconnect(self):
+        """Release references to the pool; the shared client stays open"""
+        self.client = None
+        self.db = None
+        self.collection = None
+
+    async def ensure_indexes(self) -> Dict[str, List[str]]:
+        """Apply the declared campaign indexes; safe to call repeatedly"""
+        collection = get_client()[self.db_name][self.collection_name]
+        return await run_blocking(ensure_indexes, collection)
+
+    async def ensure_archive_indexes(self) -> Dict[str, List[str]]:
+        """Apply the campaign indexes to the archive collection"""
+        return await run_blocking(ensure_archive_indexes, get_client()[self.db_name])
+
+    async def ensure_rollups(self) -> bool:
+        """Backfill the rollup collection if it has never been built"""
+        return await run_blocking(ensure_rollups, get_client()[self.db_name], self.collection_name)
+
+    async def apply_rollups(self, added: List[Dict[str, Any]], removed: List[Dict[str, Any]] = ()):
+        """Increment the rollup collection for written and replaced campaigns"""
+        updates = rollup_updates(rollup_deltas(added, removed))
+        if updates:
+            await self.db[MONGO_ROLLUP_COLLECTION_NAME].bulk_write(updates, ordered=False)
+
+    async def ensure_weekly_collection(self) -> bool:
+        """Create the weekly mail-drop time-series collection if needed"""
+        return await run_blocking(ensure_weekly_collection, get_client()[self.db_name])
+
+    async def replace_weekly_facts(self, campaigns: List[Dict[str, Any]]):
+        """Replace the weekly facts of freshly written campaigns"""
+        if not campaigns:
+            return
+        collection = self.db[MONGO_WEEKLY_COLLECTION_NAME]
+        await collection.delete_many(facts_query(campaigns))
+        facts = [fact for camp in campaigns for fact in weekly_facts(camp)]
+        if facts:
+            await collection.insert_many(facts, ordered=False)
+
+    async def bump_data_version(self):
+        """Record that the campaign collection has changed"""
+        query, update = version_bump(self.collection_name)
+        await self.db[MONGO_VERSION_COLLECTION_NAME].update_one(query, update, upsert=True)
+
+    async def start_session(self):
+        """Start a client session on the shared connection pool"""
+        self.connect()
+        return await self.client.start_session()
+
+    async def insert_many(self, data: List[Dict[str, Any]]) -> List[str]:
+        """Insert multiple campaign records"""
+        self.connect()
+        result = await self.collection.insert_many(data)
+        await self.apply_rollups(data)
+        await self.replace_weekly_facts(data)
+        await self.bump_data_version()
+        return [str(id) for id in result.inserted_ids]
+
+    async def upsert_many(self, data: List[Dict[str, Any]], batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Insert or replace campaign records keyed on campaign_id in chunks"""
+        self.connect()
+        archive = self.db[MONGO_ARCHIVE_COLLECTION_NAME]
+        reports = []
+        for write in chunk_upserts(data, batch_size):
+            while write.pending:
+                archived = await archive.find(write.query, ROLLUP_PROJECTION).to_list(length=None)
+                hot = await self.collection.find(write.query, ROLLUP_PROJECTION).to_list(length=None)
+                requests = await run_blocking(write.plan, archived, hot)
+                details = {}
+                if requests:
+                    try:
+                        result = await self.collection.bulk_write(requests, ordered=False)
+                        details = result.bulk_api_result
+                    except BulkWriteError as e:
+                        details = e.details
+                written, replaced = write.record(details)
+                if written:
+                    await archive.delete_many(previous_query(written))
+                await self.apply_rollups(written, replaced)
+                await self.replace_weekly_facts(written)
+            reports.append(write.report)
+        if wrote_any(reports):
+            await self.bump_data_version()
+        summary = summarize_reports(reports)
+        summary['chunks'] = reports
+        return summary
+
+    async def get_all_campaigns(self) -> List[CampaignData]:
+        """Retrieve all campaigns"""
+        self.connect()
+        campaigns = await self.collection.find().sort('_id', DESCENDING).to_list(length=None)
+        return [CampaignData(**{k: v for k, v in camp.items() if k != '_id'})
+                for camp in campaigns]
+
+    async def get_campaigns_page(
+        self,
+        page_size: int = 20,
+        after_id: Optional[str] = None,
+        exact_count: bool = False,
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Retrieve one page of matching campaigns, newest first, with a total count
+
+        The archive collection is read too when the status filter reaches it.
+        """
+        self.connect()
+        query = build_campaign_query(status_filter, search_term)
+        docs, total = [], 0
+        for collection in tier_collections(self.db, self.collection_name, status_filter):
+            docs += await (
+                collection.find(build_page_query(query, after_id))
+                .sort('_id', DESCENDING)
+                .limit(page_size)
+                .to_list(length=page_size)
+            )
+            if not query and not exact_count:
+                total += await collection.estimated_document_count()
+            else:
+                total += await collection.count_documents(query)
+        docs = sorted(docs, key=lambda doc: doc['_id'], reverse=True)[:page_size]
+        return {
+            # _id is not a CampaignData field and is ignored by validation
+            "campaigns": CAMPAIGN_LIST_ADAPTER.validate_python(docs),
+            "next_cursor": next_page_cursor(docs, page_size),
+            "total": total,
+        }
+
+    async def iter_campaign_batches(
+        self,
+        projection: Dict[str, Any],
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+        batch_size: int = EXPORT_ROW_GROUP_ROWS,
+    ):
+        """Yield matching campaigns from a projected cursor in lists of ``batch_size``
+
+        The archive collection is read after the hot one when the status
+        filter reaches it.
+        """
+        self.connect()
+        query = build_campaign_query(status_filter, search_term)
+        for collection in tier_collections(self.db, self.collection_name, status_filter):
+            batch = []
+            async for doc in collection.find(query, projection).batch_size(batch_size):
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+    async def get_campaign_metrics(
+        self,
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Compute summary KPIs from rollups, or one aggregation when searching"""
+        self.connect()
+        archived = includes_archive(status_filter)
+        if not (search_term or '').strip():
+            query = rollup_query(status_filter, include_archived=archived)
+            groups = await self.db[MONGO_ROLLUP_COLLECTION_NAME].find(query).to_list(length=None)
+            return metrics_from_rollups(groups)
+        pipeline = campaign_metrics_pipeline(
+            build_campaign_query(status_filter, search_term),
+            union_with=[MONGO_ARCHIVE_COLLECTION_NAME] if archived else [],
+        )
+        return metrics_from_results(await self.collection.aggregate(pipeline).to_list(length=1))
+
+    async def get_weekly_trends(
+        self,
+        start: datetime,
+        end: datetime,
+        unit: str = 'week',
+        campaign_ids: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Bucketed weekly mail-drop totals for a date range"""
+        self.connect()
+        pipeline = trends_pipeline(start, end, unit, campaign_ids)
+        return await self.db[MONGO_WEEKLY_COLLECTION_NAME].aggregate(pipeline).to_list(length=None)
+
+    async def __aenter__(self):
+        self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # Connections are returned to the shared pool; the client is only
+        # closed on application shutdown via close_client().
+        pass
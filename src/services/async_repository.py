@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from ..config import EXPORT_ROW_GROUP_ROWS
+from ..models.base_models import CAMPAIGN_LIST_ADAPTER
+from .batching import summarize_reports
+from .executor import run_blocking
+
+class AsyncRepositoryService:
+    """AsyncDatabaseService counterpart for storage backends other than MongoDB
+
+    Each call runs the synchronous campaign repository on the parse pool, so
+    the API reads and writes the same store as ingest jobs and the dashboard.
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    async def upsert_many(self, data: List[Dict[str, Any]], batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Insert or replace campaign records keyed on campaign_id in chunks"""
+        reports = await run_blocking(self.repository.upsert_campaigns, data, batch_size)
+        summary = summarize_reports(reports)
+        summary['chunks'] = reports
+        return summary
+
+    def _read_page(self, page_size, after_id, status_filter, search_term):
+        summaries, next_cursor = self.repository.get_page(page_size, after_id, status_filter, search_term)
+        campaigns = self.repository.get_campaigns([summary['campaign_id'] for summary in summaries])
+        return campaigns, next_cursor
+
+    async def get_campaigns_page(
+        self,
+        page_size: int = 20,
+        after_id: Optional[str] = None,
+        exact_count: bool = False,
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Retrieve one page of matching campaigns, newest first, with a total count"""
+        campaigns, next_cursor = await run_blocking(self._read_page, page_size, after_id, status_filter, search_term)
+        total = await run_blocking(self.repository.count, status_filter, search_term, exact=exact_count)
+        return {
+            "campaigns": CAMPAIGN_LIST_ADAPTER.validate_python(campaigns),
+            "next_cursor": next_cursor,
+            "total": total,
+        }
+
+    async def iter_campaign_batches(
+        self,
+        projection: Dict[str, Any],
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+        batch_size: int = EXPORT_ROW_GROUP_ROWS,
+    ):
+        """Yield matching campaigns in lists of ``batch_size``, one keyset page at a time
+
+        Full documents are yielded; ``projection`` is only accepted for parity
+        with AsyncDatabaseService.
+        """
+        after_id = None
+        while True:
+            campaigns, after_id = await run_blocking(self._read_page, batch_size, after_id, status_filter, search_term)
+            if campaigns:
+                yield campaigns
+            if after_id is None:
+                return
+
+    async def get_campaign_metrics(
+        self,
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Compute summary KPIs for the matching campaigns"""
+        return await run_blocking(self.repository.get_metrics, status_filter, search_term)
+
+    async def get_weekly_trends(
+        self,
+        start: datetime,
+        end: datetime,
+        unit: str = 'week',
+        campaign_ids: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Bucketed weekly mail-drop totals for a date range"""
+        return await run_blocking(self.repository.get_weekly_trends, start, end, unit, campaign_ids)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
@@ -0,0 +1,28 @@
+from typing import Any, Dict, List, Tuple
+
+def chunked(items: List[Any], size: int):
+    """Yield successive slices of at most ``size`` items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def latest_per_campaign(documents: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any]]]:
+    """Keep the last document for each campaign_id, paired with its input position"""
+    latest = {}
+    for position, doc in enumerate(documents):
+        latest[doc['campaign_id']] = (position, doc)
+    return sorted(latest.values(), key=lambda entry: entry[0])
+
+def summarize_reports(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Total the per-chunk counts of an upsert run"""
+    return {
+        'inserted_count': sum(report['inserted'] for report in reports),
+        'updated_count': sum(report['updated'] for report in reports),
+        'failed_count': sum(report['failed'] for report in reports),
+        'unchanged_count': sum(report.get('unchanged', 0) for report in reports),
+        'upserted_ids': [id for report in reports for id in report['upserted_ids']],
+        'errors': [error for report in reports for error in report['errors']],
+    }
+
+def wrote_any(reports: List[Dict[str, Any]]) -> bool:
+    """Whether an upsert run inserted or updated at least one campaign"""
+    return any(report['inserted'] or report['updated'] for report in reports)
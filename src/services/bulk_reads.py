@@ -0,0 +1,77 @@
+from typing import Any, Dict, List, Optional
+import pandas as pd
+from bson.raw_bson import RawBSONDocument
+from pymongo import DESCENDING
+from ..config import BULK_READ_MODE
+
+def column_name(path: str) -> str:
+    """Name a frame column after the last segment of its document path"""
+    return path.rsplit('.', 1)[-1]
+
+def raw_collection(collection):
+    """Return a view of the collection that yields undecoded RawBSONDocuments"""
+    codec_options = collection.codec_options.with_options(document_class=RawBSONDocument)
+    return collection.with_options(codec_options=codec_options)
+
+def _raw_get(doc, path: str):
+    """Read a dotted path, decoding only the nested documents on the way"""
+    for part in path.split('.'):
+        if doc is None:
+            return None
+        doc = doc.get(part)
+    return doc
+
+def read_frame_raw(
+    collection,
+    columns: List[str],
+    query: Optional[Dict[str, Any]] = None,
+    limit: int = 0,
+) -> pd.DataFrame:
+    """Project matching campaigns into columns straight from raw BSON"""
+    projection = {'_id': 0, **{path: 1 for path in columns}}
+    cursor = (
+        raw_collection(collection)
+        .find(query or {}, projection)
+        .sort('_id', DESCENDING)
+        .limit(limit)
+    )
+    data = {column_name(path): [] for path in columns}
+    for doc in cursor:
+        for path in columns:
+            data[column_name(path)].append(_raw_get(doc, path))
+    return pd.DataFrame(data)
+
+def read_frame_arrow(
+    collection,
+    columns: List[str],
+    query: Optional[Dict[str, Any]] = None,
+    limit: int = 0,
+) -> pd.DataFrame:
+    """Decode matching campaigns column-wise with pymongoarrow"""
+    from pymongoarrow.api import aggregate_pandas_all
+
+    pipeline = [{'$match': query or {}}, {'$sort': {'_id': DESCENDING}}]
+    if limit:
+        pipeline.append({'$limit': limit})
+    pipeline.append({'$project': {'_id': 0, **{column_name(path): f'${path}' for path in columns}}})
+    return aggregate_pandas_all(collection, pipeline)[[column_name(path) for path in columns]]
+
+def read_frame(
+    collection,
+    columns: List[str],
+    query: Optional[Dict[str, Any]] = None,
+    limit: int = 0,
+    mode: Optional[str] = None,
+) -> pd.DataFrame:
+    """Read matching campaigns newest first as a DataFrame of the given fields
+
+    Columns are dotted document paths; nested documents are never hydrated
+    into Python dicts or models. Uses pymongoarrow when BULK_READ_MODE is
+    'arrow' and it is installed, otherwise lazily decoded raw BSON.
+    """
+    if (mode or BULK_READ_MODE) == 'arrow':
+        try:
+            return read_frame_arrow(collection, columns, query, limit)
+        except ImportError:
+            pass
+    return read_frame_raw(collection, columns, query, limit)
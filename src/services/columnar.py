@@ -0,0 +1,253 @@
+import csv
+import io
+import os
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv as pa_csv
+from pydantic import ValidationError
+from ..config import CSV_CHUNK_ROWS, CSV_BLOCK_BYTES
+from ..models.base_models import CAMPAIGN_ADAPTER, CAMPAIGN_LIST_ADAPTER
+from ..models.upload_schema import (
+    CAMPAIGN_COLUMNS,
+    COST_COLUMNS,
+    BREAKDOWN_COLUMNS,
+    CELL_COLUMNS,
+    DROP_COLUMNS,
+    PERFORMANCE_COLUMNS,
+    WEEK_CELL_COLUMNS,
+    UPLOAD_COLUMNS,
+    normalize_column_name,
+)
+from .documents import build_serial, build_tasks, campaign_chunks, check_columns, last_campaign_rows
+
+# Arrow types of document fields; dates are stored as ISO strings
+ARROW_TYPES = {'str': pa.string(), 'int': pa.int64(), 'float': pa.float64(), 'date': pa.string()}
+
+# Arrow types CSV numbers and dates are cast to once a whole block of a column
+# parses. Integers are cast to doubles so that "5.0" in count columns still
+# loads; the document builder casts them back.
+CSV_TYPES = {'int': pa.float64(), 'float': pa.float64(), 'date': pa.timestamp('s')}
+
+def _fields(columns: Dict[str, str]) -> List[pa.Field]:
+    return [pa.field(name, ARROW_TYPES[kind]) for name, kind in columns.items()]
+
+# Arrow schema of a campaign document: one nested row per campaign
+CAMPAIGN_SCHEMA = pa.schema(_fields(CAMPAIGN_COLUMNS) + [
+    pa.field('cost_details', pa.struct(
+        _fields(COST_COLUMNS) + [pa.field('cost_breakdown', pa.struct(_fields(BREAKDOWN_COLUMNS)))]
+    )),
+    pa.field('strategy_cells', pa.list_(pa.struct(_fields(CELL_COLUMNS)))),
+    pa.field('weekly_mail_drops', pa.list_(pa.struct(
+        _fields(DROP_COLUMNS) + [pa.field('cells_mailed_this_week', pa.list_(pa.struct(_fields(WEEK_CELL_COLUMNS))))]
+    ))),
+    pa.field('performance_summary', pa.struct(_fields(PERFORMANCE_COLUMNS))),
+])
+
+EXPORT_PROJECTION = {'_id': 0, **{name: 1 for name in CAMPAIGN_SCHEMA.names}}
+
+# Extensions of Arrow IPC uploads, in the file or stream format
+ARROW_EXTENSIONS = ('.arrow', '.arrows', '.feather')
+
+def _selected(names: List[str], columns: Optional[List[str]]) -> List[str]:
+    return [name for name in names if columns is None or normalize_column_name(name) in columns]
+
+def record_batches(
+    source,
+    fmt: str = 'parquet',
+    batch_rows: int = CSV_CHUNK_ROWS,
+    columns: Optional[List[str]] = None,
+) -> Iterator[pa.RecordBatch]:
+    """Read a Parquet or Arrow IPC file as record batches
+
+    Parquet is read ``batch_rows`` rows at a time. Arrow files are memory-mapped
+    and read batch by batch as written, in either the file or stream format.
+    ``columns`` limits the batches to the columns with those normalized names.
+    """
+    if fmt == 'parquet':
+        with pq.ParquetFile(source) as parquet:
+            names = _selected(parquet.schema_arrow.names, columns)
+            yield from parquet.iter_batches(batch_size=batch_rows, columns=names)
+        return
+    with pa.memory_map(source) as mapped:
+        try:
+            reader = pa.ipc.open_file(mapped)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            mapped.seek(0)
+            batches = pa.ipc.open_stream(mapped)
+        for batch in batches:
+            yield batch if columns is None else batch.select(_selected(batch.schema.names, columns))
+
+def read_csv_header(source) -> List[str]:
+    """Return the column names of a CSV path or binary file without moving its position"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline='', encoding='utf-8-sig') as f:
+            return next(csv.reader(f), [])
+    position = source.tell()
+    line = source.readline()
+    source.seek(position)
+    return next(csv.reader([line.decode('utf-8-sig')]), [])
+
+def csv_convert_options(header: List[str], columns: Optional[List[str]] = None) -> pa_csv.ConvertOptions:
+    """Parse only the upload columns, or only ``columns``, all as strings
+
+    Other columns are not converted at all; blank cells are nulls. Numbers
+    and dates are cast afterwards by typed_batch() and the document builder,
+    so a bad cell is an error on its row rather than failing the whole file.
+    """
+    kinds = columns or {**UPLOAD_COLUMNS, **WEEK_CELL_COLUMNS}
+    column_types = {name: pa.string() for name in header if normalize_column_name(name) in kinds}
+    return pa_csv.ConvertOptions(
+        column_types=column_types,
+        include_columns=list(column_types),
+        strings_can_be_null=True,
+    )
+
+def csv_batches(
+    source,
+    block_size: int = CSV_BLOCK_BYTES,
+    columns: Optional[List[str]] = None,
+) -> Iterator[pa.RecordBatch]:
+    """Stream the upload columns, or only ``columns``, of a CSV path or binary file as record batches"""
+    convert_options = csv_convert_options(read_csv_header(source), columns)
+    with pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        convert_options=convert_options,
+    ) as reader:
+        yield from reader
+
+def typed_batch(batch: pa.RecordBatch) -> pa.RecordBatch:
+    """Cast a block's number and date columns in Arrow where every cell parses
+
+    A column with any cell that does not parse, such as a US-style date or a
+    typo in a number, is left as text for the document builder to cast and
+    report row by row.
+    """
+    kinds = {**UPLOAD_COLUMNS, **WEEK_CELL_COLUMNS}
+    columns = []
+    for name, column in zip(batch.schema.names, batch.columns):
+        target = CSV_TYPES.get(kinds.get(normalize_column_name(name)))
+        if target is not None:
+            try:
+                column = column.cast(target)
+            except pa.ArrowInvalid:
+                pass
+        columns.append(column)
+    return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+def csv_tasks(source, block_size: int = CSV_BLOCK_BYTES) -> Iterator[tuple]:
+    """Read a flat CSV a block at a time as build tasks
+
+    The campaign_id column is read in a first pass; see campaign_chunks().
+    """
+    check_columns(pd.DataFrame(columns=[normalize_column_name(name) for name in read_csv_header(source)]))
+    start = None if isinstance(source, (str, os.PathLike)) else source.tell()
+    last_rows = last_campaign_rows(batch_frames(csv_batches(source, block_size, ['campaign_id'])))
+    if start is not None:
+        source.seek(start)
+    batches = (typed_batch(batch) for batch in csv_batches(source, block_size) if batch.num_rows)
+    return build_tasks(campaign_chunks(batch_frames(batches), last_rows))
+
+def read_csv_documents(source, block_size: int = CSV_BLOCK_BYTES) -> Iterator[tuple]:
+    """Stream a flat CSV as campaign documents a block at a time
+
+    Yields the number of rows read followed by campaign_documents() output for
+    each block.
+    """
+    return build_serial(csv_tasks(source, block_size))
+
+def batch_frames(batches: Iterable[pa.RecordBatch]) -> Iterator[pd.DataFrame]:
+    """Convert record batches to frames numbered by their row in the file"""
+    offset = 0
+    for batch in batches:
+        df = batch.to_pandas()
+        df.index = pd.RangeIndex(offset, offset + len(df))
+        offset += len(df)
+        yield df
+
+def nested_documents(batch: pa.RecordBatch, offset: int) -> tuple:
+    """Validate a batch of whole campaign documents, as written by ParquetExport"""
+    campaigns, positions, errors = [], [], []
+    for position, record in enumerate(batch.to_pylist(), offset):
+        try:
+            campaigns.append(CAMPAIGN_ADAPTER.validate_python(record))
+            positions.append(position)
+        except ValidationError as e:
+            errors.append({'index': position, 'message': str(e)})
+    return CAMPAIGN_LIST_ADAPTER.dump_python(campaigns), positions, errors
+
+def arrow_tasks(source, fmt: str = 'parquet', chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[tuple]:
+    """Read a Parquet or Arrow IPC upload as build tasks
+
+    Flat files go to the document builder after a first pass over their
+    campaign_id column (see campaign_chunks()); files with one nested
+    campaign per row, such as exports, are validated against CampaignData
+    instead.
+    """
+    batches = (batch for batch in record_batches(source, fmt, chunk_rows) if batch.num_rows)
+    first = next(batches, None)
+    if first is None:
+        return
+    batches = chain([first], batches)
+    if 'cost_details' not in first.schema.names:
+        check_columns(pd.DataFrame(columns=[normalize_column_name(name) for name in first.schema.names]))
+        last_rows = last_campaign_rows(batch_frames(record_batches(source, fmt, chunk_rows, ['campaign_id'])))
+        yield from build_tasks(campaign_chunks(batch_frames(batches), last_rows))
+        return
+    offset = 0
+    for batch in batches:
+        yield batch.num_rows, nested_documents, (batch, offset)
+        offset += batch.num_rows
+
+def read_arrow_documents(source, fmt: str = 'parquet', chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[tuple]:
+    """Stream a Parquet or Arrow IPC upload as campaign documents
+
+    Yields the same tuples as read_csv_documents. Columns arrive typed, so
+    flat uploads skip text parsing and go straight to the document builder.
+    """
+    return build_serial(arrow_tasks(source, fmt, chunk_rows))
+
+class _BufferSink(io.RawIOBase):
+    """Write-only file collecting output until it is taken; tell() keeps counting"""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(self.chunks[-1])
+        return len(self.chunks[-1])
+
+    def tell(self) -> int:
+        return self.position
+
+    def take(self) -> bytes:
+        data, self.chunks = b''.join(self.chunks), []
+        return data
+
+class ParquetExport:
+    """Parquet file written one row group at a time for streaming responses"""
+
+    def __init__(self, schema: pa.Schema = CAMPAIGN_SCHEMA):
+        self.schema = schema
+        self._sink = _BufferSink()
+        self._writer = pq.ParquetWriter(self._sink, schema)
+
+    def write(self, documents: List[Dict[str, Any]]) -> bytes:
+        """Write campaigns as one row group and return the bytes it added"""
+        self._writer.write_batch(pa.RecordBatch.from_pylist(documents, schema=self.schema))
+        return self._sink.take()
+
+    def close(self) -> bytes:
+        """Write the footer and return the remaining bytes"""
+        self._writer.close()
+        return self._sink.take()
@@ -0,0 +1,66 @@
+import atexit
+import threading
+from typing import Optional
+from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
+from ..config import (
+    MONGO_URI,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_MAX_IDLE_TIME_MS,
+    MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_COMPRESSORS,
+)
+
+_client: Optional[MongoClient] = None
+_async_client: Optional[AsyncIOMotorClient] = None
+_client_lock = threading.Lock()
+
+def _client_options() -> dict:
+    """Connection and pool options shared by the sync and async clients"""
+    options = dict(
+        tlsAllowInvalidCertificates=True,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    )
+    if MONGO_COMPRESSORS:
+        options['compressors'] = MONGO_COMPRESSORS
+    return options
+
+def get_client() -> MongoClient:
+    """Return the process-wide MongoClient, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MongoClient(MONGO_URI, **_client_options())
+    return _client
+
+def get_async_client() -> AsyncIOMotorClient:
+    """Return the process-wide Motor client, creating it on first use
+
+    Must be called from the event loop the client will be used on.
+    """
+    global _async_client
+    if _async_client is None:
+        with _client_lock:
+            if _async_client is None:
+                _async_client = AsyncIOMotorClient(MONGO_URI, **_client_options())
+    return _async_client
+
+def close_client():
+    """Close the shared clients and release their connection pools"""
+    global _client, _async_client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+        if _async_client is not None:
+            _async_client.close()
+            _async_client = None
+
+atexit.register(close_client)
@@ -1,42 +1,86 @@
-from pymongo import MongoClient
-from typing import List, Dict, Any
-import os
-from dotenv import load_dotenv
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+import pandas as pd
+from ..config import MONGO_DB_NAME, MONGO_COLLECTION_NAME, MONGO_ARCHIVE_COLLECTION_NAME
 from ..models.base_models import CampaignData
-
-# Load environment variables
-load_dotenv()
+from ..indexes import ensure_indexes
+from .connection import get_client
+from .pagination import fetch_merged_page, count_merged_documents
+from .queries import build_campaign_query
+from .metrics import get_campaign_metrics
+from .ingest import upsert_campaigns, summarize_reports
+from .batching import wrote_any
+from .versioning import bump_data_version
+from .rollups import apply_rollups, ensure_rollups, get_rollup_metrics
+from .bulk_reads import read_frame
+from .archive import includes_archive, tier_collections, ensure_archive_indexes
+from .timeseries import ensure_weekly_collection, replace_weekly_facts, get_weekly_trends
 
 class DatabaseService:
     def __init__(self):
-        self.mongo_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
-        self.db_name = os.getenv('MONGO_DB_NAME', 'marketing_db')
-        self.collection_name = os.getenv('MONGO_COLLECTION_NAME', 'campaign_data')
+        self.db_name = MONGO_DB_NAME
+        self.collection_name = MONGO_COLLECTION_NAME
         self.client = None
         self.db = None
         self.collection = None
 
     def connect(self):
-        """Establish database connection"""
+        """Attach to the shared, pooled database connection"""
         if not self.client:
-            self.client = MongoClient(self.mongo_uri, tlsAllowInvalidCertificates=True)
+            self.client = get_client()
             self.db = self.client[self.db_name]
             self.collection = self.db[self.collection_name]
 
     def disconnect(self):
-        """Close database connection"""
-        if self.client:
-            self.client.close()
-            self.client = None
-            self.db = None
-            self.collection = None
+        """Release references to the pool; the shared client stays open"""
+        self.client = None
+        self.db = None
+        self.collection = None
+
+    def ensure_indexes(self) -> Dict[str, List[str]]:
+        """Apply the declared campaign indexes; safe to call repeatedly"""
+        self.connect()
+        return ensure_indexes(self.collection)
+
+    def ensure_archive_indexes(self) -> Dict[str, List[str]]:
+        """Apply the campaign indexes to the archive collection"""
+        self.connect()
+        return ensure_archive_indexes(self.db)
+
+    def ensure_rollups(self) -> bool:
+        """Backfill the rollup collection if it has never been built"""
+        self.connect()
+        return ensure_rollups(self.db, self.collection_name)
+
+    def ensure_weekly_collection(self) -> bool:
+        """Create the weekly mail-drop time-series collection if needed"""
+        self.connect()
+        return ensure_weekly_collection(self.db)
+
+    def start_session(self):
+        """Start a client session on the shared connection pool"""
+        self.connect()
+        return self.client.start_session()
 
     def insert_many(self, data: List[Dict[str, Any]]) -> List[str]:
         """Insert multiple campaign records"""
         self.connect()
         result = self.collection.insert_many(data)
+        apply_rollups(self.db, data)
+        replace_weekly_facts(self.db, data)
+        bump_data_version(self.db, self.collection_name)
         return [str(id) for id in result.inserted_ids]
 
+    def upsert_many(self, data: List[Dict[str, Any]], batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Insert or replace campaign records keyed on campaign_id in chunks"""
+        self.connect()
+        reports = upsert_campaigns(self.collection, data, batch_size)
+        if wrote_any(reports):
+            bump_data_version(self.db, self.collection_name)
+        summary = summarize_reports(reports)
+        summary['chunks'] = reports
+        return summary
+
     def get_all_campaigns(self) -> List[CampaignData]:
         """Retrieve all campaigns"""
         self.connect()
@@ -44,9 +88,76 @@ class DatabaseService:
         return [CampaignData(**{k: v for k, v in camp.items() if k != '_id'}) 
                 for camp in campaigns]
 
+    def get_campaigns_frame(
+        self,
+        columns: List[str],
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Read matching campaigns as a DataFrame without hydrating models"""
+        self.connect()
+        query = build_campaign_query(status_filter, search_term)
+        return pd.concat(
+            [read_frame(collection, columns, query)
+             for collection in tier_collections(self.db, self.collection_name, status_filter)],
+            ignore_index=True,
+        )
+
+    def get_campaigns_page(
+        self,
+        page_size: int = 20,
+        after_id: Optional[str] = None,
+        exact_count: bool = False,
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Retrieve one page of matching campaigns, newest first, with a total count
+
+        The archive collection is read too when the status filter reaches it.
+        """
+        self.connect()
+        query = build_campaign_query(status_filter, search_term)
+        collections = tier_collections(self.db, self.collection_name, status_filter)
+        docs, next_cursor = fetch_merged_page(collections, page_size, after_id, query)
+        return {
+            "campaigns": [CampaignData(**{k: v for k, v in camp.items() if k != '_id'})
+                          for camp in docs],
+            "next_cursor": next_cursor,
+            "total": count_merged_documents(collections, query, exact=exact_count),
+        }
+
+    def get_campaign_metrics(
+        self,
+        status_filter: Optional[List[str]] = None,
+        search_term: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Compute summary KPIs from rollups, or one aggregation when searching"""
+        self.connect()
+        archived = includes_archive(status_filter)
+        if not (search_term or '').strip():
+            return get_rollup_metrics(self.db, status_filter, include_archived=archived)
+        return get_campaign_metrics(
+            self.collection,
+            build_campaign_query(status_filter, search_term),
+            union_with=[MONGO_ARCHIVE_COLLECTION_NAME] if archived else [],
+        )
+
+    def get_weekly_trends(
+        self,
+        start: datetime,
+        end: datetime,
+        unit: str = 'week',
+        campaign_ids: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Bucketed weekly mail-drop totals for a date range"""
+        self.connect()
+        return get_weekly_trends(self.db, start, end, unit, campaign_ids)
+
     def __enter__(self):
         self.connect()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.disconnect() 
\ No newline at end of file
+        # Connections are returned to the shared pool; the client is only
+        # closed on application shutdown via close_client().
+        pass
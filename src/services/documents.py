@@ -0,0 +1,243 @@
+from collections import defaultdict, deque
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+import pandas as pd
+from ..config import BUILD_MAX_WORKERS
+from ..models.upload_schema import (
+    CAMPAIGN_COLUMNS,
+    COST_COLUMNS,
+    BREAKDOWN_COLUMNS,
+    CELL_COLUMNS,
+    DROP_COLUMNS,
+    PERFORMANCE_COLUMNS,
+    WEEK_CELL_COLUMNS,
+    OPTIONAL_COLUMNS,
+    UPLOAD_COLUMNS,
+    normalize_column_name,
+)
+from .executor import get_build_pool
+
+# Accepted spellings of upload dates, tried in order
+DATE_FORMATS = ('ISO8601', '%m/%d/%Y')
+
+def parse_number(value) -> float:
+    """Parse one cell exactly as float() does, or NaN when it is not a number"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+def coerce_column(series: pd.Series, kind: str) -> Tuple[pd.Series, pd.Series]:
+    """Cast a whole column to ``kind``; returns the values and a mask of bad rows
+
+    Typed columns are passed through and text is parsed cell by cell, since
+    pandas' fast float parser can differ from the typed path in the last
+    digit. Dates in any of DATE_FORMATS are stored as 'YYYY-MM-DD' strings.
+    """
+    missing = series.isna()
+    if kind == 'str':
+        return series.astype(str).where(~missing, None), missing
+    if kind == 'date':
+        dates = series
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(series, format=DATE_FORMATS[0], errors='coerce')
+            for date_format in DATE_FORMATS[1:]:
+                retry = dates.isna() & ~missing
+                if retry.any():
+                    dates[retry] = pd.to_datetime(series[retry], format=date_format, errors='coerce')
+        invalid = dates.isna()
+        days = dates.to_numpy(dtype='datetime64[D]').astype(str)
+        return pd.Series(days, index=series.index).where(~invalid, None), invalid
+    if series.dtype == object:
+        numbers = series.map(parse_number, na_action='ignore').astype('float64')
+    else:
+        numbers = pd.to_numeric(series, errors='coerce')
+    invalid = numbers.isna()
+    if kind == 'int':
+        # Counts with a fractional part are rejected rather than truncated
+        invalid |= numbers % 1 != 0
+        numbers = numbers.where(~invalid, 0).astype('int64')
+    return numbers, invalid
+
+def has_week_cells(df: pd.DataFrame) -> bool:
+    """Whether an upload carries per-week cell rows"""
+    return all(name in df.columns for name in WEEK_CELL_COLUMNS)
+
+def check_columns(df: pd.DataFrame):
+    """Raise ValueError naming any required upload column the frame lacks"""
+    absent = [name for name in UPLOAD_COLUMNS if name not in df.columns and name not in OPTIONAL_COLUMNS]
+    if absent:
+        raise ValueError(f"Missing columns: {', '.join(absent)}")
+
+def coerce_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Cast every upload column once; returns the values and a frame of bad-cell masks"""
+    check_columns(df)
+    columns = {**UPLOAD_COLUMNS, **(WEEK_CELL_COLUMNS if has_week_cells(df) else {})}
+    values, invalid = {}, {}
+    for name, kind in columns.items():
+        if name not in df.columns:
+            values[name] = pd.Series(None, index=df.index, dtype=object)
+            continue
+        values[name], bad = coerce_column(df[name], kind)
+        if name not in OPTIONAL_COLUMNS:
+            invalid[name] = bad
+    return pd.DataFrame(values, index=df.index), pd.DataFrame(invalid, index=df.index)
+
+def _records(frame: pd.DataFrame, columns: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Zip whole columns into per-row dicts; tolist() yields native Python values"""
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*(frame[name].tolist() for name in names))]
+
+def _grouped(frame: pd.DataFrame, keys: List[str], columns: Dict[str, str]) -> Dict[tuple, List[Dict[str, Any]]]:
+    """Collect one record per distinct ``keys`` combination, grouped on all but the last key
+
+    Groups are keyed by tuples and keep their records in file order.
+    """
+    distinct = frame.drop_duplicates(keys)
+    groups = defaultdict(list)
+    parents = zip(*(distinct[key].tolist() for key in keys[:-1]))
+    for parent, record in zip(parents, _records(distinct, columns)):
+        groups[parent].append(record)
+    return groups
+
+def campaign_documents(df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], List[int], List[Dict[str, Any]]]:
+    """Build one campaign document per campaign_id from a flat upload frame
+
+    Columns are cast as whole arrays. Rows are grouped on campaign_id: the
+    campaign, cost and performance fields come from its first row, and every
+    distinct cell_no and mail_drop_id becomes one strategy cell and one weekly
+    drop. Per-week cell rows fill cells_mailed_this_week when the upload has
+    those columns. A campaign with any row missing or failing to parse a
+    required value is not built at all, since writing it from its other rows
+    would drop cells and drops from the stored version; every one of its
+    rows is reported.
+
+    Rows are numbered by the frame's index. Returns the documents, the first
+    row number of each campaign and the errors.
+    """
+    frame, invalid = coerce_frame(df)
+    bad = invalid.any(axis=1)
+    rejected = bad | frame['campaign_id'].isin(frame.loc[bad, 'campaign_id'].dropna())
+    messages = {
+        row: f"Invalid or missing {', '.join(invalid.columns[flags])}"
+        for row, flags in zip(invalid.index[bad].tolist(), invalid[bad].to_numpy())
+    }
+    bad_rows = defaultdict(list)
+    for row, campaign_id in zip(frame.index[bad].tolist(), frame.loc[bad, 'campaign_id'].tolist()):
+        bad_rows[campaign_id].append(str(row))
+    errors = [
+        {'index': row, 'message': messages.get(row) or
+            f"Campaign {campaign_id} not written: invalid row {', '.join(bad_rows[campaign_id])}"}
+        for row, campaign_id in zip(frame.index[rejected].tolist(), frame.loc[rejected, 'campaign_id'].tolist())
+    ]
+    frame = frame[~rejected]
+
+    campaigns = frame.drop_duplicates('campaign_id')
+    cells = _grouped(frame, ['campaign_id', 'cell_no'], CELL_COLUMNS)
+    drops = _grouped(frame, ['campaign_id', 'mail_drop_id'], DROP_COLUMNS)
+    week_cells = (
+        _grouped(frame, ['campaign_id', 'mail_drop_id', 'cell_no'], WEEK_CELL_COLUMNS)
+        if has_week_cells(frame) else {}
+    )
+
+    documents = [
+        {
+            **campaign,
+            'cost_details': {**cost, 'cost_breakdown': breakdown},
+            'strategy_cells': cells[(campaign['campaign_id'],)],
+            'weekly_mail_drops': [
+                {**drop, 'cells_mailed_this_week': week_cells.get((campaign['campaign_id'], drop['mail_drop_id']), [])}
+                for drop in drops[(campaign['campaign_id'],)]
+            ],
+            'performance_summary': performance,
+        }
+        for campaign, cost, breakdown, performance in zip(
+            _records(campaigns, CAMPAIGN_COLUMNS),
+            _records(campaigns, COST_COLUMNS),
+            _records(campaigns, BREAKDOWN_COLUMNS),
+            _records(campaigns, PERFORMANCE_COLUMNS),
+        )
+    ]
+    return documents, campaigns.index.tolist(), errors
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Lower-case column names and replace spaces with underscores"""
+    df.columns = [normalize_column_name(name) for name in df.columns]
+    return df
+
+def last_campaign_rows(frames: Iterable[pd.DataFrame]) -> Dict[Any, int]:
+    """Map each campaign_id of a flat upload to the number of its last row
+
+    ``frames`` need only hold the campaign_id column, numbered like the frames
+    later passed to campaign_chunks(); frames without it are skipped.
+    """
+    last = {}
+    for df in frames:
+        df = normalize_columns(df)
+        if 'campaign_id' in df:
+            ids = df['campaign_id'].dropna()
+            last.update(zip(ids.tolist(), ids.index.tolist()))
+    return last
+
+def campaign_chunks(frames: Iterable[pd.DataFrame], last_rows: Dict[Any, int]) -> Iterator[Tuple[int, pd.DataFrame]]:
+    """Regroup the chunks of a flat upload so that each campaign is built from all its rows
+
+    Yields the number of rows read with the frame to build for each chunk.
+    ``last_rows`` comes from last_campaign_rows(); a campaign's rows are held
+    back until its last row has been read, so campaigns whose rows are spread
+    through the upload, such as a file sorted by week, are still built whole.
+    Held rows stay in memory, so an upload interleaving every campaign is
+    built in one piece at the end.
+    """
+    held = None
+    for df in frames:
+        rows = len(df)
+        df = normalize_columns(df)
+        check_columns(df)
+        read_to = df.index[-1] if rows else -1
+        if held is not None and len(held):
+            df = pd.concat([held, df])
+        # Plain dict lookups; Series.map would copy last_rows into a Series per chunk
+        pending = pd.Series(
+            [last_rows.get(campaign_id, -1) > read_to for campaign_id in df['campaign_id'].tolist()],
+            index=df.index, dtype=bool,
+        )
+        held = df[pending]
+        yield rows, df[~pending]
+    if held is not None and len(held):
+        yield 0, held
+
+def build_tasks(chunks: Iterable[Tuple[int, pd.DataFrame]]) -> Iterator[tuple]:
+    """Pair each regrouped chunk with the builder that turns it into documents"""
+    for rows, df in chunks:
+        yield rows, campaign_documents, (df,)
+
+def build_serial(tasks: Iterable[tuple]) -> Iterator[tuple]:
+    """Run build tasks in this thread, yielding the rows read and builder output"""
+    for rows, build, args in tasks:
+        yield (rows,) + build(*args)
+
+def build_parallel(tasks: Iterable[tuple], workers: int = BUILD_MAX_WORKERS, pool=None) -> Iterator[tuple]:
+    """Run build tasks on the build process pool, yielding results in task order
+
+    At most two tasks per worker are in flight, so reading stays just ahead of
+    the workers and memory stays bounded however large the upload. With a
+    single worker the tasks run in this thread. ``pool`` defaults to the
+    shared build pool.
+    """
+    if workers <= 1:
+        yield from build_serial(tasks)
+        return
+    pool = pool or get_build_pool()
+    pending = deque()
+    try:
+        for rows, build, args in tasks:
+            pending.append((rows, pool.submit(build, *args)))
+            if len(pending) >= 2 * workers:
+                rows, future = pending.popleft()
+                yield (rows,) + future.result()
+        while pending:
+            rows, future = pending.popleft()
+            yield (rows,) + future.result()
+    finally:
+        for _, future in pending:
+            future.cancel()
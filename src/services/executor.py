@@ -0,0 +1,35 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from ..config import PARSE_MAX_WORKERS, BUILD_MAX_WORKERS
+
+# Bounded pool for CPU-bound parsing and validation, so API handlers never
+# run them on the event loop and cannot oversubscribe the process.
+_executor = ThreadPoolExecutor(max_workers=PARSE_MAX_WORKERS, thread_name_prefix='parse')
+
+# Process pool building upload chunks on every core; started on first use.
+# Workers are spawned rather than forked so they never inherit the locks of
+# the database clients' background threads.
+_build_pool = None
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking callable on the bounded parse pool and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
+def get_build_pool() -> ProcessPoolExecutor:
+    """Return the shared build process pool, starting it if needed"""
+    global _build_pool
+    if _build_pool is None:
+        _build_pool = ProcessPoolExecutor(
+            max_workers=BUILD_MAX_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+    return _build_pool
+
+def shutdown_executor():
+    """Stop accepting work and wait for running parse and build jobs to finish"""
+    _executor.shutdown(wait=True)
+    if _build_pool is not None:
+        _build_pool.shutdown(wait=True, cancel_futures=True)
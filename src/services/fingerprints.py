@@ -0,0 +1,40 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Tuple
+
+# Storage metadata left out of a campaign's content hash
+HASH_EXCLUDED_FIELDS = ('_id', 'content_hash', 'archived_at')
+
+FINGERPRINT_BLOCK_SIZE = 1 << 20
+
+def content_hash(doc: Dict[str, Any]) -> str:
+    """Hash a campaign's content; equal documents hash alike whatever their key order"""
+    content = {key: value for key, value in doc.items() if key not in HASH_EXCLUDED_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+def changed_entries(
+    entries: List[Tuple[int, Dict[str, Any]]],
+    stored_hashes: Dict[str, str],
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], int]:
+    """Stamp (position, document) entries with content_hash and drop unchanged campaigns
+
+    ``stored_hashes`` maps campaign_id to the hash of the stored version.
+    Returns the entries to write and the number left out.
+    """
+    changed = []
+    for position, doc in entries:
+        doc = {**doc, 'content_hash': content_hash(doc)}
+        if stored_hashes.get(doc['campaign_id']) != doc['content_hash']:
+            changed.append((position, doc))
+    return changed, len(entries) - len(changed)
+
+def copy_with_fingerprint(source, target) -> str:
+    """Copy one binary file object to another, returning the SHA-256 of the bytes copied"""
+    digest = hashlib.sha256()
+    while True:
+        block = source.read(FINGERPRINT_BLOCK_SIZE)
+        if not block:
+            return digest.hexdigest()
+        digest.update(block)
+        target.write(block)
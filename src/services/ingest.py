@@ -0,0 +1,188 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
+from ..config import INGEST_BATCH_SIZE, INGEST_WRITE_ATTEMPTS, MONGO_ARCHIVE_COLLECTION_NAME
+from .batching import chunked, latest_per_campaign, summarize_reports
+from .fingerprints import changed_entries
+from .rollups import ROLLUP_PROJECTION, apply_rollups
+from .timeseries import replace_weekly_facts
+
+# Server error code of a unique index violation
+DUPLICATE_KEY = 11000
+
+def build_upsert_requests(documents: List[Dict[str, Any]], hot_hashes: Dict[str, Optional[str]]) -> List[ReplaceOne]:
+    """Build one upsert per campaign, conditional on the stored version being unchanged
+
+    Each request only replaces the campaign if its content_hash is still the
+    one in ``hot_hashes`` (None when the campaign was not stored or predates
+    hashing). Otherwise the upsert tries to insert a second document with the
+    same campaign_id, which the unique campaign_id index rejects with a
+    duplicate key error, so a concurrent write is detected per request.
+    """
+    return [
+        ReplaceOne(
+            {'campaign_id': doc['campaign_id'], 'content_hash': hot_hashes.get(doc['campaign_id'])},
+            doc,
+            upsert=True,
+        )
+        for doc in documents
+    ]
+
+def build_chunk_report(index: int, positions: List[int], details: Dict[str, Any], unchanged: int = 0) -> Dict[str, Any]:
+    """Turn a bulk_write result document into a per-chunk report
+
+    ``positions`` maps each request in the chunk back to its input position;
+    ``unchanged`` counts campaigns skipped because their content was stored.
+    """
+    errors = [
+        {'index': positions[error['index']], 'message': error.get('errmsg', '')}
+        for error in details.get('writeErrors', [])
+    ]
+    return {
+        'chunk': index,
+        'inserted': details.get('nUpserted', 0),
+        'updated': details.get('nMatched', 0),
+        'failed': len(errors),
+        'unchanged': unchanged,
+        'upserted_ids': [str(item['_id']) for item in details.get('upserted', [])],
+        'errors': errors,
+    }
+
+def written_documents(chunk: List[Dict[str, Any]], details: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the documents of a chunk that were not rejected by the server"""
+    failed = {error['index'] for error in details.get('writeErrors', [])}
+    return [doc for i, doc in enumerate(chunk) if i not in failed]
+
+def replaced_documents(previous: List[Dict[str, Any]], written: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the prior versions of campaigns that have just been overwritten
+
+    A campaign caught in both tiers by an interrupted archive run counts once,
+    as the last of its versions in ``previous``.
+    """
+    written_ids = {doc['campaign_id'] for doc in written}
+    latest = {doc['campaign_id']: doc for doc in previous if doc['campaign_id'] in written_ids}
+    return list(latest.values())
+
+def previous_query(chunk: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Select the stored versions of the campaigns in a chunk"""
+    return {'campaign_id': {'$in': [doc['campaign_id'] for doc in chunk]}}
+
+def stored_hashes(previous: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Map campaign_id to the content hash of its stored version"""
+    return {doc['campaign_id']: doc.get('content_hash') for doc in previous}
+
+def merge_chunk_reports(report: Optional[Dict[str, Any]], attempt: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the counts of a further write attempt to a chunk report"""
+    if report is None:
+        return attempt
+    return {
+        'chunk': report['chunk'],
+        **{key: report[key] + attempt[key] for key in
+           ('inserted', 'updated', 'failed', 'unchanged', 'upserted_ids', 'errors')},
+    }
+
+class ChunkUpsert:
+    """The writes of one chunk of campaigns, planned apart from the I/O
+
+    While ``pending``, backends read the archived and hot versions selected
+    by ``query``, pass them to plan() and run the requests it returns as one
+    unordered bulk_write, then pass the result document to record(). The
+    campaigns it returns as written, with the versions they replaced, are
+    then removed from the archive, applied to the rollups and given fresh
+    weekly facts. Writes are conditional on the hot version read, so rollup
+    deltas never subtract a version another writer has already replaced;
+    campaigns that lose such a race are read and planned again, up to
+    INGEST_WRITE_ATTEMPTS times. ``report`` holds the chunk's counts.
+    """
+
+    def __init__(self, index: int, entries: List[Tuple[int, Dict[str, Any]]]):
+        self.index = index
+        self.entries = entries
+        self.attempts = 0
+        self.previous: List[Dict[str, Any]] = []
+        self.report: Optional[Dict[str, Any]] = None
+
+    @property
+    def pending(self) -> bool:
+        return bool(self.entries)
+
+    @property
+    def query(self) -> Dict[str, Any]:
+        return previous_query([doc for _, doc in self.entries])
+
+    def plan(self, archived: List[Dict[str, Any]], hot: List[Dict[str, Any]]) -> List[ReplaceOne]:
+        """Stamp content hashes and return the upserts of campaigns that changed"""
+        self.previous = archived + hot
+        self.entries, unchanged = changed_entries(self.entries, stored_hashes(self.previous))
+        self.report = merge_chunk_reports(self.report, build_chunk_report(self.index, [], {}, unchanged))
+        return build_upsert_requests([doc for _, doc in self.entries], stored_hashes(hot))
+
+    def record(self, details: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Record a bulk_write result; returns the written campaigns and the versions they replaced
+
+        Campaigns whose write lost a race stay pending for another attempt;
+        on the last attempt they are reported as failed.
+        """
+        self.attempts += 1
+        final = self.attempts >= INGEST_WRITE_ATTEMPTS
+        errors, conflicts = [], []
+        for error in details.get('writeErrors', []):
+            if error.get('code') != DUPLICATE_KEY:
+                errors.append(error)
+            elif final:
+                errors.append({**error, 'errmsg': "Campaign was changed by another writer; not written"})
+            else:
+                conflicts.append(error['index'])
+        docs = [doc for _, doc in self.entries]
+        written = written_documents(docs, details)
+        attempt = build_chunk_report(self.index, [position for position, _ in self.entries], {**details, 'writeErrors': errors})
+        self.report = merge_chunk_reports(self.report, attempt)
+        self.entries = [self.entries[i] for i in conflicts]
+        return written, replaced_documents(self.previous, written)
+
+def chunk_upserts(documents: List[Dict[str, Any]], batch_size: Optional[int] = None) -> Iterator[ChunkUpsert]:
+    """Split campaigns into chunks of ``batch_size``, keeping the last version of each"""
+    batch_size = batch_size or INGEST_BATCH_SIZE
+    for index, entries in enumerate(chunked(latest_per_campaign(documents), batch_size)):
+        yield ChunkUpsert(index, entries)
+
+def bulk_write_details(collection, requests: List[ReplaceOne]) -> Dict[str, Any]:
+    """Run upserts as one unordered bulk_write and return its result document"""
+    if not requests:
+        return {}
+    try:
+        return collection.bulk_write(requests, ordered=False).bulk_api_result
+    except BulkWriteError as e:
+        return e.details
+
+def upsert_campaigns(
+    collection,
+    documents: List[Dict[str, Any]],
+    batch_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Idempotently write campaigns keyed on campaign_id in unordered batches
+
+    Each document replaces any existing campaign with the same campaign_id or
+    is inserted if none exists, so re-uploading a file does not duplicate it.
+    Documents are stamped with a content_hash and campaigns stored with the
+    same hash are not written at all. An archived campaign that is uploaded
+    again with changes moves back to the hot collection. Rollups are adjusted
+    by the difference between old and new versions and the campaigns' weekly
+    mail-drop facts are replaced. A campaign replaced by another writer
+    between its read and its write is read and written again. Returns one
+    report per chunk with inserted, updated, unchanged and failed counts.
+    """
+    archive = collection.database[MONGO_ARCHIVE_COLLECTION_NAME]
+    reports = []
+    for write in chunk_upserts(documents, batch_size):
+        while write.pending:
+            archived = list(archive.find(write.query, ROLLUP_PROJECTION))
+            hot = list(collection.find(write.query, ROLLUP_PROJECTION))
+            details = bulk_write_details(collection, write.plan(archived, hot))
+            written, replaced = write.record(details)
+            if written:
+                archive.delete_many(previous_query(written))
+            apply_rollups(collection.database, written, replaced)
+            replace_weekly_facts(collection.database, written)
+        reports.append(write.report)
+    return reports
@@ -0,0 +1,218 @@
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from ..config import INGEST_JOB_DIR, INGEST_MAX_JOBS, INGEST_JOB_STALE_SECONDS
+from .batching import summarize_reports
+from .columnar import arrow_tasks, csv_tasks
+from .documents import build_parallel
+from .workbooks import xlsx_tasks
+from .fingerprints import copy_with_fingerprint
+
+# Errors kept on a job document; later ones are only counted
+JOB_MAX_ERRORS = 100
+
+# Bounded pool running ingest jobs in the background of the API or dashboard;
+# started on application startup or by the first submitted job.
+_job_executor = None
+_job_executor_lock = threading.Lock()
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _parse_time(value: str) -> datetime:
+    """Parse a job timestamp; ones saved without an offset are UTC"""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def empty_progress() -> Dict[str, Any]:
+    """Counters of a job that has not processed any rows"""
+    return {
+        'rows_parsed': 0,
+        'rows_validated': 0,
+        'documents_written': 0,
+        'inserted': 0,
+        'updated': 0,
+        'unchanged': 0,
+        'failed': 0,
+        'errors': [],
+    }
+
+def find_duplicate(repository, fingerprint: str) -> Optional[str]:
+    """Return the id of a job that already ingested, or is ingesting, identical bytes
+
+    A completed upload only counts while nothing has been written since, so
+    uploading a file again after later edits still restores its contents.
+    """
+    for job in repository.list_jobs(['queued', 'running'], limit=1000):
+        if job.get('fingerprint') == fingerprint:
+            return job['job_id']
+    logged = repository.get_ingest(fingerprint)
+    if logged is not None and logged['data_version'] == repository.get_data_version():
+        return logged['job_id']
+    return None
+
+def create_job(repository, filename: str, fileobj, fmt: str = 'csv') -> Dict[str, Any]:
+    """Spool an uploaded file into INGEST_JOB_DIR and record it as a queued job
+
+    ``fmt`` is 'csv', 'xlsx', 'parquet' or 'arrow'. The file is fingerprinted while it
+    is spooled; an upload identical to one found by find_duplicate() is
+    recorded as skipped instead, with duplicate_of naming that job.
+    """
+    job_id = uuid.uuid4().hex
+    now = _now()
+    job = {
+        'job_id': job_id,
+        'filename': filename,
+        'format': fmt,
+        'source': os.path.join(INGEST_JOB_DIR, f'{job_id}.{fmt}'),
+        'status': 'queued',
+        'attempts': 0,
+        'created_at': now,
+        'updated_at': now,
+        'started_at': None,
+        'finished_at': None,
+        'error': None,
+        'duplicate_of': None,
+        **empty_progress(),
+    }
+    os.makedirs(INGEST_JOB_DIR, exist_ok=True)
+    with open(job['source'], 'wb') as out:
+        job['fingerprint'] = copy_with_fingerprint(fileobj, out)
+    job['duplicate_of'] = find_duplicate(repository, job['fingerprint'])
+    if job['duplicate_of']:
+        os.remove(job['source'])
+        job.update(status='skipped', finished_at=now)
+    repository.save_job(job)
+    return job
+
+def record_chunk(job: Dict[str, Any], rows: int, positions: List[int], errors: List[Dict[str, Any]], summary: Dict[str, Any]):
+    """Add one chunk's parse, validation and write results to a job's counters"""
+    write_errors = [
+        {'index': positions[error['index']], 'message': error['message']}
+        for error in summary.get('errors', [])
+    ]
+    job['rows_parsed'] += rows
+    job['rows_validated'] += rows - len(errors)
+    job['inserted'] += summary.get('inserted_count', 0)
+    job['updated'] += summary.get('updated_count', 0)
+    job['unchanged'] += summary.get('unchanged_count', 0)
+    job['documents_written'] = job['inserted'] + job['updated']
+    job['failed'] += len(errors) + len(write_errors)
+    job['errors'] = (job['errors'] + errors + write_errors)[:JOB_MAX_ERRORS]
+    job['updated_at'] = _now()
+
+def read_job_documents(job: Dict[str, Any]):
+    """Stream a job's spooled upload as chunks of campaign documents
+
+    The file is read on the job's thread and its chunks are built on the
+    build process pool; results come back in file order.
+    """
+    fmt = job.get('format', 'csv')
+    if fmt == 'csv':
+        tasks = csv_tasks(job['source'])
+    elif fmt == 'xlsx':
+        tasks = xlsx_tasks(job['source'])
+    else:
+        tasks = arrow_tasks(job['source'], fmt)
+    return build_parallel(tasks)
+
+def run_job(repository, job: Dict[str, Any]):
+    """Ingest a job's spooled upload chunk by chunk, saving progress after each chunk
+
+    Upserts are keyed on campaign_id, so a job that is retried or resumed
+    after a restart simply starts over. Once the job completes the spooled
+    file is removed and the upload is added to the ingest log.
+    """
+    job.update(empty_progress())
+    job.update(status='running', attempts=job['attempts'] + 1, started_at=_now(),
+               updated_at=_now(), finished_at=None, error=None)
+    repository.save_job(job)
+    try:
+        for rows, documents, positions, errors in read_job_documents(job):
+            summary = summarize_reports(repository.upsert_campaigns(documents)) if documents else {}
+            record_chunk(job, rows, positions, errors, summary)
+            repository.save_job(job)
+        if job.get('fingerprint'):
+            repository.log_ingest({
+                'fingerprint': job['fingerprint'],
+                'job_id': job['job_id'],
+                'filename': job['filename'],
+                'rows': job['rows_parsed'],
+                'completed_at': _now(),
+                'data_version': repository.get_data_version(),
+            })
+        job['status'] = 'completed'
+        os.remove(job['source'])
+    except Exception as e:
+        job.update(status='failed', error=str(e))
+    job.update(finished_at=_now(), updated_at=_now())
+    repository.save_job(job)
+
+def get_job_executor() -> ThreadPoolExecutor:
+    """Return the ingest pool, starting it if needed"""
+    global _job_executor
+    with _job_executor_lock:
+        if _job_executor is None:
+            _job_executor = ThreadPoolExecutor(max_workers=INGEST_MAX_JOBS, thread_name_prefix='ingest')
+        return _job_executor
+
+def submit_job(repository, job: Dict[str, Any]):
+    """Queue a job on the bounded ingest pool"""
+    get_job_executor().submit(run_job, repository, job)
+
+def claim_job(repository, job: Dict[str, Any]) -> bool:
+    """Mark a job read from the repository as queued, unless another process got there first
+
+    The update only applies while the stored job still has the status and
+    updated_at that were read, so a job is never queued twice.
+    """
+    status, updated_at = job['status'], job['updated_at']
+    job.update(status='queued', updated_at=_now())
+    return repository.claim_job(job, status, updated_at)
+
+def retry_job(repository, job_id: str) -> Optional[Dict[str, Any]]:
+    """Queue a failed job again; returns None unless it can be retried"""
+    job = repository.get_job(job_id)
+    if job is None or job['status'] != 'failed' or not os.path.exists(job['source']):
+        return None
+    if not claim_job(repository, job):
+        return None
+    submit_job(repository, job)
+    return job
+
+def resume_jobs(repository) -> int:
+    """Queue again jobs left queued or running by a process that stopped
+
+    Only jobs not updated for INGEST_JOB_STALE_SECONDS are taken, so jobs still
+    owned by another running process are left alone, and each is claimed
+    first so that processes starting together do not both resume it.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=INGEST_JOB_STALE_SECONDS)
+    resumed = 0
+    for job in repository.list_jobs(['queued', 'running'], limit=1000):
+        if _parse_time(job['updated_at']) < cutoff and os.path.exists(job['source']) and claim_job(repository, job):
+            submit_job(repository, job)
+            resumed += 1
+    return resumed
+
+def job_progress(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Public view of a job's state with its throughput in rows per second"""
+    progress = {key: value for key, value in job.items() if key != 'source'}
+    throughput = 0.0
+    if job['started_at']:
+        finished = _parse_time(job['finished_at']) if job['finished_at'] else datetime.now(timezone.utc)
+        elapsed = (finished - _parse_time(job['started_at'])).total_seconds()
+        throughput = job['rows_parsed'] / elapsed if elapsed > 0 else 0.0
+    progress['rows_per_second'] = round(throughput, 1)
+    return progress
+
+def shutdown_jobs():
+    """Stop starting queued jobs; they are resumed on the next start"""
+    global _job_executor
+    with _job_executor_lock:
+        if _job_executor is not None:
+            _job_executor.shutdown(wait=False, cancel_futures=True)
+            _job_executor = None
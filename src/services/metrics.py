@@ -0,0 +1,56 @@
+from typing import Any, Dict, List, Optional
+
+EMPTY_METRICS = {
+    "total_campaigns": 0,
+    "active_campaigns": 0,
+    "average_roi": 0.0,
+    "total_budget": 0.0,
+    "total_pieces_sent": 0,
+    "total_responses": 0,
+    "total_conversions": 0,
+    "total_conversion_value": 0.0,
+}
+
+def campaign_metrics_pipeline(
+    query: Optional[Dict[str, Any]] = None,
+    union_with: List[str] = (),
+) -> List[Dict[str, Any]]:
+    """Build the aggregation that computes dashboard KPIs in a single $group
+
+    Matching documents from the ``union_with`` collections are included too.
+    """
+    match = {'$match': query or {}}
+    return [
+        match,
+        *({'$unionWith': {'coll': name, 'pipeline': [match]}} for name in union_with),
+        {'$group': {
+            '_id': None,
+            'total_campaigns': {'$sum': 1},
+            'active_campaigns': {
+                '$sum': {'$cond': [{'$eq': ['$campaign_status', 'Active']}, 1, 0]}
+            },
+            'average_roi': {'$avg': '$performance_summary.campaign_roi'},
+            'total_budget': {'$sum': '$cost_details.overall_budget'},
+            'total_pieces_sent': {'$sum': '$performance_summary.total_campaign_pieces_sent'},
+            'total_responses': {'$sum': '$performance_summary.total_campaign_responses'},
+            'total_conversions': {'$sum': '$performance_summary.total_campaign_conversions'},
+            'total_conversion_value': {'$sum': '$performance_summary.total_campaign_conversion_value'},
+        }},
+        {'$project': {'_id': 0}},
+    ]
+
+def metrics_from_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fill in defaults for an empty or partial aggregation result"""
+    metrics = dict(EMPTY_METRICS)
+    if results:
+        metrics.update({k: v for k, v in results[0].items() if v is not None})
+    return metrics
+
+def get_campaign_metrics(
+    collection,
+    query: Optional[Dict[str, Any]] = None,
+    union_with: List[str] = (),
+) -> Dict[str, Any]:
+    """Compute summary KPIs for the campaigns matching the query"""
+    pipeline = campaign_metrics_pipeline(query, union_with)
+    return metrics_from_results(list(collection.aggregate(pipeline)))
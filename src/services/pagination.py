@@ -0,0 +1,102 @@
+from typing import Any, Dict, List, Optional, Tuple
+from bson import ObjectId
+from pymongo import DESCENDING
+
+class InvalidCursor(ValueError):
+    """A page cursor that was not issued by this backend"""
+
+def build_page_query(query: Optional[Dict[str, Any]] = None, after_id: Optional[str] = None) -> Dict[str, Any]:
+    """Restrict a query to documents older than the keyset cursor"""
+    page_query = dict(query or {})
+    if after_id:
+        if not ObjectId.is_valid(after_id):
+            raise InvalidCursor(f"Invalid page cursor: {after_id}")
+        page_query['_id'] = {'$lt': ObjectId(after_id)}
+    return page_query
+
+def next_page_cursor(docs: List[Dict[str, Any]], page_size: int) -> Optional[str]:
+    """Return the cursor following a full page, or None after the last page"""
+    return str(docs[-1]['_id']) if len(docs) == page_size else None
+
+def fetch_page(
+    collection,
+    page_size: int,
+    after_id: Optional[str] = None,
+    query: Optional[Dict[str, Any]] = None,
+    projection: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Fetch one page of documents newest-first using keyset paging on _id
+
+    Returns the documents and the cursor to pass as ``after_id`` for the next
+    page, or None when there are no further documents.
+    """
+    docs = list(
+        collection.find(build_page_query(query, after_id), projection)
+        .sort('_id', DESCENDING)
+        .limit(page_size)
+    )
+    return docs, next_page_cursor(docs, page_size)
+
+def fetch_merged_page(
+    collections: list,
+    page_size: int,
+    after_id: Optional[str] = None,
+    query: Optional[Dict[str, Any]] = None,
+    projection: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Fetch one keyset page across several collections as if they were one
+
+    Each collection contributes at most one page from its own _id index; the
+    newest ``page_size`` of those are the page of the union.
+    """
+    if len(collections) == 1:
+        return fetch_page(collections[0], page_size, after_id, query, projection)
+    docs = [
+        doc
+        for collection in collections
+        for doc in fetch_page(collection, page_size, after_id, query, projection)[0]
+    ]
+    docs = sorted(docs, key=lambda doc: doc['_id'], reverse=True)[:page_size]
+    return docs, next_page_cursor(docs, page_size)
+
+def find_page_cursor(collection, offset: int, query: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Return the cursor that starts a page ``offset`` documents in
+
+    Only the _id index is walked, so this is used to jump to a page whose
+    cursor has not been seen yet.
+    """
+    if offset <= 0:
+        return None
+    docs = list(
+        collection.find(query or {}, {'_id': 1})
+        .sort('_id', DESCENDING)
+        .skip(offset - 1)
+        .limit(1)
+    )
+    return str(docs[0]['_id']) if docs else None
+
+def count_documents(collection, query: Optional[Dict[str, Any]] = None, exact: bool = True) -> int:
+    """Count matching documents, using collection metadata when allowed"""
+    if not query and not exact:
+        return collection.estimated_document_count()
+    return collection.count_documents(query or {})
+
+def find_merged_page_cursor(collections: list, offset: int, query: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Return the cursor that starts a page ``offset`` documents into several collections"""
+    if len(collections) == 1 or offset <= 0:
+        return find_page_cursor(collections[0], offset, query)
+    first, *others = collections
+    ids_only = [{'$match': query or {}}, {'$project': {'_id': 1}}]
+    pipeline = ids_only + [
+        {'$unionWith': {'coll': other.name, 'pipeline': ids_only}} for other in others
+    ] + [
+        {'$sort': {'_id': DESCENDING}},
+        {'$skip': offset - 1},
+        {'$limit': 1},
+    ]
+    docs = list(first.aggregate(pipeline))
+    return str(docs[0]['_id']) if docs else None
+
+def count_merged_documents(collections: list, query: Optional[Dict[str, Any]] = None, exact: bool = True) -> int:
+    """Count matching documents across several collections"""
+    return sum(count_documents(collection, query, exact) for collection in collections)
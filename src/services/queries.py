@@ -0,0 +1,27 @@
+import re
+from typing import Any, Dict, List, Optional
+from ..config import SEARCH_MODE
+
+def build_campaign_query(
+    status_filter: Optional[List[str]] = None,
+    search_term: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Translate the campaign list filters into an index-friendly MongoDB query
+
+    Statuses become an ``$in`` on the campaign_status index. Search terms use
+    the campaign_text index by default; with SEARCH_MODE=prefix they become a
+    case-sensitive anchored regex on campaign_name, which can walk an index.
+    """
+    query: Dict[str, Any] = {}
+
+    if status_filter:
+        query['campaign_status'] = {'$in': list(status_filter)}
+
+    search_term = (search_term or '').strip()
+    if search_term:
+        if SEARCH_MODE == 'prefix':
+            query['campaign_name'] = {'$regex': '^' + re.escape(search_term)}
+        else:
+            query['$text'] = {'$search': search_term}
+
+    return query
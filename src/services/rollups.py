@@ -0,0 +1,173 @@
+import argparse
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+from pymongo import UpdateOne
+from ..config import MONGO_COLLECTION_NAME, MONGO_ROLLUP_COLLECTION_NAME, MONGO_ARCHIVE_COLLECTION_NAME
+from .metrics import EMPTY_METRICS
+
+# Rollup measures and the campaign field each one sums; 'campaigns' counts.
+ROLLUP_MEASURES = {
+    'campaigns': None,
+    'total_budget': 'cost_details.overall_budget',
+    'total_cost_actual': 'cost_details.total_campaign_cost_actual',
+    'total_pieces_sent': 'performance_summary.total_campaign_pieces_sent',
+    'total_responses': 'performance_summary.total_campaign_responses',
+    'total_conversions': 'performance_summary.total_campaign_conversions',
+    'total_conversion_value': 'performance_summary.total_campaign_conversion_value',
+    'roi_sum': 'performance_summary.campaign_roi',
+}
+
+# Fields needed to compute a campaign's rollup key and contribution
+ROLLUP_PROJECTION = {
+    '_id': 0,
+    'campaign_id': 1,
+    'campaign_status': 1,
+    'overall_start_date': 1,
+    'campaign_goal': 1,
+    'archived_at': 1,
+    'content_hash': 1,
+    **{path: 1 for path in ROLLUP_MEASURES.values() if path},
+}
+
+def _get_path(doc: Dict[str, Any], path: str):
+    """Read a dotted path from a nested document"""
+    for part in path.split('.'):
+        if not isinstance(doc, dict):
+            return None
+        doc = doc.get(part)
+    return doc
+
+def rollup_key(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the rollup group a campaign belongs to
+
+    Archived campaigns carry archived_at and are kept in separate groups so
+    hot-only metrics can leave them out.
+    """
+    return {
+        'campaign_status': doc.get('campaign_status'),
+        'start_month': str(doc.get('overall_start_date') or '')[:7],
+        'campaign_goal': doc.get('campaign_goal'),
+        'archived': bool(doc.get('archived_at')),
+    }
+
+def rollup_values(doc: Dict[str, Any]) -> Dict[str, float]:
+    """Return a campaign's contribution to each rollup measure"""
+    return {
+        name: 1 if path is None else (_get_path(doc, path) or 0)
+        for name, path in ROLLUP_MEASURES.items()
+    }
+
+def rollup_deltas(
+    added: Iterable[Dict[str, Any]],
+    removed: Iterable[Dict[str, Any]] = (),
+) -> Dict[tuple, Dict[str, float]]:
+    """Net per-group changes from adding and removing campaign documents"""
+    deltas = defaultdict(lambda: defaultdict(float))
+    for sign, docs in ((1, added), (-1, removed)):
+        for doc in docs:
+            key = tuple(rollup_key(doc).items())
+            for name, value in rollup_values(doc).items():
+                deltas[key][name] += sign * value
+    return deltas
+
+def rollup_updates(deltas: Dict[tuple, Dict[str, float]]) -> List[UpdateOne]:
+    """Build the $inc upserts that apply rollup deltas"""
+    return [
+        UpdateOne({'_id': dict(key)}, {'$inc': dict(values)}, upsert=True)
+        for key, values in deltas.items()
+        if any(values.values())
+    ]
+
+def apply_rollups(db, added: Iterable[Dict[str, Any]], removed: Iterable[Dict[str, Any]] = ()):
+    """Increment the rollup collection for written and replaced campaigns"""
+    updates = rollup_updates(rollup_deltas(added, removed))
+    if updates:
+        db[MONGO_ROLLUP_COLLECTION_NAME].bulk_write(updates, ordered=False)
+
+def rebuild_pipeline(
+    rollup_collection: str = MONGO_ROLLUP_COLLECTION_NAME,
+    archive_collection: str = MONGO_ARCHIVE_COLLECTION_NAME,
+) -> List[Dict[str, Any]]:
+    """Aggregation that recomputes every rollup group from hot and archived campaigns"""
+    group = {
+        '_id': {
+            'campaign_status': '$campaign_status',
+            'start_month': {'$substrCP': [{'$ifNull': ['$overall_start_date', '']}, 0, 7]},
+            'campaign_goal': '$campaign_goal',
+            'archived': {'$ne': [{'$ifNull': ['$archived_at', None]}, None]},
+        },
+    }
+    for name, path in ROLLUP_MEASURES.items():
+        group[name] = {'$sum': 1 if path is None else f'${path}'}
+    return [{'$unionWith': archive_collection}, {'$group': group}, {'$out': rollup_collection}]
+
+def rebuild_rollups(db, collection_name: str = MONGO_COLLECTION_NAME):
+    """Replace the rollup collection with groups computed from scratch"""
+    db[collection_name].aggregate(rebuild_pipeline())
+
+def ensure_rollups(db, collection_name: str = MONGO_COLLECTION_NAME) -> bool:
+    """Backfill rollups once for campaigns loaded before rollups existed"""
+    rollups = db[MONGO_ROLLUP_COLLECTION_NAME]
+    if rollups.estimated_document_count() or not db[collection_name].estimated_document_count():
+        return False
+    rebuild_rollups(db, collection_name)
+    return True
+
+def rollup_query(status_filter: Optional[List[str]] = None, include_archived: bool = True) -> Dict[str, Any]:
+    """Select the rollup groups for the given statuses and tiers"""
+    query: Dict[str, Any] = {}
+    if status_filter:
+        query['_id.campaign_status'] = {'$in': list(status_filter)}
+    if not include_archived:
+        # Groups built before tiering have no archived flag and are all hot
+        query['_id.archived'] = {'$ne': True}
+    return query
+
+def metrics_from_rollups(groups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine rollup groups into the dashboard summary metrics"""
+    metrics = dict(EMPTY_METRICS)
+    campaigns = sum(group.get('campaigns', 0) for group in groups)
+    metrics.update({
+        'total_campaigns': int(campaigns),
+        'active_campaigns': int(sum(group.get('campaigns', 0) for group in groups
+                                    if group['_id']['campaign_status'] == 'Active')),
+        'average_roi': sum(group.get('roi_sum', 0) for group in groups) / campaigns if campaigns else 0.0,
+        'total_budget': sum(group.get('total_budget', 0) for group in groups),
+        'total_pieces_sent': int(sum(group.get('total_pieces_sent', 0) for group in groups)),
+        'total_responses': int(sum(group.get('total_responses', 0) for group in groups)),
+        'total_conversions': int(sum(group.get('total_conversions', 0) for group in groups)),
+        'total_conversion_value': sum(group.get('total_conversion_value', 0) for group in groups),
+    })
+    return metrics
+
+def get_rollup_metrics(
+    db,
+    status_filter: Optional[List[str]] = None,
+    include_archived: bool = True,
+) -> Dict[str, Any]:
+    """Compute dashboard summary metrics from the rollup collection"""
+    groups = list(db[MONGO_ROLLUP_COLLECTION_NAME].find(rollup_query(status_filter, include_archived)))
+    return metrics_from_rollups(groups)
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point: python -m src.services.rollups --rebuild"""
+    from ..config import MONGO_DB_NAME
+    from .connection import get_client
+
+    parser = argparse.ArgumentParser(description="Maintain the campaign rollup collection")
+    parser.add_argument('--rebuild', action='store_true', help="recompute all rollups from campaigns")
+    args = parser.parse_args(argv)
+
+    db = get_client()[MONGO_DB_NAME]
+    if args.rebuild:
+        rebuild_rollups(db)
+        print("Rollups rebuilt")
+    for group in db[MONGO_ROLLUP_COLLECTION_NAME].find().sort('_id', 1):
+        key = group['_id']
+        print(f"{str(key['campaign_status']):12} {key['start_month']:8} {str(key['campaign_goal']):32} "
+              f"{'archived' if key.get('archived') else 'hot':8} {int(group.get('campaigns', 0)):>8}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+import argparse
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pymongo.errors import CollectionInvalid
+from ..config import MONGO_COLLECTION_NAME, MONGO_WEEKLY_COLLECTION_NAME, MONGO_ARCHIVE_COLLECTION_NAME
+
+TREND_UNITS = ('week', 'month')
+
+def ensure_weekly_collection(db) -> bool:
+    """Create the weekly mail-drop time-series collection if it is missing"""
+    if MONGO_WEEKLY_COLLECTION_NAME in db.list_collection_names():
+        return False
+    try:
+        db.create_collection(
+            MONGO_WEEKLY_COLLECTION_NAME,
+            timeseries={'timeField': 'week_start', 'metaField': 'meta', 'granularity': 'hours'},
+        )
+    except CollectionInvalid:
+        return False
+    return True
+
+def parse_week_start(value) -> Optional[datetime]:
+    """Parse a mailing week start date, returning None when it is unusable"""
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(str(value)[:10], '%Y-%m-%d')
+    except ValueError:
+        return None
+
+def weekly_facts(campaign: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten a campaign's weekly mail drops into per-cell weekly facts
+
+    Drops without per-cell rows produce a single drop-level fact.
+    """
+    facts = []
+    for drop in campaign.get('weekly_mail_drops') or []:
+        week_start = parse_week_start(drop.get('mailing_week_start_date'))
+        if week_start is None:
+            continue
+        meta = {'campaign_id': campaign['campaign_id'], 'mail_drop_id': drop.get('mail_drop_id')}
+        cells = drop.get('cells_mailed_this_week') or []
+        if not cells:
+            facts.append({
+                'week_start': week_start,
+                'meta': {**meta, 'cell_no': None},
+                'quantity': drop.get('total_pieces_sent_this_week') or 0,
+                'responses': 0,
+                'conversions': 0,
+                'value': 0.0,
+            })
+        for cell in cells:
+            facts.append({
+                'week_start': week_start,
+                'meta': {**meta, 'cell_no': cell.get('cell_no')},
+                'quantity': cell.get('quantity_mailed_this_week') or 0,
+                'responses': cell.get('responses_this_week') or 0,
+                'conversions': cell.get('conversions_this_week') or 0,
+                'value': cell.get('conversion_value_this_week') or 0.0,
+            })
+    return facts
+
+def facts_query(campaigns: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Select the stored facts of the given campaigns by their metaField"""
+    return {'meta.campaign_id': {'$in': [camp['campaign_id'] for camp in campaigns]}}
+
+def replace_weekly_facts(db, campaigns: List[Dict[str, Any]]):
+    """Replace the weekly facts of freshly written campaigns"""
+    if not campaigns:
+        return
+    collection = db[MONGO_WEEKLY_COLLECTION_NAME]
+    collection.delete_many(facts_query(campaigns))
+    facts = [fact for camp in campaigns for fact in weekly_facts(camp)]
+    if facts:
+        collection.insert_many(facts, ordered=False)
+
+def trends_pipeline(
+    start: datetime,
+    end: datetime,
+    unit: str = 'week',
+    campaign_ids: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Aggregate weekly facts in [start, end) into week or month buckets"""
+    if unit not in TREND_UNITS:
+        raise ValueError(f"unit must be one of {', '.join(TREND_UNITS)}")
+    match = {'week_start': {'$gte': start, '$lt': end}}
+    if campaign_ids:
+        match['meta.campaign_id'] = {'$in': list(campaign_ids)}
+    return [
+        {'$match': match},
+        {'$group': {
+            '_id': {'$dateTrunc': {'date': '$week_start', 'unit': unit}},
+            'quantity': {'$sum': '$quantity'},
+            'responses': {'$sum': '$responses'},
+            'conversions': {'$sum': '$conversions'},
+            'value': {'$sum': '$value'},
+            'campaigns': {'$addToSet': '$meta.campaign_id'},
+        }},
+        {'$project': {
+            '_id': 0,
+            'period_start': '$_id',
+            'quantity': 1,
+            'responses': 1,
+            'conversions': 1,
+            'value': 1,
+            'campaign_count': {'$size': '$campaigns'},
+        }},
+        {'$sort': {'period_start': 1}},
+    ]
+
+def get_weekly_trends(
+    db,
+    start: datetime,
+    end: datetime,
+    unit: str = 'week',
+    campaign_ids: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Return bucketed mail-drop totals for a date range"""
+    pipeline = trends_pipeline(start, end, unit, campaign_ids)
+    return list(db[MONGO_WEEKLY_COLLECTION_NAME].aggregate(pipeline))
+
+def rebuild_weekly_facts(db, collection_name: str = MONGO_COLLECTION_NAME, batch_size: int = 1000):
+    """Regenerate all weekly facts from the stored hot and archived campaigns"""
+    ensure_weekly_collection(db)
+    db[MONGO_WEEKLY_COLLECTION_NAME].delete_many({})
+    projection = {'_id': 0, 'campaign_id': 1, 'weekly_mail_drops': 1}
+    for name in (collection_name, MONGO_ARCHIVE_COLLECTION_NAME):
+        batch = []
+        for campaign in db[name].find({}, projection):
+            batch.append(campaign)
+            if len(batch) >= batch_size:
+                replace_weekly_facts(db, batch)
+                batch = []
+        replace_weekly_facts(db, batch)
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point: python -m src.services.timeseries --rebuild"""
+    from ..config import MONGO_DB_NAME
+    from .connection import get_client
+
+    parser = argparse.ArgumentParser(description="Maintain the weekly mail-drop time series")
+    parser.add_argument('--rebuild', action='store_true', help="regenerate facts from campaigns")
+    args = parser.parse_args(argv)
+
+    db = get_client()[MONGO_DB_NAME]
+    if args.rebuild:
+        rebuild_weekly_facts(db)
+        print("Weekly facts rebuilt")
+    else:
+        created = ensure_weekly_collection(db)
+        print("Created weekly collection" if created else "Weekly collection exists")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
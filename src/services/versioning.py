@@ -0,0 +1,16 @@
+from typing import Any, Dict, Tuple
+from ..config import MONGO_COLLECTION_NAME, MONGO_VERSION_COLLECTION_NAME
+
+def version_bump(name: str = MONGO_COLLECTION_NAME) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return the filter and update that increment a collection's data version"""
+    return {'_id': name}, {'$inc': {'version': 1}}
+
+def bump_data_version(db, name: str = MONGO_COLLECTION_NAME):
+    """Record that the named collection has changed"""
+    query, update = version_bump(name)
+    db[MONGO_VERSION_COLLECTION_NAME].update_one(query, update, upsert=True)
+
+def get_data_version(db, name: str = MONGO_COLLECTION_NAME) -> int:
+    """Return the current data version of the named collection"""
+    doc = db[MONGO_VERSION_COLLECTION_NAME].find_one({'_id': name}, {'version': 1})
+    return doc['version'] if doc else 0
@@ -0,0 +1,85 @@
+import pickle
+import tempfile
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Tuple
+import pandas as pd
+from openpyxl import load_workbook
+from ..config import CSV_CHUNK_ROWS
+from ..models.upload_schema import UPLOAD_COLUMNS, WEEK_CELL_COLUMNS, normalize_column_name
+from .documents import build_serial, build_tasks, campaign_chunks, check_columns, last_campaign_rows
+
+def sheet_rows(source) -> Iterator[Tuple[Any, ...]]:
+    """Stream the cell values of a workbook's active sheet row by row
+
+    The workbook is opened read-only, so rows are parsed from the sheet XML as
+    they are reached rather than loaded as an object model up front.
+    """
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+def upload_positions(header: Tuple[Any, ...]) -> List[Tuple[str, int]]:
+    """Pair each upload column found in a header row with its position"""
+    kinds = {**UPLOAD_COLUMNS, **WEEK_CELL_COLUMNS}
+    names = [normalize_column_name(str(cell)) if cell is not None else None for cell in header]
+    return [(name, i) for i, name in enumerate(names) if name in kinds]
+
+def sheet_frames(source, chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Read a workbook's active sheet as frames of ``chunk_rows`` rows
+
+    The first row is the header. Only upload columns are kept and blank rows
+    are skipped; frames are numbered by their data row in the sheet.
+    """
+    rows = sheet_rows(source)
+    columns = upload_positions(next(rows, ()))
+    names = [name for name, _ in columns]
+    check_columns(pd.DataFrame(columns=names))
+    offset = 0
+    while True:
+        block = list(islice(rows, chunk_rows))
+        if not block:
+            return
+        kept = [
+            (position, [row[i] if i < len(row) else None for _, i in columns])
+            for position, row in enumerate(block, offset)
+        ]
+        kept = [(position, values) for position, values in kept if any(value is not None for value in values)]
+        offset += len(block)
+        if kept:
+            index, values = zip(*kept)
+            yield pd.DataFrame(list(values), columns=names, index=list(index))
+
+def spill_frames(frames: Iterable[pd.DataFrame], spill) -> Iterator[pd.DataFrame]:
+    """Pickle each frame to the binary file ``spill`` as it passes through"""
+    for df in frames:
+        pickle.dump(df, spill, protocol=pickle.HIGHEST_PROTOCOL)
+        yield df
+
+def spilled_frames(spill) -> Iterator[pd.DataFrame]:
+    """Read back the frames written by spill_frames()"""
+    spill.seek(0)
+    while True:
+        try:
+            yield pickle.load(spill)
+        except EOFError:
+            return
+
+def xlsx_tasks(source, chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[tuple]:
+    """Read a flat workbook ``chunk_rows`` rows at a time as build tasks
+
+    Parsing the sheet dominates, so it is parsed once: the frames are spilled
+    to a temporary file while the last row of each campaign is noted, then
+    read back and regrouped (see campaign_chunks()).
+    """
+    with tempfile.TemporaryFile() as spill:
+        last_rows = last_campaign_rows(spill_frames(sheet_frames(source, chunk_rows), spill))
+        yield from build_tasks(campaign_chunks(spilled_frames(spill), last_rows))
+
+def read_xlsx_documents(source, chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[tuple]:
+    """Stream a flat workbook as campaign documents a chunk at a time
+
+    Yields the same tuples as read_csv_documents.
+    """
+    return build_serial(xlsx_tasks(source, chunk_rows))
@@ -27,9 +27,12 @@ def render_upload_section():
                     campaigns = [CampaignData(**camp) for camp in data]
                     
                     with db_service as db:
-                        inserted_ids = db.insert_many([camp.dict() for camp in campaigns])
+                        result = db.upsert_many([camp.dict() for camp in campaigns])
                     
-                    st.success(f"Successfully uploaded {len(inserted_ids)} records!")
+                    st.success(f"Uploaded {result['inserted_count']} new and "
+                               f"{result['updated_count']} updated records!")
+                    if result['failed_count']:
+                        st.warning(f"{result['failed_count']} records failed to upload")
                     
         except Exception as e:
             st.error(f"Error processing file: {str(e)}")
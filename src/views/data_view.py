@@ -1,12 +1,21 @@
 import streamlit as st
 import pandas as pd
-from ..database import get_data
+from ..database import (
+    get_data_version,
+    get_data_page,
+    get_campaign_details,
+    get_page_cursor,
+    get_campaign_count,
+    get_status_options,
+    get_metrics,
+    get_summary_frame,
+)
 from ..models import CampaignData
-from typing import List
+from typing import List, Optional
 
-def paginate_dataframe(df: pd.DataFrame, page_size: int = 10) -> tuple:
-    """Helper function to paginate a DataFrame"""
-    n_pages = len(df) // page_size + (1 if len(df) % page_size > 0 else 0)
+def select_page(n_records: int, page_size: int = 10) -> tuple:
+    """Render the page selector and return the selected and total page numbers"""
+    n_pages = max(n_records // page_size + (1 if n_records % page_size > 0 else 0), 1)
     
     # Add page selector to sidebar
     page = st.sidebar.number_input(
@@ -16,17 +25,31 @@ def paginate_dataframe(df: pd.DataFrame, page_size: int = 10) -> tuple:
         value=1
     )
     
-    # Calculate start and end indices
-    start_idx = (page - 1) * page_size
-    end_idx = min(start_idx + page_size, len(df))
-    
-    return df.iloc[start_idx:end_idx], page, n_pages
+    return page, n_pages
+
+def page_cursor_key(data_version: int, page_size: int, filters: tuple, page: int) -> tuple:
+    """Key remembered page cursors by everything that shifts page boundaries"""
+    return (data_version, page_size, filters, page)
+
+def get_page_start(data_version: int, page: int, page_size: int, filters: tuple) -> Optional[str]:
+    """Return the keyset cursor for a page, remembering cursors already seen"""
+    cursors = st.session_state.setdefault('page_cursors', {})
+    key = page_cursor_key(data_version, page_size, filters, page)
+    if key not in cursors:
+        cursors[key] = get_page_cursor(data_version, (page - 1) * page_size, *filters)
+    return cursors[key]
+
+def clear_page_cursors():
+    """Forget remembered page cursors after the data has changed"""
+    st.session_state.pop('page_cursors', None)
 
 def render_data_view():
     """Render the main data view section of the application"""
-    campaign_data = get_data()
+    data_version = get_data_version()
+    total_campaigns = get_campaign_count(data_version)
 
-    if campaign_data:
+    # Unfiltered counts leave out archived campaigns, which still have statuses
+    if total_campaigns or get_status_options(data_version):
         # Add view options in sidebar
         with st.sidebar:
             st.markdown("### View Controls")
@@ -35,7 +58,7 @@ def render_data_view():
             search_term = st.text_input(
                 "🔍 Search campaigns",
                 placeholder="Enter campaign name or description"
-            ).lower()
+            )
             
             st.markdown("---")
             
@@ -43,7 +66,7 @@ def render_data_view():
             st.markdown("### Filters")
             status_filter = st.multiselect(
                 "Campaign Status:",
-                options=list(set(camp.campaign_status for camp in campaign_data)),
+                options=get_status_options(data_version),
                 default=[]
             )
             
@@ -57,61 +80,76 @@ def render_data_view():
             st.markdown("### Actions")
             if st.button('🔄 Refresh Data', use_container_width=True):
                 st.cache_data.clear()
+                clear_page_cursors()
                 st.rerun()
 
         # Filter and display data
-        filtered_data = filter_campaign_data(campaign_data, status_filter, search_term)
-        display_campaign_data(filtered_data, page_size)
+        filters = (tuple(status_filter), search_term.strip())
+        display_campaign_page(data_version, filters, page_size)
     else:
         st.info("No marketing data found. Please upload data using the Upload page.")
 
-def filter_campaign_data(campaign_data, status_filter, search_term):
-    """Filter campaign data based on selected filters"""
-    filtered_data = campaign_data
-    
-    if status_filter:
-        filtered_data = [camp for camp in filtered_data if camp.campaign_status in status_filter]
-    
-    if search_term:
-        filtered_data = [camp for camp in filtered_data if 
-                        search_term in camp.campaign_name.lower() or 
-                        search_term in camp.description.lower()]
-    
-    return filtered_data
-
-def display_campaign_data(filtered_data, page_size):
-    """Display the filtered campaign data with pagination"""
-    # Convert to DataFrame for display
-    flattened_data = [flatten_campaign_data(campaign) for campaign in filtered_data]
-    df = pd.DataFrame(flattened_data)
-    
-    if len(df) > 0:
-        # Display summary metrics
-        display_summary_metrics(df)
-        
-        # Paginate and display the data
-        paginated_df, current_page, total_pages = paginate_dataframe(df, page_size)
-        
-        st.markdown("### Campaign List")
-        st.markdown(f"*Showing page {current_page} of {total_pages} ({len(df)} total records)*")
-        
-        st.dataframe(
-            paginated_df,
-            use_container_width=True,
-            hide_index=True,
-        )
-        
-        # Add detailed view for selected campaigns
-        if st.checkbox("Show Detailed Campaign Information"):
-            selected_campaigns = [camp for camp in filtered_data 
-                               if camp.campaign_id in paginated_df['campaign_id'].values]
-            for campaign in selected_campaigns:
-                with st.expander(f"Campaign: {campaign.campaign_name}"):
-                    render_campaign_details(campaign)
-    else:
+def display_campaign_page(data_version: int, filters: tuple, page_size: int):
+    """Display one server-side page of the campaigns matching the filters"""
+    metrics = get_metrics(data_version, *filters)
+    total_campaigns = metrics["total_campaigns"]
+    if not total_campaigns:
         st.warning("No campaigns match the selected filters.")
+        return
+    
+    display_summary_metrics(metrics)
+    
+    current_page, total_pages = select_page(total_campaigns, page_size)
+    page_start = get_page_start(data_version, current_page, page_size, filters)
+    page_summaries, next_cursor = get_data_page(data_version, page_size, page_start, *filters)
+    next_key = page_cursor_key(data_version, page_size, filters, current_page + 1)
+    st.session_state['page_cursors'][next_key] = next_cursor
+    
+    st.markdown("### Campaign List")
+    st.markdown(f"*Showing page {current_page} of {total_pages} ({total_campaigns} total records)*")
+    
+    st.dataframe(
+        pd.DataFrame([flatten_campaign_data(summary) for summary in page_summaries]),
+        use_container_width=True,
+        hide_index=True,
+    )
+    
+    render_export(data_version, filters)
+    render_selected_campaigns(data_version, page_summaries)
+
+def render_export(data_version: int, filters: tuple):
+    """Offer the matching campaigns as a CSV download, built only on request"""
+    if st.checkbox("Prepare CSV Export"):
+        with st.spinner('Preparing export...'):
+            frame = get_summary_frame(data_version, *filters)
+        st.download_button(
+            "📥 Download CSV",
+            data=frame.to_csv(index=False),
+            file_name="campaigns.csv",
+            mime="text/csv",
+        )
+
+def render_selected_campaigns(data_version: int, summaries: List[dict]):
+    """Render details for the campaigns picked from the current page
+
+    Streamlit does not report whether an expander is open, so campaigns are
+    picked explicitly and only those full documents are fetched.
+    """
+    if st.checkbox("Show Detailed Campaign Information"):
+        names = {summary['campaign_id']: summary['campaign_name'] for summary in summaries}
+        selected_ids = st.multiselect(
+            "Campaigns:",
+            options=list(names),
+            format_func=lambda campaign_id: f"{names[campaign_id]} ({campaign_id})",
+        )
+        for campaign_id in selected_ids:
+            campaign = get_campaign_details(data_version, campaign_id)
+            if campaign is None:
+                continue
+            with st.expander(f"Campaign: {campaign.campaign_name}", expanded=True):
+                render_campaign_details(campaign)
 
-def display_summary_metrics(df):
+def display_summary_metrics(metrics: dict):
     """Display summary metrics at the top of the page"""
     st.markdown("### Campaign Overview")
     
@@ -120,28 +158,51 @@ def display_summary_metrics(df):
     with col1:
         st.metric(
             "Total Campaigns",
-            len(df)
+            metrics["total_campaigns"]
         )
     
     with col2:
-        active_campaigns = len(df[df['campaign_status'] == 'Active'])
         st.metric(
             "Active Campaigns",
-            active_campaigns
+            metrics["active_campaigns"]
         )
     
     with col3:
-        avg_roi = df['roi'].str.rstrip('%').astype(float).mean()
         st.metric(
             "Average ROI",
-            f"{avg_roi:.1f}%"
+            f"{metrics['average_roi']:.1f}%"
         )
     
     with col4:
-        total_budget = df['overall_budget'].str.lstrip('$').str.replace(',', '').astype(float).sum()
         st.metric(
             "Total Budget",
-            f"${total_budget:,.0f}"
+            f"${metrics['total_budget']:,.0f}"
+        )
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            "Pieces Sent",
+            f"{metrics['total_pieces_sent']:,}"
+        )
+    
+    with col2:
+        st.metric(
+            "Responses",
+            f"{metrics['total_responses']:,}"
+        )
+    
+    with col3:
+        st.metric(
+            "Conversions",
+            f"{metrics['total_conversions']:,}"
+        )
+    
+    with col4:
+        st.metric(
+            "Conversion Value",
+            f"${metrics['total_conversion_value']:,.0f}"
         )
 
 def render_campaign_details(campaign: CampaignData):
@@ -161,23 +222,25 @@ def render_campaign_details(campaign: CampaignData):
     render_weekly_mail_drops(campaign)
     render_cost_breakdown(campaign)
 
-def flatten_campaign_data(campaign: CampaignData) -> dict:
-    """Convert a CampaignData object into a flat dictionary"""
+def flatten_campaign_data(summary: dict) -> dict:
+    """Convert a projected campaign summary document into a flat dictionary"""
+    cost_details = summary["cost_details"]
+    performance = summary["performance_summary"]
     return {
-        "campaign_id": campaign.campaign_id,
-        "campaign_name": campaign.campaign_name,
-        "description": campaign.description,
-        "campaign_goal": campaign.campaign_goal,
-        "target_audience_criteria": campaign.target_audience_criteria,
-        "overall_start_date": campaign.overall_start_date,
-        "overall_end_date": campaign.overall_end_date,
-        "campaign_status": campaign.campaign_status,
-        "overall_budget": f"${campaign.cost_details.overall_budget:,.2f}",
-        "total_cost_actual": f"${campaign.cost_details.total_campaign_cost_actual:,.2f}",
-        "pieces_sent": f"{campaign.performance_summary.total_campaign_pieces_sent:,}",
-        "response_rate": f"{campaign.performance_summary.overall_response_rate:.1f}%",
-        "conversion_rate": f"{campaign.performance_summary.overall_conversion_rate:.1f}%",
-        "roi": f"{campaign.performance_summary.campaign_roi:.1f}%"
+        "campaign_id": summary["campaign_id"],
+        "campaign_name": summary["campaign_name"],
+        "description": summary["description"],
+        "campaign_goal": summary["campaign_goal"],
+        "target_audience_criteria": summary["target_audience_criteria"],
+        "overall_start_date": summary["overall_start_date"],
+        "overall_end_date": summary["overall_end_date"],
+        "campaign_status": summary["campaign_status"],
+        "overall_budget": f"${cost_details['overall_budget']:,.2f}",
+        "total_cost_actual": f"${cost_details['total_campaign_cost_actual']:,.2f}",
+        "pieces_sent": f"{performance['total_campaign_pieces_sent']:,}",
+        "response_rate": f"{performance['overall_response_rate']:.1f}%",
+        "conversion_rate": f"{performance['overall_conversion_rate']:.1f}%",
+        "roi": f"{performance['campaign_roi']:.1f}%"
     }
 
 def render_strategy_cells(campaign: CampaignData):
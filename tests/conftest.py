@@ -0,0 +1,50 @@
+import csv
+import io
+from pathlib import Path
+import pandas as pd
+import pytest
+from src.services.batching import summarize_reports
+
+SAMPLE_CSV = Path(__file__).resolve().parent.parent / 'campaign_data.csv'
+
+def collect(results):
+    """Total the (rows, documents, positions, errors) tuples a reader yields"""
+    rows, documents, positions, errors = 0, [], [], []
+    for chunk_rows, chunk_documents, chunk_positions, chunk_errors in results:
+        rows += chunk_rows
+        documents += chunk_documents
+        positions += chunk_positions
+        errors += chunk_errors
+    return rows, documents, positions, errors
+
+def counts(reports):
+    """The *_count totals of upsert chunk reports"""
+    return {key: value for key, value in summarize_reports(reports).items() if key.endswith('_count')}
+
+def edit_csv(path, edits) -> bytes:
+    """Rewrite CSV text with {(data row, column): value} edits, leaving other cells as written"""
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    header = rows[0]
+    for (row, column), value in edits.items():
+        rows[row + 1][header.index(column)] = value
+    out = io.StringIO()
+    csv.writer(out, lineterminator='\n').writerows(rows)
+    return out.getvalue().encode()
+
+@pytest.fixture
+def sample_path() -> Path:
+    return SAMPLE_CSV
+
+@pytest.fixture
+def sample_frame() -> pd.DataFrame:
+    """The sample upload as text, one row per campaign"""
+    return pd.read_csv(SAMPLE_CSV, dtype=str, keep_default_na=False).replace('', None)
+
+@pytest.fixture
+def multi_row_frame(sample_frame) -> pd.DataFrame:
+    """The first campaign spread over three rows, one per cell and drop, then the second"""
+    df = sample_frame.iloc[[0, 0, 0, 1]].reset_index(drop=True)
+    df.loc[0:2, 'cell_no'] = ['A1', 'A2', 'A3']
+    df.loc[0:2, 'mail_drop_id'] = ['D1', 'D2', 'D3']
+    return df
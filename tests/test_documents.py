@@ -0,0 +1,125 @@
+import pandas as pd
+import pytest
+from src.models.base_models import CAMPAIGN_LIST_ADAPTER
+from src.services.documents import (
+    build_serial,
+    build_tasks,
+    campaign_chunks,
+    campaign_documents,
+    coerce_column,
+    last_campaign_rows,
+)
+
+def test_builds_one_valid_document_per_campaign(sample_frame):
+    documents, positions, errors = campaign_documents(sample_frame)
+
+    assert len(documents) == sample_frame['campaign_id'].nunique()
+    assert positions == list(range(len(sample_frame)))
+    assert errors == []
+    CAMPAIGN_LIST_ADAPTER.validate_python(documents)
+
+def test_groups_rows_into_cells_and_drops(multi_row_frame):
+    documents, positions, errors = campaign_documents(multi_row_frame)
+
+    first = documents[0]
+    assert [cell['cell_no'] for cell in first['strategy_cells']] == ['A1', 'A2', 'A3']
+    assert [drop['mail_drop_id'] for drop in first['weekly_mail_drops']] == ['D1', 'D2', 'D3']
+    assert all(drop['cells_mailed_this_week'] == [] for drop in first['weekly_mail_drops'])
+    assert positions == [0, 3]
+    assert errors == []
+
+def test_week_cell_rows_fill_their_drops(multi_row_frame):
+    multi_row_frame['mail_drop_id'] = ['D1', 'D1', 'D2', 'D9']
+    multi_row_frame['quantity_mailed_this_week'] = ['10', '20', '30', '40']
+    multi_row_frame['responses_this_week'] = '1'
+    multi_row_frame['conversions_this_week'] = '0'
+    multi_row_frame['conversion_value_this_week'] = '0.5'
+
+    documents, _, errors = campaign_documents(multi_row_frame)
+
+    drops = documents[0]['weekly_mail_drops']
+    assert [
+        [(cell['cell_no'], cell['quantity_mailed_this_week']) for cell in drop['cells_mailed_this_week']]
+        for drop in drops
+    ] == [[('A1', 10), ('A2', 20)], [('A3', 30)]]
+    assert errors == []
+
+def test_invalid_row_rejects_its_whole_campaign(multi_row_frame):
+    multi_row_frame.loc[1, 'campaign_total_mailed'] = None
+
+    documents, positions, errors = campaign_documents(multi_row_frame)
+
+    assert [doc['campaign_id'] for doc in documents] == [multi_row_frame['campaign_id'][3]]
+    assert positions == [3]
+    assert [error['index'] for error in errors] == [0, 1, 2]
+    assert 'campaign_total_mailed' in errors[1]['message']
+    assert 'invalid row 1' in errors[0]['message']
+
+def test_fractional_count_is_invalid(sample_frame):
+    sample_frame.loc[4, 'campaign_total_mailed'] = '5.7'
+
+    documents, _, errors = campaign_documents(sample_frame)
+
+    assert errors == [{'index': 4, 'message': 'Invalid or missing campaign_total_mailed'}]
+    assert sample_frame['campaign_id'][4] not in {doc['campaign_id'] for doc in documents}
+
+def test_integer_columns_accept_whole_doubles():
+    values, invalid = coerce_column(pd.Series(['5', '5.0', 6.0, None, 'x']), 'int')
+
+    assert values[:3].tolist() == [5, 5, 6]
+    assert invalid.tolist() == [False, False, False, True, True]
+
+def test_dates_are_normalised_or_reported(sample_frame):
+    sample_frame.loc[2, 'overall_start_date'] = '03/04/2025'
+    sample_frame.loc[5, 'overall_start_date'] = 'not a date'
+
+    documents, _, errors = campaign_documents(sample_frame)
+
+    by_id = {doc['campaign_id']: doc for doc in documents}
+    assert by_id[sample_frame['campaign_id'][2]]['overall_start_date'] == '2025-03-04'
+    assert errors == [{'index': 5, 'message': 'Invalid or missing overall_start_date'}]
+
+def test_missing_required_column_raises(sample_frame):
+    with pytest.raises(ValueError, match='overall_budget'):
+        campaign_documents(sample_frame.drop(columns=['overall_budget']))
+
+def test_campaign_spanning_chunks_is_built_whole(multi_row_frame):
+    whole = campaign_documents(multi_row_frame.copy())
+    frames = [multi_row_frame.iloc[[i]].copy() for i in range(len(multi_row_frame))]
+
+    results = list(build_serial(build_tasks(campaign_chunks(frames, last_campaign_rows(frames)))))
+
+    assert sum(rows for rows, _, _, _ in results) == len(multi_row_frame)
+    assert [doc for _, documents, _, _ in results for doc in documents] == whole[0]
+    assert [position for _, _, positions, _ in results for position in positions] == whole[1]
+
+def test_rows_are_numbered_across_chunks(multi_row_frame):
+    multi_row_frame.loc[3, 'overall_budget'] = None
+    frames = [multi_row_frame.iloc[:2].copy(), multi_row_frame.iloc[2:].copy()]
+
+    chunks = campaign_chunks(frames, last_campaign_rows(frames))
+    errors = [error for _, _, _, chunk in build_serial(build_tasks(chunks)) for error in chunk]
+
+    assert [error['index'] for error in errors] == [3]
+
+def test_interleaved_campaign_is_built_whole_once(multi_row_frame):
+    interleaved = multi_row_frame.iloc[[0, 3, 1, 3, 2, 3]].copy()
+    interleaved.index = range(6)
+    interleaved['cell_no'] = ['A1', 'B1', 'A2', 'B2', 'A3', 'B3']
+    frames = [interleaved.iloc[start:start + 2].copy() for start in (0, 2, 4)]
+
+    results = list(build_serial(build_tasks(campaign_chunks(frames, last_campaign_rows(frames)))))
+
+    documents = [doc for _, chunk, _, _ in results for doc in chunk]
+    assert [[cell['cell_no'] for cell in doc['strategy_cells']] for doc in documents] == [
+        ['A1', 'A2', 'A3'], ['B1', 'B2', 'B3'],
+    ]
+    assert sum(rows for rows, _, _, _ in results) == 6
+
+def test_last_rows_are_keyed_on_the_normalized_campaign_id_column(multi_row_frame):
+    frames = [
+        multi_row_frame.iloc[:2][['campaign_id']].rename(columns={'campaign_id': 'Campaign ID'}),
+        multi_row_frame.iloc[2:][['campaign_id']],
+    ]
+
+    assert last_campaign_rows(frames) == {multi_row_frame['campaign_id'][0]: 2, multi_row_frame['campaign_id'][3]: 3}
@@ -0,0 +1,23 @@
+import logging
+from pymongo.errors import OperationFailure
+from src.indexes import CAMPAIGN_INDEXES, ensure_indexes
+
+class _Collection:
+    """A collection whose text index cannot be created"""
+    name = 'campaigns'
+
+    def index_information(self):
+        return {'_id_': {}, 'campaign_id_unique': {}}
+
+    def create_index(self, keys, name, **options):
+        if name == 'campaign_text':
+            raise OperationFailure('text index conflict')
+
+def test_index_failures_are_logged_and_reported(caplog):
+    with caplog.at_level(logging.INFO, logger='src.indexes'):
+        result = ensure_indexes(_Collection())
+
+    missing = [spec['name'] for spec in CAMPAIGN_INDEXES if spec['name'] not in ('campaign_id_unique', 'campaign_text')]
+    assert result == {'created': missing, 'failed': ['campaign_text: text index conflict']}
+    warnings = [record.getMessage() for record in caplog.records if record.levelno == logging.WARNING]
+    assert warnings == ['Could not create index campaign_text on campaigns: text index conflict']
@@ -0,0 +1,130 @@
+import copy
+import pytest
+from pymongo import ReplaceOne
+from src.repositories.sqlite import SQLiteCampaignRepository
+from src.services import ingest
+from src.services.columnar import read_csv_documents
+from src.services.fingerprints import content_hash
+from src.services.ingest import DUPLICATE_KEY, ChunkUpsert, chunk_upserts
+from src.services.rollups import rollup_deltas
+from .conftest import collect, counts
+
+@pytest.fixture
+def documents(sample_path):
+    return collect(read_csv_documents(sample_path))[1]
+
+def _stored(doc):
+    return {**doc, 'content_hash': content_hash(doc)}
+
+def test_rollup_deltas_net_out_a_replaced_version(documents):
+    old = documents[0]
+    new = copy.deepcopy(old)
+    new['cost_details']['overall_budget'] += 100
+
+    deltas = rollup_deltas([new], [old])
+
+    (values,) = deltas.values()
+    assert values['campaigns'] == 0
+    assert values['total_budget'] == pytest.approx(100)
+
+def test_rollup_deltas_move_a_campaign_between_groups(documents):
+    old = documents[0]
+    new = {**old, 'campaign_status': 'Moved'}
+
+    deltas = rollup_deltas([new], [old])
+
+    assert sorted(values['campaigns'] for values in deltas.values()) == [-1, 1]
+
+def test_chunks_keep_the_last_version_of_each_campaign(documents):
+    updated = {**documents[0], 'campaign_name': 'Renamed'}
+
+    chunks = list(chunk_upserts(documents + [updated], batch_size=40))
+
+    entries = [entry for write in chunks for entry in write.entries]
+    assert len(chunks) == 3
+    assert len(entries) == 100
+    assert dict(entries)[100]['campaign_name'] == 'Renamed'
+
+def test_unchanged_campaigns_are_not_written(documents):
+    write = ChunkUpsert(0, list(enumerate(documents[:3])))
+
+    requests = write.plan([], [_stored(doc) for doc in documents[:2]])
+    write.record({'nUpserted': 1})
+
+    new = _stored(documents[2])
+    assert requests == [ReplaceOne({'campaign_id': new['campaign_id'], 'content_hash': None}, new, upsert=True)]
+    assert write.report['unchanged'] == 2
+    assert not write.pending
+
+def test_upserts_are_conditional_on_the_hot_version_read(documents):
+    old = _stored(documents[0])
+    changed = {**documents[0], 'campaign_name': 'Renamed'}
+    write = ChunkUpsert(0, [(0, changed)])
+
+    requests = write.plan([], [old])
+
+    new = _stored(changed)
+    assert requests == [ReplaceOne({'campaign_id': old['campaign_id'], 'content_hash': old['content_hash']}, new, upsert=True)]
+
+def test_a_lost_race_is_planned_again_against_the_new_version(documents):
+    first = _stored(documents[0])
+    rival = _stored({**documents[0], 'campaign_name': 'Rival'})
+    ours = {**documents[0], 'campaign_name': 'Ours'}
+    write = ChunkUpsert(0, [(7, ours)])
+
+    write.plan([], [first])
+    written, replaced = write.record({'writeErrors': [{'index': 0, 'code': DUPLICATE_KEY, 'errmsg': 'E11000'}]})
+    assert (written, replaced) == ([], [])
+    assert write.pending
+
+    requests = write.plan([], [rival])
+    written, replaced = write.record({'nMatched': 1})
+
+    assert requests == [ReplaceOne({'campaign_id': ours['campaign_id'], 'content_hash': rival['content_hash']}, _stored(ours), upsert=True)]
+    assert [doc['campaign_name'] for doc in written] == ['Ours']
+    assert replaced == [rival]
+    assert not write.pending
+    assert (write.report['updated'], write.report['failed']) == (1, 0)
+
+def test_a_campaign_that_keeps_losing_is_reported(documents, monkeypatch):
+    monkeypatch.setattr(ingest, 'INGEST_WRITE_ATTEMPTS', 2)
+    write = ChunkUpsert(0, [(7, documents[0])])
+    conflict = {'writeErrors': [{'index': 0, 'code': DUPLICATE_KEY, 'errmsg': 'E11000'}]}
+
+    for _ in range(2):
+        write.plan([], [])
+        write.record(conflict)
+
+    assert not write.pending
+    assert write.report['failed'] == 1
+    assert write.report['errors'][0]['index'] == 7
+    assert 'another writer' in write.report['errors'][0]['message']
+
+def test_archived_campaign_is_replaced_from_the_archive(documents):
+    archived = {**_stored(documents[0]), 'archived_at': '2026-01-01'}
+    changed = {**documents[0], 'campaign_name': 'Back again'}
+    write = ChunkUpsert(0, [(0, changed)])
+
+    requests = write.plan([archived], [])
+    written, replaced = write.record({'nUpserted': 1, 'upserted': [{'index': 0, '_id': 'x'}]})
+
+    assert requests == [ReplaceOne({'campaign_id': changed['campaign_id'], 'content_hash': None}, _stored(changed), upsert=True)]
+    assert replaced == [archived]
+    assert write.report['inserted'] == 1
+
+def test_sqlite_skips_unchanged_campaigns(tmp_path, documents):
+    repository = SQLiteCampaignRepository(str(tmp_path / 'campaigns.db'))
+    repository.prepare()
+
+    first = counts(repository.upsert_campaigns(copy.deepcopy(documents)))
+    version = repository.get_data_version()
+    again = counts(repository.upsert_campaigns(copy.deepcopy(documents)))
+    unchanged_version = repository.get_data_version()
+    changed = copy.deepcopy(documents)
+    changed[5]['cost_details']['overall_budget'] += 1
+    last = counts(repository.upsert_campaigns(changed))
+
+    assert first == {'inserted_count': 100, 'updated_count': 0, 'failed_count': 0, 'unchanged_count': 0}
+    assert again == {'inserted_count': 0, 'updated_count': 0, 'failed_count': 0, 'unchanged_count': 100}
+    assert unchanged_version == version
+    assert last == {'inserted_count': 0, 'updated_count': 1, 'failed_count': 0, 'unchanged_count': 99}
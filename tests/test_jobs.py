@@ -0,0 +1,80 @@
+import io
+from datetime import datetime, timedelta
+import pytest
+from src.repositories.sqlite import SQLiteCampaignRepository
+from src.services import jobs
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, 'INGEST_JOB_DIR', str(tmp_path / 'jobs'))
+    repository = SQLiteCampaignRepository(str(tmp_path / 'campaigns.db'))
+    repository.prepare()
+    return repository
+
+@pytest.fixture
+def submitted(monkeypatch):
+    """Job ids handed to the ingest pool, which is not started"""
+    submitted = []
+    monkeypatch.setattr(jobs, 'submit_job', lambda repository, job: submitted.append(job['job_id']))
+    return submitted
+
+def test_only_one_claim_on_a_job_succeeds(repository, sample_path):
+    job = jobs.create_job(repository, 'upload.csv', io.BytesIO(sample_path.read_bytes()))
+    first, second = repository.get_job(job['job_id']), repository.get_job(job['job_id'])
+
+    assert jobs.claim_job(repository, first)
+    assert not jobs.claim_job(repository, second)
+
+def test_stale_jobs_are_resumed_once(repository, sample_path, submitted):
+    job = jobs.create_job(repository, 'upload.csv', io.BytesIO(sample_path.read_bytes()))
+    job.update(status='running', updated_at='2000-01-01T00:00:00')
+    repository.save_job(job)
+
+    assert jobs.resume_jobs(repository) == 1
+    assert jobs.resume_jobs(repository) == 0
+    assert submitted == [job['job_id']]
+
+def test_failed_job_is_retried_once(repository, sample_path, submitted):
+    job = jobs.create_job(repository, 'upload.csv', io.BytesIO(sample_path.read_bytes()))
+    job['status'] = 'failed'
+    repository.save_job(job)
+
+    assert jobs.retry_job(repository, job['job_id'])['status'] == 'queued'
+    assert jobs.retry_job(repository, job['job_id']) is None
+    assert submitted == [job['job_id']]
+
+def test_identical_upload_is_skipped(repository, sample_path):
+    first = jobs.create_job(repository, 'upload.csv', io.BytesIO(sample_path.read_bytes()))
+    second = jobs.create_job(repository, 'again.csv', io.BytesIO(sample_path.read_bytes()))
+    other = jobs.create_job(repository, 'other.csv', io.BytesIO(b'campaign_id\n'))
+
+    assert second['status'] == 'skipped'
+    assert second['duplicate_of'] == first['job_id']
+    assert other['status'] == 'queued'
+
+def test_job_ingests_its_upload(repository, sample_path):
+    job = jobs.create_job(repository, 'upload.csv', io.BytesIO(sample_path.read_bytes()))
+
+    jobs.run_job(repository, job)
+
+    saved = repository.get_job(job['job_id'])
+    assert saved['status'] == 'completed'
+    assert (saved['rows_parsed'], saved['inserted'], saved['failed']) == (100, 100, 0)
+    assert repository.get_ingest(job['fingerprint'])['job_id'] == job['job_id']
+
+def test_submitted_job_runs_on_the_ingest_pool(repository, sample_path):
+    job = jobs.create_job(repository, 'upload.csv', io.BytesIO(sample_path.read_bytes()))
+
+    jobs.submit_job(repository, job)
+    jobs.get_job_executor().shutdown(wait=True)
+    jobs.shutdown_jobs()
+
+    assert repository.get_job(job['job_id'])['status'] == 'completed'
+    assert jobs._job_executor is None
+
+def test_progress_reads_timestamps_saved_without_an_offset(repository, sample_path):
+    job = jobs.create_job(repository, 'upload.csv', io.BytesIO(sample_path.read_bytes()))
+    job.update(started_at='2026-01-01T00:00:00', finished_at='2026-01-01T00:00:04+00:00', rows_parsed=100)
+
+    assert jobs.job_progress(job)['rows_per_second'] == 25.0
+    assert datetime.fromisoformat(job['created_at']).utcoffset() == timedelta(0)
@@ -0,0 +1,90 @@
+import copy
+from datetime import date
+import pytest
+from src.config import MONGO_ARCHIVE_COLLECTION_NAME, MONGO_COLLECTION_NAME, MONGO_WEEKLY_COLLECTION_NAME
+from src.repositories import mongo
+from src.repositories.mongo import MongoCampaignRepository
+from src.services.archive import ARCHIVED_STATUSES, archive_campaigns
+from src.services.columnar import read_csv_documents
+from src.services.ingest import upsert_campaigns
+from src.services.rollups import get_rollup_metrics
+from .conftest import collect, counts
+
+# A day long after every campaign in the sample upload has ended
+LATER = date(2100, 1, 1)
+
+@pytest.fixture
+def db():
+    """An in-memory database; needs mongomock"""
+    mongomock = pytest.importorskip('mongomock')
+    return mongomock.MongoClient().db
+
+@pytest.fixture
+def documents(sample_path):
+    return collect(read_csv_documents(sample_path))[1]
+
+def _completed(documents):
+    return [doc for doc in documents if doc['campaign_status'] in ARCHIVED_STATUSES]
+
+def test_upload_is_written_once_and_then_skipped(db, documents):
+    hot = db[MONGO_COLLECTION_NAME]
+
+    first = counts(upsert_campaigns(hot, copy.deepcopy(documents), batch_size=40))
+    again = counts(upsert_campaigns(hot, copy.deepcopy(documents), batch_size=40))
+
+    assert first == {'inserted_count': 100, 'updated_count': 0, 'failed_count': 0, 'unchanged_count': 0}
+    assert again == {'inserted_count': 0, 'updated_count': 0, 'failed_count': 0, 'unchanged_count': 100}
+    assert hot.count_documents({}) == 100
+    assert get_rollup_metrics(db)['total_campaigns'] == 100
+
+def test_changed_campaign_adjusts_its_rollup_and_replaces_its_weekly_facts(db, documents):
+    hot = db[MONGO_COLLECTION_NAME]
+    upsert_campaigns(hot, copy.deepcopy(documents))
+    changed = copy.deepcopy(documents[0])
+    changed['cost_details']['overall_budget'] += 100
+    facts = db[MONGO_WEEKLY_COLLECTION_NAME].count_documents({})
+
+    report = counts(upsert_campaigns(hot, [changed]))
+
+    assert (report['updated_count'], report['inserted_count']) == (1, 0)
+    assert hot.find_one({'campaign_id': changed['campaign_id']})['cost_details']['overall_budget'] == changed['cost_details']['overall_budget']
+    assert get_rollup_metrics(db)['total_budget'] == pytest.approx(sum(doc['cost_details']['overall_budget'] for doc in documents) + 100)
+    assert db[MONGO_WEEKLY_COLLECTION_NAME].count_documents({}) == facts
+
+def test_completed_campaigns_move_to_the_archive_tier(db, documents):
+    upsert_campaigns(db[MONGO_COLLECTION_NAME], copy.deepcopy(documents))
+    completed = _completed(documents)
+
+    moved = archive_campaigns(db, today=LATER)
+
+    assert moved == len(completed)
+    assert archive_campaigns(db, today=LATER) == 0
+    assert db[MONGO_ARCHIVE_COLLECTION_NAME].count_documents({}) == len(completed)
+    assert db[MONGO_COLLECTION_NAME].count_documents({}) == 100 - len(completed)
+    assert get_rollup_metrics(db)['total_campaigns'] == 100
+    assert get_rollup_metrics(db, include_archived=False)['total_campaigns'] == 100 - len(completed)
+
+def test_archived_campaign_uploaded_again_returns_to_the_hot_tier(db, documents):
+    upsert_campaigns(db[MONGO_COLLECTION_NAME], copy.deepcopy(documents))
+    archive_campaigns(db, today=LATER)
+    returning = {**copy.deepcopy(_completed(documents)[0]), 'campaign_name': 'Back again'}
+
+    report = counts(upsert_campaigns(db[MONGO_COLLECTION_NAME], [returning]))
+
+    assert report['inserted_count'] == 1
+    assert db[MONGO_ARCHIVE_COLLECTION_NAME].find_one({'campaign_id': returning['campaign_id']}) is None
+    assert db[MONGO_COLLECTION_NAME].find_one({'campaign_id': returning['campaign_id']})['campaign_name'] == 'Back again'
+    assert get_rollup_metrics(db)['total_campaigns'] == 100
+
+def test_repository_reads_fall_back_to_the_archive(db, documents, monkeypatch):
+    monkeypatch.setattr(mongo, 'get_client', lambda: db.client)
+    repository = MongoCampaignRepository(db.name)
+    repository.upsert_campaigns(copy.deepcopy(documents))
+    archive_campaigns(db, today=LATER)
+    archived = _completed(documents)[0]['campaign_id']
+    hot = next(doc['campaign_id'] for doc in documents if doc['campaign_status'] not in ARCHIVED_STATUSES)
+
+    assert repository.get_campaign(archived)['campaign_id'] == archived
+    assert [doc['campaign_id'] for doc in repository.get_campaigns([hot, archived, 'missing'])] == [hot, archived]
+    assert repository.count() == 100 - len(_completed(documents))
+    assert repository.count(status_filter=list(ARCHIVED_STATUSES)) == len(_completed(documents))
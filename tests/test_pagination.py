@@ -0,0 +1,33 @@
+import pytest
+from bson import ObjectId
+from src.services.pagination import InvalidCursor, build_page_query, fetch_merged_page
+
+@pytest.fixture
+def tiers():
+    """A hot and an archive collection sharing one _id order; needs mongomock"""
+    mongomock = pytest.importorskip('mongomock')
+    db = mongomock.MongoClient().db
+    for n in range(25):
+        db['archive' if n % 3 == 0 else 'hot'].insert_one({'_id': ObjectId(), 'n': n})
+    return [db.hot, db.archive]
+
+def test_pages_of_several_collections_are_merged_newest_first(tiers):
+    seen, after = [], None
+    while True:
+        docs, after = fetch_merged_page(tiers, 4, after)
+        seen += [doc['n'] for doc in docs]
+        if after is None:
+            break
+
+    assert seen == list(range(24, -1, -1))
+
+def test_page_query_is_combined_with_the_filter(tiers):
+    docs, after = fetch_merged_page(tiers, 5, query={'n': {'$lt': 10}})
+    rest, _ = fetch_merged_page(tiers, 5, after, query={'n': {'$lt': 10}})
+
+    assert [doc['n'] for doc in docs + rest] == list(range(9, -1, -1))
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', '123', 'z' * 24])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        build_page_query({}, cursor)
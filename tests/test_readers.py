@@ -0,0 +1,178 @@
+import io
+import csv
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv as pa_csv
+import pytest
+from openpyxl import Workbook
+from src.services.columnar import ParquetExport, read_arrow_documents, read_csv_documents
+from src.services.workbooks import read_xlsx_documents
+from .conftest import collect, edit_csv
+
+@pytest.fixture
+def csv_documents(sample_path):
+    return collect(read_csv_documents(sample_path))[1]
+
+def test_csv_blocks_give_the_same_documents(sample_path, csv_documents):
+    rows, documents, positions, errors = collect(read_csv_documents(sample_path, block_size=4096))
+
+    assert rows == 100
+    assert documents == csv_documents
+    assert positions == list(range(100))
+    assert errors == []
+
+def test_csv_bad_cells_are_reported_by_file_row(sample_path, csv_documents):
+    upload = edit_csv(sample_path, {
+        (3, 'overall_budget'): 'abc',
+        (40, 'overall_start_date'): 'not a date',
+        (77, 'campaign_total_mailed'): '5.7',
+    })
+
+    rows, documents, _, errors = collect(read_csv_documents(io.BytesIO(upload), block_size=4096))
+
+    assert rows == 100
+    assert errors == [
+        {'index': 3, 'message': 'Invalid or missing overall_budget'},
+        {'index': 40, 'message': 'Invalid or missing overall_start_date'},
+        {'index': 77, 'message': 'Invalid or missing campaign_total_mailed'},
+    ]
+    rejected = {csv_documents[i]['campaign_id'] for i in (3, 40, 77)}
+    assert documents == [doc for doc in csv_documents if doc['campaign_id'] not in rejected]
+
+def test_csv_headers_are_normalised_and_extra_columns_dropped(sample_path, csv_documents):
+    with open(sample_path, newline='') as f:
+        rows = list(csv.reader(f))
+    rows[0] = [name.replace('_', ' ').title() for name in rows[0]]
+    out = io.StringIO()
+    csv.writer(out).writerows([row + ['extra'] for row in rows])
+
+    documents = collect(read_csv_documents(io.BytesIO(out.getvalue().encode())))[1]
+
+    assert documents == csv_documents
+
+def _interleaved_rows(sample_path, campaigns=10, weeks=3):
+    """The first campaigns with one row per week, ordered by week as an export sorted by date would be"""
+    with open(sample_path, newline='') as f:
+        header, *records = csv.reader(f)
+    cell = header.index('cell_no')
+    rows = [header]
+    for week in range(weeks):
+        for record in records[:campaigns]:
+            rows.append(record[:cell] + [f'{record[cell]}-{week}'] + record[cell + 1:])
+    return rows
+
+def _csv_bytes(rows) -> bytes:
+    out = io.StringIO()
+    csv.writer(out, lineterminator='\n').writerows(rows)
+    return out.getvalue().encode()
+
+def _cells(documents):
+    return {doc['campaign_id']: [cell['cell_no'] for cell in doc['strategy_cells']] for doc in documents}
+
+def test_csv_campaigns_interleaved_across_blocks_are_built_whole(sample_path):
+    rows = _interleaved_rows(sample_path)
+
+    read, documents, _, errors = collect(read_csv_documents(io.BytesIO(_csv_bytes(rows)), block_size=1024))
+
+    assert read == 30
+    assert errors == []
+    assert len(documents) == 10
+    assert all(cells == [f'{cells[0][:-2]}-{week}' for week in range(3)] for cells in _cells(documents).values())
+
+def test_parquet_campaigns_interleaved_across_batches_are_built_whole(tmp_path, sample_path):
+    upload = _csv_bytes(_interleaved_rows(sample_path))
+    path = tmp_path / 'interleaved.parquet'
+    pq.write_table(pa_csv.read_csv(io.BytesIO(upload)), path)
+
+    documents = collect(read_arrow_documents(str(path), 'parquet', chunk_rows=4))[1]
+
+    assert _cells(documents) == _cells(collect(read_csv_documents(io.BytesIO(upload)))[1])
+    assert len(documents) == 10
+
+def test_csv_missing_column_raises(sample_path):
+    table = pa_csv.read_csv(sample_path).drop(['campaign_goal'])
+    out = io.BytesIO()
+    pa_csv.write_csv(table, out)
+
+    with pytest.raises(ValueError, match='campaign_goal'):
+        collect(read_csv_documents(io.BytesIO(out.getvalue())))
+
+def test_parquet_export_round_trips(tmp_path, csv_documents):
+    export = ParquetExport()
+    path = tmp_path / 'export.parquet'
+    path.write_bytes(export.write(csv_documents[:60]) + export.write(csv_documents[60:]) + export.close())
+
+    rows, documents, positions, errors = collect(read_arrow_documents(str(path), 'parquet', chunk_rows=25))
+
+    assert rows == 100
+    assert documents == csv_documents
+    assert positions == list(range(100))
+    assert errors == []
+
+def test_arrow_stream_of_exported_campaigns(tmp_path, csv_documents):
+    export = ParquetExport()
+    batch = pa.RecordBatch.from_pylist(csv_documents, schema=export.schema)
+    path = tmp_path / 'export.arrows'
+    with pa.OSFile(str(path), 'wb') as sink, pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+
+    documents = collect(read_arrow_documents(str(path), 'arrow'))[1]
+
+    assert documents == csv_documents
+
+def test_flat_parquet_matches_csv(tmp_path, sample_path, csv_documents):
+    path = tmp_path / 'flat.parquet'
+    pq.write_table(pa_csv.read_csv(sample_path), path)
+
+    rows, documents, _, errors = collect(read_arrow_documents(str(path), 'parquet', chunk_rows=30))
+
+    assert rows == 100
+    assert documents == csv_documents
+    assert errors == []
+
+def _cell(value: str):
+    """Store a CSV cell as Excel would: numbers to 15 significant digits, everything else as text"""
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(f'{float(value):.15g}')
+    except ValueError:
+        return value or None
+
+def test_workbook_matches_csv(tmp_path, sample_path):
+    with open(sample_path, newline='') as f:
+        header, *records = csv.reader(f)
+    rows = [header] + [[_cell(value) for value in record] for record in records]
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for row in rows:
+        sheet.append(row)
+    sheet.append([None] * len(rows[0]))
+    path = tmp_path / 'upload.xlsx'
+    workbook.save(path)
+    text = io.StringIO()
+    csv.writer(text).writerows(rows)
+    csv_documents = collect(read_csv_documents(io.BytesIO(text.getvalue().encode())))[1]
+
+    rows, documents, positions, errors = collect(read_xlsx_documents(str(path), chunk_rows=7))
+
+    assert rows == 100
+    assert documents == csv_documents
+    assert positions == list(range(100))
+    assert errors == []
+
+def test_workbook_campaigns_interleaved_across_chunks_are_built_whole(tmp_path, sample_path):
+    rows = _interleaved_rows(sample_path)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for row in rows:
+        sheet.append([row[0]] + [_cell(value) for value in row[1:]])
+    path = tmp_path / 'interleaved.xlsx'
+    workbook.save(path)
+
+    documents = collect(read_xlsx_documents(str(path), chunk_rows=4))[1]
+
+    assert len(documents) == 10
+    assert _cells(documents) == _cells(collect(read_csv_documents(io.BytesIO(_csv_bytes(rows))))[1])
@@ -0,0 +1,152 @@
+import asyncio
+import io
+import json
+import pyarrow.parquet as pq
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src import main
+from src.api import routes
+from src.repositories.sqlite import SQLiteCampaignRepository
+from src.services import jobs
+from src.services.async_repository import AsyncRepositoryService
+from src.services.columnar import read_csv_documents
+from .conftest import collect
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, 'INGEST_JOB_DIR', str(tmp_path / 'jobs'))
+    repository = SQLiteCampaignRepository(str(tmp_path / 'campaigns.db'))
+    repository.prepare()
+    monkeypatch.setattr(routes, 'repository', repository)
+    monkeypatch.setattr(routes, 'db_service', AsyncRepositoryService(repository))
+    # Run ingest jobs inline instead of on the background pool
+    monkeypatch.setattr(routes, 'submit_job', jobs.run_job)
+    return repository
+
+@pytest.fixture
+def client(repository):
+    app = FastAPI()
+    app.include_router(routes.router, prefix='/api')
+    return TestClient(app)
+
+@pytest.fixture
+def documents(sample_path):
+    return collect(read_csv_documents(sample_path))[1]
+
+def _list_ids(client, **params):
+    ids, after = [], None
+    while True:
+        page = client.get('/api/campaigns', params={**params, **({'after': after} if after else {})}).json()
+        ids += [campaign['campaign_id'] for campaign in page['campaigns']]
+        after = page['next_cursor']
+        if after is None:
+            return ids
+
+def test_json_upload_is_listed_newest_first(client, documents):
+    response = client.post('/api/upload/json', content=json.dumps(documents))
+
+    assert response.status_code == 200
+    assert response.json()['inserted_count'] == 100
+    first = client.get('/api/campaigns', params={'limit': 30}).json()
+    assert first['total'] == 100
+    assert first['campaigns'][0] == documents[-1]
+    assert _list_ids(client, limit=30) == [doc['campaign_id'] for doc in reversed(documents)]
+
+def _ndjson(documents) -> bytes:
+    return ''.join(json.dumps(doc) + '\n' for doc in documents).encode()
+
+def test_ndjson_upload_reports_unchanged_campaigns(client, documents):
+    first = client.post('/api/upload/ndjson', content=_ndjson(documents)).json()
+    documents[5]['campaign_name'] = 'Renamed'
+
+    again = client.post('/api/upload/ndjson', content=_ndjson(documents)).json()
+
+    assert (first['inserted_count'], first['unchanged_count']) == (100, 0)
+    assert (again['inserted_count'], again['updated_count'], again['unchanged_count']) == (0, 1, 99)
+
+def test_ndjson_rejected_lines_are_reported_by_line_number(client, documents):
+    lines = _ndjson(documents[:3]).splitlines()
+    body = b'\n'.join([lines[0], b'', b'{"campaign_id": 1}', lines[1], b'not json', lines[2]])
+
+    result = client.post('/api/upload/ndjson', content=body).json()
+
+    assert result['lines_read'] == 6
+    assert result['inserted_count'] == 3
+    assert result['rejected_lines'] == [3, 5]
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+async def _lines(stream):
+    return [line async for line in routes.iter_lines(stream)]
+
+def test_lines_are_split_across_chunk_boundaries():
+    lines = asyncio.run(_lines(_chunks(b'{"a"', b': 1}\n{"b": 2}\n\n{"c"', b'', b': 3}\n', b'{"d": 4}')))
+
+    assert lines == [b'{"a": 1}', b'{"b": 2}', b'', b'{"c": 3}', b'{"d": 4}']
+
+def test_ndjson_line_over_the_limit_is_rejected(client, documents, monkeypatch):
+    monkeypatch.setattr(routes, 'NDJSON_MAX_LINE_BYTES', 64)
+
+    response = client.post('/api/upload/ndjson', content=_ndjson(documents[:3]))
+
+    assert response.status_code == 413
+    assert client.get('/api/campaigns').json()['total'] == 0
+
+def test_malformed_page_cursor_is_a_bad_request(client, documents):
+    client.post('/api/upload/json', content=json.dumps(documents))
+
+    response = client.get('/api/campaigns', params={'after': 'not-a-cursor'})
+
+    assert response.status_code == 400
+
+def test_invalid_json_upload_is_rejected(client, documents):
+    documents[3]['campaign_id'] = None
+
+    response = client.post('/api/upload/json', content=json.dumps(documents))
+
+    assert response.status_code == 422
+    assert client.get('/api/campaigns').json()['total'] == 0
+
+def test_csv_upload_job_feeds_the_list_metrics_and_export(client, sample_path, documents):
+    response = client.post('/api/upload/csv', files={'file': ('upload.csv', sample_path.read_bytes(), 'text/csv')})
+
+    assert response.status_code == 202
+    job = client.get(response.json()['status_url']).json()
+    assert (job['status'], job['inserted'], job['failed']) == ('completed', 100, 0)
+
+    metrics = client.get('/api/campaigns/metrics').json()
+    assert metrics['total_campaigns'] == 100
+    assert metrics['total_budget'] == pytest.approx(sum(doc['cost_details']['overall_budget'] for doc in documents))
+
+    statuses = {doc['campaign_status'] for doc in documents}
+    status = sorted(statuses)[0]
+    expected = [doc['campaign_id'] for doc in reversed(documents) if doc['campaign_status'] == status]
+    assert _list_ids(client, limit=7, status=[status]) == expected
+
+    export = client.get('/api/export/parquet', params={'status': [status]})
+    table = pq.read_table(io.BytesIO(export.content))
+    assert sorted(table.column('campaign_id').to_pylist()) == sorted(expected)
+
+def test_identical_csv_upload_is_not_queued_again(client, sample_path):
+    upload = {'file': ('upload.csv', sample_path.read_bytes(), 'text/csv')}
+    first = client.post('/api/upload/csv', files=upload).json()
+
+    again = client.post('/api/upload/csv', files=upload)
+
+    assert again.status_code == 200
+    assert again.json()['duplicate_of'] == first['job_id']
+
+def test_unknown_job_is_not_found(client):
+    assert client.get('/api/jobs/missing').status_code == 404
+
+def test_startup_prepares_the_sqlite_store_without_mongodb(tmp_path, monkeypatch):
+    repository = SQLiteCampaignRepository(str(tmp_path / 'campaigns.db'))
+    monkeypatch.setattr(main, 'repository', repository)
+    monkeypatch.setattr(main, 'db_service', AsyncRepositoryService(repository))
+
+    asyncio.run(main.prepare_database())
+
+    assert repository.count() == 0
@@ -0,0 +1,54 @@
+import copy
+import sqlite3
+import pytest
+from src.repositories import sqlite
+from src.repositories.sqlite import SQLiteCampaignRepository
+from src.services.columnar import read_csv_documents
+from .conftest import collect
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = SQLiteCampaignRepository(str(tmp_path / 'campaigns.db'))
+    repository.prepare()
+    return repository
+
+@pytest.fixture
+def documents(sample_path):
+    return collect(read_csv_documents(sample_path))[1]
+
+def _names(repository, search_term):
+    return {summary['campaign_name'] for summary in repository.get_page(500, search_term=search_term)[0]}
+
+def test_reads_more_campaigns_than_a_statement_can_bind(repository, documents):
+    repository.connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+    many = [
+        {**copy.deepcopy(doc), 'campaign_id': f"{doc['campaign_id']}-{copy_no}"}
+        for copy_no in range(12)
+        for doc in documents
+    ]
+
+    repository.upsert_campaigns(many, batch_size=5000)
+    stored = repository.get_all()
+
+    assert len(stored) == 1200
+    assert [doc['campaign_id'] for doc in stored] == [doc['campaign_id'] for doc in reversed(many)]
+    assert stored[0]['strategy_cells'] == many[-1]['strategy_cells']
+    assert stored[0]['weekly_mail_drops'] == many[-1]['weekly_mail_drops']
+
+def test_text_search_matches_any_word(repository, documents):
+    repository.upsert_campaigns(documents)
+
+    names = _names(repository, 'holiday reactivation')
+
+    assert names == {
+        doc['campaign_name'] for doc in documents
+        if 'Holiday' in doc['campaign_name'] or 'reactivation' in doc['description']
+    }
+
+def test_prefix_search_matches_the_start_of_the_name(repository, documents, monkeypatch):
+    monkeypatch.setattr(sqlite, 'SEARCH_MODE', 'prefix')
+    repository.upsert_campaigns(documents)
+
+    assert _names(repository, 'Fall') == {doc['campaign_name'] for doc in documents if doc['campaign_name'].startswith('Fall')}
+    assert _names(repository, 'fall') == set()
+    assert _names(repository, 'Campaign') == set()